@@ -0,0 +1,126 @@
+"""Per-family cost of the 8-bit ALU opcodes, table lookups vs flag helpers.
+
+"helpers" replays the previous handlers, which cleared F and then set each
+flag through a method call; "tables" calls the current Z80 handlers. Also
+prints the memory held by the shared tables.
+"""
+
+from common import make_cpu, timeit
+
+CALLS = 200_000
+
+FAMILIES = (
+    ("ADD A,B", 0x80),
+    ("ADC A,B", 0x88),
+    ("SUB A,B", 0x90),
+    ("SBC A,B", 0x98),
+    ("AND A,B", 0xA0),
+    ("XOR A,B", 0xA8),
+    ("OR A,B", 0xB0),
+    ("CP A,B", 0xB8),
+    ("INC B", 0x04),
+    ("DEC B", 0x05),
+)
+
+
+class Helpers:
+    """The flag helpers the handlers used before the tables."""
+
+    def __init__(self, cpu):
+        from gbemu.registers import A, B, F
+
+        self.r = cpu._r
+        self.A, self.B, self.F = A, B, F
+
+    def set_flag(self, flag):
+        self.r[self.F] |= flag
+
+    def is_set(self, flag):
+        return (self.r[self.F] & flag) == flag
+
+    def add8(self, v1, v2):
+        result = v1 + v2
+        self.r[self.F] = 0
+        if (result & 0xFF) == 0:
+            self.set_flag(0x80)
+        if result > 0xFF:
+            self.set_flag(0x10)
+        if (v1 & 0xF) + (v2 & 0xF) > 0xF:
+            self.set_flag(0x20)
+        return result & 0xFF
+
+    def sub8(self, v1, v2):
+        result = v1 - v2
+        carrybits = v1 ^ v2 ^ result
+        self.r[self.F] = 0
+        self.set_flag(0x40)
+        if (result & 0xFF) == 0:
+            self.set_flag(0x80)
+        if carrybits & 0x100:
+            self.set_flag(0x10)
+        if carrybits & 0x10:
+            self.set_flag(0x20)
+        return result & 0xFF
+
+    def logic(self, result, flags):
+        self.r[self.F] = 0
+        if result == 0:
+            self.set_flag(0x80)
+        if flags:
+            self.set_flag(flags)
+        return result
+
+    def handler(self, opcode):
+        r, A, B = self.r, self.A, self.B
+
+        def carry():
+            return self.is_set(0x10)
+
+        def incdec(fn):
+            def op():
+                c = carry()
+                r[B] = fn(r[B], 1)
+                if c:
+                    self.set_flag(0x10)
+
+            return op
+
+        return {
+            0x80: lambda: r.__setitem__(A, self.add8(r[A], r[B])),
+            0x88: lambda: r.__setitem__(A, self.add8(r[A], r[B] + carry())),
+            0x90: lambda: r.__setitem__(A, self.sub8(r[A], r[B])),
+            0x98: lambda: r.__setitem__(A, self.sub8(r[A], r[B] + carry())),
+            0xA0: lambda: r.__setitem__(A, self.logic(r[A] & r[B], 0x20)),
+            0xA8: lambda: r.__setitem__(A, self.logic(r[A] ^ r[B], 0)),
+            0xB0: lambda: r.__setitem__(A, self.logic(r[A] | r[B], 0)),
+            0xB8: lambda: self.sub8(r[A], r[B]),
+            0x04: incdec(self.add8),
+            0x05: incdec(self.sub8),
+        }[opcode]
+
+
+def bench(op):
+    def loop():
+        for _ in range(CALLS):
+            op()
+
+    return timeit(loop, repeat=3)
+
+
+def run():
+    from gbemu import alu
+    from gbemu.registers import A, B
+
+    cpu = make_cpu()
+    helpers = Helpers(cpu)
+    print(f"tables: {alu.footprint():,} bytes")
+    print(f"{'':10s} {'helpers':>10s} {'tables':>10s}  (ns/op)")
+    for name, opcode in FAMILIES:
+        cpu._r[A], cpu._r[B] = 0x3A, 0xC6
+        old = bench(helpers.handler(opcode))
+        new = bench(cpu._opmap[opcode])
+        print(f"{name:10s} {old / CALLS * 1e9:>10.0f} {new / CALLS * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,74 @@
+"""Shared fixtures for the benchmark scripts.
+
+The benchmarks drive the emulator through a small fixed ROM so numbers are
+comparable between revisions. Run any of them from the repository root, e.g.
+``python benchmarks/cpu.py``.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# A fixed instruction mix looping forever: memory loads/stores through HL,
+# 8-bit ALU, a compare-and-branch inner loop and a CALL/PUSH/POP/RET subroutine.
+# fmt: off
+LOOP_PROGRAM = {
+    0x0000: [0xC3, 0x50, 0x01],  # JP 0x0150
+    0x0150: [
+        0x31, 0xFE, 0xFF,  # LD SP,0xFFFE
+        0x21, 0x00, 0xC0,  # LD HL,0xC000
+        0x06, 0x00,  # LD B,0
+        0x16, 0xD0,  # LD D,0xD0
+        # loop (0x015A)
+        0x7E,  # LD A,[HL]
+        0x80,  # ADD A,B
+        0x22,  # LDI [HL],A
+        0x04,  # INC B
+        0x7C,  # LD A,H
+        0xBA,  # CP A,D
+        0x20, 0xF8,  # JR NZ,loop
+        0x21, 0x00, 0xC0,  # LD HL,0xC000
+        0xCD, 0x70, 0x01,  # CALL 0x0170
+        0xC3, 0x5A, 0x01,  # JP loop
+    ],
+    0x0170: [
+        0xC5,  # PUSH BC
+        0xC1,  # POP BC
+        0xAF,  # XOR A,A
+        0xC9,  # RET
+    ],
+}
+# fmt: on
+
+
+def build_rom(program=LOOP_PROGRAM, size=0x8000):
+    """Assemble ``program`` (address -> bytes) into a zero-filled ROM image."""
+    rom = bytearray(size)
+    for addr, code in program.items():
+        rom[addr : addr + len(code)] = bytes(code)
+    return rom
+
+
+def make_cpu(rom=None):
+    """Return a Z80 wired to a fresh MMU with ``rom`` loaded and BIOS unmapped."""
+    from gbemu.MMU import MMU
+    from gbemu.Z80 import Z80
+
+    mmu = MMU()
+    mmu.loadROM(list(rom if rom is not None else build_rom()))
+    mmu.biosf = False
+    cpu = Z80()
+    cpu.MMU = mmu
+    return cpu
+
+
+def timeit(fn, repeat=5):
+    """Return the best wall time of ``repeat`` calls to ``fn``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
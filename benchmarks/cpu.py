@@ -0,0 +1,45 @@
+"""Instructions-per-second of each CPU backend on the fixed ROM loop.
+
+Both backends run the same guest program for the same number of M-cycles;
+the JIT figure counts the guest instructions the interpreter needed to cover
+that span.
+"""
+
+from common import make_cpu, timeit
+
+CYCLES = 500_000
+
+
+def count_instructions():
+    cpu = make_cpu()
+    count = 0
+    while cpu._clock < CYCLES:
+        cpu.cycle()
+        count += 1
+    return count
+
+
+def bench(make_step):
+    def loop():
+        cpu = make_cpu()
+        step = make_step(cpu)
+        while cpu._clock < CYCLES:
+            step()
+
+    return timeit(loop)
+
+
+def run():
+    from gbemu.JIT import JIT
+
+    instructions = count_instructions()
+    for name, make_step in (
+        ("interpreter", lambda cpu: cpu.cycle),
+        ("jit", lambda cpu: JIT(cpu).cycle),
+    ):
+        elapsed = bench(make_step)
+        print(f"{name:12s} {instructions / elapsed:>12,.0f} instructions/s")
+
+
+if __name__ == "__main__":
+    run()
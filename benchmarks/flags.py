@@ -0,0 +1,69 @@
+"""Branch-heavy loops with the JIT computing flags eagerly and lazily.
+
+Each loop iteration runs a chain of 8-bit ALU operations whose flags are
+mostly overwritten before the compare-and-branch that closes it. With
+lazy_flags the JIT only computes the flags something can read.
+"""
+
+from common import build_rom, make_cpu, timeit
+
+CYCLES = 500_000
+
+# fmt: off
+LOOP = [
+    0x7E,  # LD A,[HL]
+    0x81,  # ADD A,C
+    0xAA,  # XOR A,D
+    0x93,  # SUB A,E
+    0xA2,  # AND A,D
+    0x77,  # LD [HL],A
+    0x23,  # INC HL
+    0x80,  # ADD A,B
+    0xB1,  # OR A,C
+    0xFE, 0x40,  # CP A,0x40
+    0x38, 0x01,  # JR C,+1
+    0x0C,  # INC C
+    0x05,  # DEC B
+]
+BRANCH_PROGRAM = {
+    0x0000: [0xC3, 0x50, 0x01],  # JP 0x0150
+    0x0150: [
+        0x21, 0x00, 0xC0,  # LD HL,0xC000
+        0x06, 0x00,  # LD B,0
+        0x0E, 0x5A,  # LD C,0x5A
+        0x16, 0x3C,  # LD D,0x3C
+        0x1E, 0x0F,  # LD E,0x0F
+    ] + LOOP + [
+        0x20, (-len(LOOP) - 2) & 0xFF,  # JR NZ,loop
+        0xC3, 0x50, 0x01,  # JP 0x0150
+    ],
+}
+# fmt: on
+
+
+def bench(make_step):
+    rom = build_rom(BRANCH_PROGRAM)
+
+    def loop():
+        cpu = make_cpu(rom)
+        step = make_step(cpu)
+        while cpu._clock < CYCLES:
+            step()
+
+    return timeit(loop)
+
+
+def run():
+    from gbemu.JIT import JIT
+
+    for name, make_step in (
+        ("interpreter", lambda cpu: cpu.cycle),
+        ("jit", lambda cpu: JIT(cpu).cycle),
+        ("jit lazy", lambda cpu: JIT(cpu, lazy_flags=True).cycle),
+    ):
+        elapsed = bench(make_step)
+        print(f"{name:12s} {CYCLES / elapsed:>12,.0f} M-cycles/s")
+
+
+if __name__ == "__main__":
+    run()
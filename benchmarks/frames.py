@@ -0,0 +1,24 @@
+"""Emulated frames per second of a whole GBEmu instance.
+
+Runs the boot ROM (LCD on, logo scroll) against a blank cartridge.
+"""
+
+from common import timeit
+
+FRAMES = 60
+
+
+def run():
+    from gbemu.GBEmu import GBEmu
+
+    for backend in ("interpreter", "jit"):
+
+        def loop():
+            GBEmu(backend=backend, headless=True).run_frames(FRAMES)
+
+        elapsed = timeit(loop, repeat=3)
+        print(f"{backend:12s} {FRAMES / elapsed:>8.1f} frames/s")
+
+
+if __name__ == "__main__":
+    run()
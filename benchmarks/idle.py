@@ -0,0 +1,45 @@
+"""Emulated frames per second of a ROM waiting on LY, with and without
+idle-loop fast-forwarding.
+
+The program spins in ``LDH A,(44); CP 90; JR NZ`` like most games waiting
+for V-Blank, so nearly every cycle is an idle loop.
+"""
+
+from common import build_rom
+
+FRAMES = 120
+
+# fmt: off
+WAIT_PROGRAM = {
+    0x0000: [0xC3, 0x50, 0x01],  # JP 0x0150
+    0x0150: [
+        0x3E, 0x91,  # LD A,0x91
+        0xE0, 0x40,  # LDH (40),A    LCD on
+        # wait (0x0154)
+        0xF0, 0x44,  # LDH A,(44)
+        0xFE, 0x90,  # CP 0x90
+        0x20, 0xFA,  # JR NZ,wait
+        0x18, 0xF8,  # JR wait
+    ],
+}
+# fmt: on
+
+
+def run():
+    from gbemu.GBEmu import GBEmu
+
+    for backend in ("interpreter", "jit"):
+        for idle_skip in (False, True):
+            emu = GBEmu(backend=backend, headless=True, idle_skip=idle_skip)
+            emu._mmu.loadROM(build_rom(WAIT_PROGRAM))
+            emu._mmu.biosf = False
+            stats = emu.run_frames(FRAMES)
+            label = "%s%s" % (backend, " idle" if idle_skip else "")
+            print(
+                f"{label:17s} {FRAMES / stats.seconds:>8.1f} frames/s "
+                f"{stats.skipped / stats.cycles:>6.1%} skipped"
+            )
+
+
+if __name__ == "__main__":
+    run()
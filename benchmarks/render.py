@@ -0,0 +1,91 @@
+"""Frames per second of the GPU alone, rendering a full background.
+
+Compares the vectorized scanline renderer with the pixel-at-a-time reference
+renderer (both writing the shade framebuffer, converted and blitted once per
+frame) and with the original path, which converted every pixel to RGB and
+wrote it to the pygame surface with set_at. Uses SDL's dummy video driver, so
+no window is opened.
+"""
+
+import os
+
+from common import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+FRAMES = 60
+
+
+def make_gpu():
+    from gbemu.GPU import GPU
+
+    gpu = GPU()
+    for addr in range(0x1800):
+        gpu.VRAM[addr] = (addr * 37) & 0xFF
+        gpu.updateTile(addr)
+    for addr in range(0x1800, 0x2000):
+        gpu.VRAM[addr] = addr & 0xFF
+    gpu.wb(0xFF47, 0xE4)
+    gpu.wb(0xFF40, 0x91)
+    return gpu
+
+
+def use_set_at(gpu):
+    """Patch gpu back to per-pixel RGB conversion and set_at."""
+    import pygame
+
+    from gbemu.GPU import Color
+
+    # The nested-list tileset of the original renderer
+    tileset = gpu._tileset.tolist()
+
+    def renderscan():
+        mapbase = 0x1C00 if gpu._bgmap else 0x1800
+        mapbase += (((gpu._line + gpu._scy) & 0xFF) >> 3) << 5
+        lineoff = gpu._scx >> 3
+        y = (gpu._line + gpu._scy) & 0xFF
+        x = gpu._scx & 0x7
+        tile = gpu._vram[mapbase + lineoff]
+        if gpu._bgtile == 0 and tile < 128:
+            tile += 256
+        for p in range(0, 160):
+            color = Color.getColor(gpu._pal[tileset[tile][y & 7][x]])
+            gpu._screen.set_at((p, gpu._line), color)
+            x += 1
+            if x == 8:
+                x = 0
+                lineoff = (lineoff + 1) & 0x1F
+                tile = gpu._vram[mapbase + lineoff]
+                if gpu._bgtile == 0 and tile < 128:
+                    tile += 256
+
+    gpu._GPU__renderscan = renderscan
+    gpu.setFrameSink(lambda rgb: pygame.display.update())
+
+
+def use_reference(gpu):
+    gpu._GPU__renderscan = gpu._renderscanReference
+
+
+def run():
+    from gbemu.GBEmu import CYCLES_PER_FRAME
+
+    for name, patch in (
+        ("set_at", use_set_at),
+        ("pixel loop", use_reference),
+        ("vectorized", None),
+    ):
+        gpu = make_gpu()
+        if patch is not None:
+            patch(gpu)
+
+        def loop():
+            for _ in range(FRAMES):
+                gpu.step(CYCLES_PER_FRAME)
+
+        elapsed = timeit(loop, repeat=3)
+        print(f"{name:12s} {FRAMES / elapsed:>8.1f} frames/s")
+
+
+if __name__ == "__main__":
+    run()
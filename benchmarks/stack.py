@@ -0,0 +1,79 @@
+"""Instructions-per-second of stack-heavy code on each CPU backend.
+
+Nested CALL/RET, PUSH/POP and 16-bit immediate loads, so nearly every
+instruction makes a 16-bit memory access. Run with the stack in WRAM and in
+HRAM, where it sits until a game moves it.
+"""
+
+from common import build_rom, make_cpu, timeit
+
+CYCLES = 300_000
+
+# fmt: off
+def stack_program(sp):
+    return {
+        0x0000: [0xC3, 0x50, 0x01],  # JP 0x0150
+        0x0150: [
+            0x31, sp & 0xFF, sp >> 8,  # LD SP,sp
+            # loop (0x0153)
+            0x01, 0x34, 0x12,  # LD BC,0x1234
+            0x11, 0x78, 0x56,  # LD DE,0x5678
+            0xCD, 0x70, 0x01,  # CALL 0x0170
+            0xC3, 0x53, 0x01,  # JP loop
+        ],
+        0x0170: [
+            0xC5,  # PUSH BC
+            0xD5,  # PUSH DE
+            0xCD, 0x80, 0x01,  # CALL 0x0180
+            0xD1,  # POP DE
+            0xC1,  # POP BC
+            0xC9,  # RET
+        ],
+        0x0180: [
+            0xE5,  # PUSH HL
+            0xF5,  # PUSH AF
+            0x21, 0x00, 0xC0,  # LD HL,0xC000
+            0xF1,  # POP AF
+            0xE1,  # POP HL
+            0xC9,  # RET
+        ],
+    }
+# fmt: on
+
+
+def count_instructions(rom):
+    cpu = make_cpu(rom)
+    count = 0
+    while cpu._clock < CYCLES:
+        cpu.cycle()
+        count += 1
+    return count
+
+
+def bench(rom, make_step):
+    def loop():
+        cpu = make_cpu(rom)
+        step = make_step(cpu)
+        while cpu._clock < CYCLES:
+            step()
+
+    return timeit(loop)
+
+
+def run():
+    from gbemu.JIT import JIT
+
+    for where, sp in (("wram", 0xDFFE), ("hram", 0xFFFE)):
+        rom = build_rom(stack_program(sp))
+        instructions = count_instructions(rom)
+        for name, make_step in (
+            ("interpreter", lambda cpu: cpu.cycle),
+            ("jit", lambda cpu: JIT(cpu).cycle),
+        ):
+            elapsed = bench(rom, make_step)
+            label = f"{name} {where}"
+            print(f"{label:17s} {instructions / elapsed:>12,.0f} instructions/s")
+
+
+if __name__ == "__main__":
+    run()
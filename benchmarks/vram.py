@@ -0,0 +1,58 @@
+"""Cost of a VRAM-heavy scene: reload all tile data and the map, then render.
+
+Every byte goes through MMU.wb like a game's copy loop would. "eager" decodes
+the written tile row on every write (the previous updateTile), "deferred"
+only marks the tile and decodes dirty tiles in bulk before the next scanline.
+"""
+
+from common import timeit
+
+LOADS = 20
+
+
+def make_emu():
+    from gbemu.GBEmu import GBEmu
+
+    emu = GBEmu(headless=True)
+    emu._mmu.biosf = False
+    emu._gpu.wb(0xFF40, 0x91)
+    return emu
+
+
+def use_eager(gpu):
+    """Patch gpu back to decoding each tile row as it is written."""
+
+    def updateTile(addr):
+        tile = addr >> 4
+        if addr & 0x1:
+            addr -= 1
+        y = (addr >> 1) & 0x7
+        val1 = [(gpu._vram[addr] >> bit) & 1 for bit in range(8 - 1, -1, -1)]
+        val2 = [(gpu._vram[addr + 1] >> bit) & 1 for bit in range(8 - 1, -1, -1)]
+        gpu._tileset[tile, y] = [val1[x] + val2[x] * 2 for x in range(0, 8)]
+
+    gpu.updateTile = updateTile
+
+
+def run():
+    from gbemu.GBEmu import CYCLES_PER_FRAME
+
+    for name, patch in (("eager", use_eager), ("deferred", None)):
+        emu = make_emu()
+        if patch is not None:
+            patch(emu._gpu)
+        wb = emu._mmu.wb
+        step = emu._gpu.step
+
+        def loop():
+            for n in range(LOADS):
+                for addr in range(0x8000, 0xA000):
+                    wb(addr, (addr + n) & 0xFF)
+                step(CYCLES_PER_FRAME)
+
+        elapsed = timeit(loop, repeat=3)
+        print(f"{name:12s} {LOADS / elapsed:>8.1f} loads/s")
+
+
+if __name__ == "__main__":
+    run()
@@ -1,32 +1,305 @@
+import mmap
+import os
 import sys
+import time
+from dataclasses import dataclass
 
-import pygame
+from . import GPU, JIT, MBC, MMU, Z80
+from .Idle import IdleLoops
+from .Interrupts import JOYPAD
+from .Joypad import BUTTONS, KEYS, Joypad, readScript
+from .SaveRAM import SaveRAM
+from .Scheduler import Scheduler
+from .Serial import Serial
+from .Timer import Timer
 
-from . import GPU, MMU, Z80
+BACKENDS = ("interpreter", "jit")
+
+# 154 lines of 456 T-cycles
+CYCLES_PER_FRAME = 17556
+
+# M-cycles per second of the 4.194304 MHz clock
+CYCLES_PER_SECOND = 1048576
+
+# M-cycles between syncs of battery-backed RAM to its .sav file
+SAVE_FLUSH_CYCLES = CYCLES_PER_SECOND
+
+# Host time per emulated frame in real-time mode (about 59.7 Hz)
+FRAME_SECONDS = CYCLES_PER_FRAME / CYCLES_PER_SECOND
+
+
+@dataclass
+class RunStats:
+    """Summary of a batched run."""
+
+    instructions: int
+    cycles: int  # M-cycles
+    seconds: float
+    skipped: int = 0  # M-cycles fast-forwarded through idle loops
 
 
 class GBEmu:
-    def __init__(self):
+    def __init__(
+        self, backend="interpreter", headless=False, lazy_flags=False, idle_skip=True
+    ):
+        """Create an emulator instance.
+
+        Args:
+            backend: "interpreter" executes one instruction at a time through
+                Z80.cycle(); "jit" runs translated basic blocks (see JIT.py).
+            headless: Render into an in-memory framebuffer without opening a
+                window or importing pygame. Read frames back with frame().
+            lazy_flags: Let the jit backend skip computing flags that are
+                overwritten before anything reads them (see JIT.py).
+            idle_skip: Fast-forward loops that only wait for the next
+                scheduled event (see Idle.py). The emulated result is the
+                same either way.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        if lazy_flags and backend != "jit":
+            raise ValueError("lazy_flags requires the jit backend")
+
         self._mmu = MMU.MMU()
         self._cpu = Z80.Z80()
-        self._gpu = GPU.GPU()
+        self._gpu = GPU.GPU(headless=headless)
+        # Every timed event, keyed by the CPU's M-cycle clock
+        self._sched = Scheduler(lambda: self._cpu._clock)
 
         self._mmu.setGPU(self._gpu)
-        self._mmu.setOAM(self._gpu.OAM)
+        self._mmu.setScheduler(self._sched)
+        self._gpu.setScheduler(self._sched)
+        self._cpu.Scheduler = self._sched
+        self._mmu.interrupts.setScheduler(self._sched)
+        self._timer = Timer(self._sched, self._mmu.interrupts.request)
+        self._mmu.setTimer(self._timer)
+        self._serial = Serial(self._sched, self._mmu.interrupts.request)
+        self._mmu.setSerial(self._serial)
+        self._joypad = Joypad(self._sched, self._mmu.interrupts.request)
+        self._mmu.setJoypad(self._joypad)
 
         self._cpu.MMU = self._mmu
 
+        # Battery-backed cartridge RAM and its periodic flush event
+        self._save = None
+        self._flush = None
+
+        self._idle = IdleLoops(self._cpu, self._sched) if idle_skip else None
+
+        # Executes the next instruction (interpreter) or block (jit)
+        if backend == "jit":
+            self._jit = JIT.JIT(self._cpu, lazy_flags=lazy_flags, idle=self._idle)
+            self._exec = self._jit.cycle
+        else:
+            self._jit = None
+            self._exec = self._cpu.cycle
+            if self._idle is not None:
+                self._idle.install()
+
     def loadROM(self, path):
+        """Insert the cartridge image at path, or given as bytes.
+
+        Files are memory-mapped read-only rather than read: only the banks
+        the game touches are paged in, and instances running the same ROM
+        share the page cache. A cartridge with a battery keeps its RAM in a
+        .sav file next to the ROM (see SaveRAM.py).
+        """
+        self.close()
+        # Translated blocks and idle loops are keyed by (bank, address), so
+        # the old cartridge's would run in place of the new one's code
+        if self._jit is not None:
+            self._jit.reset()
+        if self._idle is not None:
+            self._idle.reset()
+        if isinstance(path, (bytes, bytearray, memoryview)):
+            self._mmu.loadROM(path)
+            return
         with open(path, "rb") as f:
-            rom = list(f.read())
+            if os.fstat(f.fileno()).st_size == 0:
+                rom = b""
+            else:
+                # Stays valid after the file is closed
+                rom = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         self._mmu.loadROM(rom)
+        if MBC.hasBattery(rom) and self._mmu.ramSize:
+            self._save = SaveRAM(os.path.splitext(path)[0] + ".sav", self._mmu.ramSize)
+            self._mmu.setBattery(self._save)
+            self._flush = self._sched.schedule(
+                self._sched.now + SAVE_FLUSH_CYCLES, self.__flushSave
+            )
+
+    def __flushSave(self, cycle):
+        # Dirty pages are synced by the save's own thread
+        self._mmu.flushRAM()
+        self._flush = self._sched.schedule(cycle + SAVE_FLUSH_CYCLES, self.__flushSave)
+
+    def close(self):
+        """Write out battery-backed RAM and stop its flush thread."""
+        if self._save is None:
+            return
+        self._sched.cancel(self._flush)
+        self._flush = None
+        self._mmu.flushRAM()
+        self._save.close()
+        self._save = None
+
+    @property
+    def joypad(self):
+        """The Joypad, for injecting input with joypad.inject(cycle, state)."""
+        return self._joypad
+
+    def loadInput(self, path):
+        """Queue the (cycle, buttons) events of a scripted input file.
+
+        See Joypad.readScript for the format. Cycles count from power-on.
+        """
+        for cycle, state in readScript(path):
+            self._joypad.inject(cycle, state)
+
+    def frame(self):
+        """Return the current frame as a (144, 160, 3) uint8 RGB array."""
+        return self._gpu.frame()
+
+    def frameBytes(self):
+        """Return the current frame as packed RGB bytes."""
+        return self._gpu.frameBytes()
+
+    def footprint(self):
+        """Return the approximate per-instance memory use in bytes, by component."""
+        return {
+            "mmu": self._mmu.footprint(),
+            "gpu": self._gpu.footprint(),
+        }
+
+    @property
+    def skippedCycles(self):
+        """Total M-cycles fast-forwarded through idle loops."""
+        return self._idle.skipped if self._idle is not None else 0
+
+    def run_cycles(self, n):
+        """Run for at least n M-cycles and return a RunStats.
+
+        The last instruction (or block) may finish a few cycles past n.
+        """
+        return self.__run(self._cpu._clock + n)
+
+    def run_frame(self):
+        """Run up to the next frame boundary (every CYCLES_PER_FRAME M-cycles)."""
+        return self.__run((self._cpu._clock // CYCLES_PER_FRAME + 1) * CYCLES_PER_FRAME)
+
+    def run_frames(self, n):
+        """Run n whole frames and return the combined RunStats."""
+        clock = self._cpu._clock
+        return self.__run((clock // CYCLES_PER_FRAME + n) * CYCLES_PER_FRAME)
+
+    def __run(self, target):
+        cpu = self._cpu
+        step = self._exec
+        sched = self._sched
+        interrupts = self._mmu.interrupts
+        first = cpu._clock
+        skipped = self.skippedCycles
+        instructions = 0
+        start = time.perf_counter()
+        # Caps every stretch of free running at the target
+        stop = sched.checkpoint(target)
+
+        # The CPU runs until the next event is due. Events scheduled while
+        # it runs (an LCD switched on, say) lower sched.next, so it is
+        # re-read after every instruction or block. Interrupts are only
+        # looked at here, between runs: whatever can make one pending
+        # ends the run with a checkpoint.
+        while cpu._clock < target:
+            if cpu._eidelay:
+                # EI takes effect after the instruction that follows it
+                cpu._eidelay = False
+                if not (cpu._halt or cpu._stop):
+                    cpu.cycle()
+                    instructions += 1
+                    sched.run(cpu._clock)
+                    continue
+            if (cpu._halt or cpu._stop) and not self.__wake():
+                # Nothing is fetched while halted: jump straight to the next
+                # event, the only thing that can raise an interrupt
+                cpu._clock = sched.next
+                sched.run(cpu._clock)
+                continue
+            if cpu._ime and interrupts.pending:
+                cpu.interrupt(interrupts.acknowledge())
+            if self._jit is None:
+                while cpu._clock < sched.next:
+                    step()
+                    instructions += 1
+            else:
+                while cpu._clock < sched.next:
+                    instructions += step()
+            sched.run(cpu._clock)
+
+        sched.cancel(stop)
+        return RunStats(
+            instructions,
+            cpu._clock - first,
+            time.perf_counter() - start,
+            self.skippedCycles - skipped,
+        )
+
+    def __wake(self):
+        """Leave HALT or STOP if an interrupt allows it; return True if awake.
+
+        HALT ends on any pending interrupt, even with interrupts disabled
+        (execution then simply continues). STOP only ends on a joypad
+        request.
+        """
+        cpu = self._cpu
+        interrupts = self._mmu.interrupts
+        if cpu._stop:
+            if not interrupts.flags & JOYPAD:
+                return False
+            cpu._stop = False
+        elif not interrupts.pending:
+            return False
+        cpu._halt = False
+        return True
 
     def start(self):
+        """Run in real time, forever.
+
+        Each frame is emulated as fast as possible and the host thread then
+        sleeps until the frame is due, so a game that sits in HALT costs
+        next to nothing. A host that falls behind doesn't try to catch up.
+        """
+        pygame = None
+        if not self._gpu.headless:
+            import pygame
+
+            keymap = [
+                (getattr(pygame, "K_" + key), BUTTONS[name])
+                for name, key in KEYS.items()
+            ]
+
+        deadline = time.perf_counter()
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+            # Host events and keys are handled once per frame, never per
+            # instruction
+            if pygame is not None:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.close()
+                        pygame.quit()
+                        sys.exit()
+                held = pygame.key.get_pressed()
+                state = 0
+                for key, bit in keymap:
+                    if held[key]:
+                        state |= bit
+                if state != self._joypad.state:
+                    self._joypad.inject(self._cpu._clock, state)
+
+            self.run_frame()
 
-            self._cpu.cycle()
-            self._gpu.step(self._cpu._m)
+            deadline += FRAME_SECONDS
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.perf_counter()
@@ -1,4 +1,9 @@
-import pygame
+import sys
+
+import numpy as np
+
+from .Interrupts import STAT, VBLANK
+from .Scheduler import Scheduler
 
 
 class Color(object):
@@ -18,13 +23,45 @@ class Color(object):
         return (255, 0, 255)
 
 
+# Shade index -> RGB, applied to the whole framebuffer once per frame
+PALETTE = np.array([Color.getColor(i) for i in range(4)], dtype=np.uint8)
+
+# Tile map byte -> tileset index with signed (0x8800) tile data addressing
+SIGNED_TILES = np.arange(256, dtype=np.intp)
+SIGNED_TILES[:128] += 256
+
+# Tile row decoding: (low byte | high byte << 8) -> 8 color indices, leftmost
+# pixel first. Indexed with VRAM viewed as little-endian 16-bit words.
+_words = np.arange(0x10000, dtype=np.uint32)[:, None]
+_bits = np.arange(7, -1, -1, dtype=np.uint32)
+TILE_ROWS = (((_words >> _bits) & 1) | (((_words >> (_bits + 8)) & 1) << 1)).astype(
+    np.uint8
+)
+del _words, _bits
+
+# BGP value -> shade of each color index (color 0 in bits 0-1), as a tuple
+# for the scanline loop and an array for the vectorized renderer
+SHADES = [tuple((val >> shift) & 3 for shift in (0, 2, 4, 6)) for val in range(256)]
+SHADE_ARRAYS = [np.array(shades, dtype=np.uint8) for shades in SHADES]
+
+# Screen column offsets into a 256 pixel background row
+COLUMNS = np.arange(160, dtype=np.intp)
+
+# Mode lengths in M-cycles (80, 172, 204 and 456 T-cycles), indexed by mode
+MODE_CYCLES = (51, 114, 20, 43)
+
+
 class GPU(object):
     """Game Boy PPU (Pixel Processing Unit).
 
     Emulates the DMG display hardware: a 160x144 LCD driven by a scanline
     state machine that cycles through OAM search, pixel transfer, H-Blank,
     and V-Blank. Tile and background map data live in 8 KB of VRAM; rendering
-    is performed scanline-by-scanline onto a pygame surface.
+    is performed scanline-by-scanline into a 160x144 framebuffer of 2-bit
+    shades, which is converted to RGB and presented once per frame.
+
+    Mode changes are events on a Scheduler: while the LCD is on there is
+    always exactly one pending, and nothing runs between them.
     """
 
     @property
@@ -35,40 +72,169 @@ class GPU(object):
     def OAM(self):
         return self._oam
 
-    def __init__(self):
-        pygame.init()
-        self._screen = pygame.display.set_mode((160, 144))
+    @property
+    def tileset(self):
+        """The decoded (384, 8, 8) tileset, with any pending writes applied."""
+        if self._tilesdirty:
+            self.__decodeTiles()
+        return self._tileset
+
+    @property
+    def headless(self):
+        return self._headless
+
+    def __init__(self, headless=False):
+        """Create the GPU.
+
+        Args:
+            headless: Don't open a pygame window; frames are only kept in
+                memory (see frame() and setFrameSink()). pygame is never
+                imported in this mode.
+        """
+        self._headless = headless
+        if headless:
+            self._pygame = None
+            self._screen = None
+            self._present = None
+        else:
+            import pygame
+
+            pygame.init()
+            self._pygame = pygame
+            self._screen = pygame.display.set_mode((160, 144))
+            self._present = self.__blit
+        # Shade indices (0-3), one byte per pixel. The scanline renderer
+        # writes the bytearray, everything else goes through the array view.
+        self._framebuffer = bytearray(160 * 144)
+        self._fb = np.frombuffer(self._framebuffer, dtype=np.uint8).reshape(144, 160)
+        # Standalone buffers; an MMU replaces them with views of its own
+        # address space through setVRAM/setOAM
+        self.setVRAM(bytearray(0x2000))
+        self._oam = bytearray(0xA0)
+        # Driven through step() until an emulator shares its own scheduler
+        self._event = None
+        self._sched = Scheduler()
+        self._request = None
+        # I/O register -> (read, write) handlers
+        self._io = {
+            0xFF40: (self.__rbLCDC, self.__wbLCDC),
+            0xFF41: (self.__rbSTAT, self.__wbSTAT),
+            0xFF42: (self.__rbSCY, self.__wbSCY),
+            0xFF43: (self.__rbSCX, self.__wbSCX),
+            0xFF44: (self.__rbLY, self.__wbLY),
+            0xFF45: (self.__rbLYC, self.__wbLYC),
+            0xFF47: (self.__rbBGP, self.__wbBGP),
+        }
         self.reset()
 
+    def setVRAM(self, vram):
+        self._vram = vram
+        self._vramview = np.frombuffer(vram, dtype=np.uint8)
+        # Tile data rows as (low | high << 8) words, indexed [tile, row]
+        self._tilewords = self._vramview[:0x1800].view("<u2").reshape(384, 8)
+
+    def setOAM(self, oam):
+        self._oam = oam
+
+    def setInterruptRequest(self, request):
+        """Raise interrupts through request(mask), e.g. Interrupts.request."""
+        self._request = request
+
+    def setScheduler(self, sched):
+        """Register mode changes on sched instead of the GPU's own queue."""
+        self.__suspend()
+        self._sched = sched
+        if self._lcd:
+            self.__resume()
+
     def reset(self):
         """Reset all GPU state to power-on defaults."""
+        self.__suspend()
         self._mode = 2
-        self._modeclock = 0
+        # M-cycles left in the current mode while the LCD is off
+        self._remaining = MODE_CYCLES[2]
         self._line = 0
+        self._lyc = 0
+        self._statie = 0
         self._bgmap = 0
         self._bgtile = 0
         self._scy = 0
         self._scx = 0
         self._bgdisplay = 0
         self._lcd = 0
-        self._vram = [0] * 0x2000
-        self._oam = [0] * 0xA0
-        self._screen.fill((255, 255, 255))
-        self._tileset = [[[0] * 8 for _ in range(8)] for _ in range(384)]
-        self._pal = [3, 2, 1, 0]
-        pygame.display.update()
+        self._vram[:] = bytes(len(self._vram))
+        self._oam[:] = bytes(len(self._oam))
+        # Decoded 2-bit color indices, indexed [tile, row, column]
+        self._tileset = np.zeros((384, 8, 8), dtype=np.uint8)
+        # Tiles written since they were last decoded
+        self._dirty = np.zeros(384, dtype=np.bool_)
+        self._tilesdirty = False
+        self.__wbBGP(0xFF47, 0x1B)
+        self._fb.fill(0)
+        if self._present is not None:
+            self._present(self.frame())
+
+    def setFrameSink(self, sink):
+        """Call sink with each finished frame at V-Blank.
+
+        Args:
+            sink: Callable taking a (144, 160, 3) uint8 RGB array, or None to
+                stop presenting. In windowed mode this replaces the blit to
+                the pygame window.
+        """
+        self._present = sink
+
+    def frame(self):
+        """Return the current frame as a new (144, 160, 3) uint8 RGB array."""
+        return PALETTE[self._fb]
+
+    def frameBytes(self):
+        """Return the current frame as packed RGB bytes."""
+        return self.frame().tobytes()
+
+    def __blit(self, rgb):
+        # surfarray is indexed (x, y)
+        self._pygame.surfarray.blit_array(self._screen, rgb.swapaxes(0, 1))
+        self._pygame.display.update()
+
+    def footprint(self):
+        """Return the bytes held by GPU-owned state.
+
+        VRAM and OAM are only counted while the GPU owns them; once an MMU
+        has shared its views they belong to the MMU's footprint.
+        """
+        size = sys.getsizeof(self._tileset) + sys.getsizeof(self._framebuffer)
+        for buf in (self._vram, self._oam):
+            if not isinstance(buf, memoryview):
+                size += sys.getsizeof(buf)
+        return size
 
     def __renderscan(self):
-        """Render the current scanline to the pygame surface.
+        """Render the current scanline into the framebuffer.
 
-        Reads tile indices from the background map in VRAM, looks up pixel
-        data in the pre-decoded tileset, applies the background palette, and
-        writes 160 pixels to the surface at the current scanline.
+        Reads the 32 tile indices of the background map row in VRAM, gathers
+        the matching pre-decoded tile rows into one 256 pixel line, picks the
+        160 visible pixels starting at SCX (wrapping around) and applies the
+        background palette, all as whole-array operations.
 
         Tile data addressing depends on LCDC bit 4 (_bgtile):
           - 1: unsigned mode, tiles at 0x8000 (tileset indices 0-255)
           - 0: signed mode, tiles at 0x8800 (indices 0-127 offset by +256)
         """
+        y = (self._line + self._scy) & 0xFF
+        mapbase = (0x1C00 if self._bgmap else 0x1800) + ((y >> 3) << 5)
+        if self._tilesdirty:
+            self.__decodeTiles()
+        tiles = self._vramview[mapbase : mapbase + 32]
+        if not self._bgtile:
+            tiles = SIGNED_TILES[tiles]
+        row = self._tileset[tiles, y & 7].ravel()
+        self._fb[self._line] = self._bgpal[row[(COLUMNS + self._scx) & 0xFF]]
+
+    def _renderscanReference(self):
+        """Pixel-at-a-time version of __renderscan, kept to test against."""
+        if self._tilesdirty:
+            self.__decodeTiles()
         if self._bgmap:
             mapbase = 0x1C00
         else:
@@ -82,9 +248,11 @@ class GPU(object):
         if self._bgtile == 0 and tile < 128:
             tile += 256
 
-        for p in range(0, 160):
-            color = Color.getColor(self._pal[self._tileset[tile][y & 7][x]])
-            self._screen.set_at((p, self._line), color)
+        fb = self._framebuffer
+        pal = self._pal
+        offset = self._line * 160
+        for p in range(offset, offset + 160):
+            fb[p] = pal[self._tileset[tile, y & 7, x]]
             x += 1
             if x == 8:
                 x = 0
@@ -94,93 +262,143 @@ class GPU(object):
                     tile += 256
 
     def updateTile(self, addr):
-        """Decode a tile row from VRAM into the pre-decoded tileset cache.
+        """Mark the tile holding a written VRAM byte for decoding.
 
-        Each Game Boy tile is 16 bytes (2 bytes per row, 8 rows). The two
-        bytes encode 8 pixels in 2BPP format: bit N of byte 0 is the low bit
-        and bit N of byte 1 is the high bit of pixel N's palette index.
+        Tiles are decoded in bulk by __decodeTiles before the next scanline
+        is rendered, so a game copying tile data only pays for this call.
 
         Args:
             addr: VRAM-relative address (0x0000-0x17FF) of the written byte.
         """
-        tile = addr >> 4
-        if addr & 0x1:
-            addr -= 1
+        self._dirty[addr >> 4] = True
+        self._tilesdirty = True
 
-        y = (addr >> 1) & 0x7
-        val1 = [(self._vram[addr] >> bit) & 1 for bit in range(8 - 1, -1, -1)]
-        val2 = [(self._vram[addr + 1] >> bit) & 1 for bit in range(8 - 1, -1, -1)]
-        for x in range(0, 8):
-            self._tileset[tile][y][x] = val1[x] + val2[x] * 2
+    def __decodeTiles(self):
+        """Decode every dirty tile from VRAM into the tileset.
 
-    def rb(self, addr):
-        """Read a GPU I/O register (0xFF40-0xFF47).
+        Each Game Boy tile is 16 bytes (2 bytes per row, 8 rows). The two
+        bytes encode 8 pixels in 2BPP format: bit N of byte 0 is the low bit
+        and bit N of byte 1 is the high bit of pixel N's palette index, so a
+        whole row is one lookup of the row's 16-bit word in TILE_ROWS.
+        """
+        tiles = np.flatnonzero(self._dirty)
+        self._tileset[tiles] = TILE_ROWS[self._tilewords[tiles]]
+        self._dirty[tiles] = False
+        self._tilesdirty = False
+
+    def ioHandlers(self):
+        """Return {address: (read, write)} for the GPU's I/O registers.
 
         Registers:
             0xFF40 - LCDC: LCD control (bg enable, tile map/data select, LCD on)
+            0xFF41 - STAT: interrupt selects, LY=LYC flag and current mode
             0xFF42 - SCY:  background scroll Y
             0xFF43 - SCX:  background scroll X
             0xFF44 - LY:   current scanline (read-only)
+            0xFF45 - LYC:  scanline compared against LY
             0xFF47 - BGP:  background palette
-        """
-        if addr == 0xFF40:
-            return (
-                self._bgdisplay * 0x01
-                | self._bgmap * 0x08
-                | self._bgtile * 0x10
-                | self._lcd * 0x80
-            )
-        if addr == 0xFF42:
-            return self._scy
-        if addr == 0xFF43:
-            return self._scx
-        if addr == 0xFF44:
-            return self._line
-
-        if addr == 0xFF47:
-            res = 0
-            for x in range(0, 4):
-                res |= self._pal[3 - x] << x * 2
-            return res
-
-    def wb(self, addr, val):
-        """Write a GPU I/O register (0xFF40-0xFF47).
 
-        See rb() for the register map. Writing to 0xFF44 (LY) is a no-op;
-        the scanline counter is driven by the GPU's internal state machine.
+        LY and STAT first run any mode change that came due since the
+        scheduler last dispatched. Writing to LY is a no-op; the scanline
+        counter is driven by the GPU's internal state machine.
         """
-        # LCD Control
-        if addr == 0xFF40:
-            self._bgdisplay = val & 0x01
-            self._bgmap = (val & 0x08) >> 3
-            self._bgtile = (val & 0x10) >> 4
-            self._lcd = (val & 0x80) >> 7
-            return
-
-        # Scroll Y
-        if addr == 0xFF42:
-            self._scy = val
-            return
-        # Scroll X
-        if addr == 0xFF43:
-            self._scx = val
-            return
-
-        # Current Line (writing into this register resets it)
-        if addr == 0xFF44:
-            return
-
-        # Background Palette
-        if addr == 0xFF47:
-            pal = [(val >> bit) & 1 for bit in range(8 - 1, -1, -1)]
-            for i in range(0, 8, 2):
-                self._pal[i // 2] = (pal[i] << 1) | pal[i + 1]
-            self._pal.reverse()
-
-            return
+        return dict(self._io)
 
-    def step(self, m):
-        """Advance the GPU state machine by the given number of machine cycles.
+    def rb(self, addr):
+        """Read a GPU I/O register. See ioHandlers() for the register map."""
+        return self._io[addr][0](addr)
+
+    def wb(self, addr, val):
+        """Write a GPU I/O register. See ioHandlers() for the register map."""
+        self._io[addr][1](addr, val)
+
+    # LCD Control
+    def __rbLCDC(self, addr):
+        return (
+            self._bgdisplay * 0x01
+            | self._bgmap * 0x08
+            | self._bgtile * 0x10
+            | self._lcd * 0x80
+        )
+
+    def __wbLCDC(self, addr, val):
+        self._bgdisplay = val & 0x01
+        self._bgmap = (val & 0x08) >> 3
+        self._bgtile = (val & 0x10) >> 4
+        lcd = (val & 0x80) >> 7
+        if lcd != self._lcd:
+            self._lcd = lcd
+            if lcd:
+                self.__resume()
+            else:
+                self.__suspend()
+
+    # LCD Status, only the interrupt selects are writable
+    def __rbSTAT(self, addr):
+        self._sched.sync()
+        return (
+            0x80
+            | self._statie
+            | (self._line == self._lyc) << 2
+            | (self._mode if self._lcd else 0)
+        )
+
+    def __wbSTAT(self, addr, val):
+        self._statie = val & 0x78
+
+    # Scroll Y
+    def __rbSCY(self, addr):
+        return self._scy
+
+    def __wbSCY(self, addr, val):
+        self._scy = val
+
+    # Scroll X
+    def __rbSCX(self, addr):
+        return self._scx
+
+    def __wbSCX(self, addr, val):
+        self._scx = val
+
+    # Current Line
+    def __rbLY(self, addr):
+        self._sched.sync()
+        return self._line
+
+    def __wbLY(self, addr, val):
+        return
+
+    # LY Compare
+    def __rbLYC(self, addr):
+        return self._lyc
+
+    def __wbLYC(self, addr, val):
+        self._lyc = val
+
+    # Background Palette
+    def __rbBGP(self, addr):
+        return self._bgp
+
+    def __wbBGP(self, addr, val):
+        self._bgp = val
+        self._pal = SHADES[val]
+        self._bgpal = SHADE_ARRAYS[val]
+
+    def __suspend(self):
+        """Stop the state machine, keeping the time left in the current mode."""
+        if self._event is not None:
+            self._remaining = self._event[0] - self._sched.now
+            self._sched.cancel(self._event)
+            self._event = None
+
+    def __resume(self):
+        """Restart the state machine where __suspend left it."""
+        self._event = self._sched.schedule(
+            self._sched.now + self._remaining, self.__modeChange
+        )
+
+    def __modeChange(self, cycle):
+        """Leave the current mode and schedule the end of the next one.
 
         The GPU cycles through four modes per visible scanline:
           Mode 2 (OAM search)     -  80 T-cycles
@@ -189,42 +407,58 @@ class GPU(object):
         After 144 visible lines, it enters:
           Mode 1 (V-Blank)        - 456 T-cycles x 10 lines
 
+        Entering mode 0, 1 or 2, and LY reaching LYC, raise the STAT
+        interrupt when selected in STAT bits 3-6.
+
+        Args:
+            cycle: M-cycle the current mode ended on.
+        """
+        mode = self._mode
+        line = self._line
+        if mode == 2:
+            self._mode = 3
+
+        elif mode == 3:
+            self._mode = 0
+            self.__renderscan()
+
+        elif mode == 0:
+            self._line += 1
+            if self._line == 144:
+                self._mode = 1
+                if self._request is not None:
+                    self._request(VBLANK)
+                if self._present is not None:
+                    self._present(self.frame())
+            else:
+                self._mode = 2
+
+        else:
+            self._line += 1
+            if self._line > 153:
+                self._mode = 2
+                self._line = 0
+
+        if self._statie and self._request is not None:
+            stat = 0
+            if self._mode != mode and self._mode != 3:
+                stat |= self._statie & (0x08 << self._mode)
+            if self._line != line and self._line == self._lyc:
+                stat |= self._statie & 0x40
+            if stat:
+                self._request(STAT)
+
+        self._event = self._sched.schedule(
+            cycle + MODE_CYCLES[self._mode], self.__modeChange
+        )
+
+    def step(self, m):
+        """Advance a standalone GPU by the given number of machine cycles.
+
+        Runs the GPU's own scheduler; once setScheduler() has shared an
+        emulator's queue the emulator's main loop drives the GPU instead.
+
         Args:
-            m: Machine cycles elapsed since the last call (1 M-cycle = 4 T-cycles).
+            m: Machine cycles to advance (1 M-cycle = 4 T-cycles).
         """
-        if not self._lcd:
-            return
-        self._modeclock += m * 4
-        if self._mode == 2:
-            if self._modeclock >= 80:
-                self._mode = 3
-                self._modeclock = 0
-            return
-        if self._mode == 3:
-            if self._modeclock >= 172:
-                self._mode = 0
-                self._modeclock = 0
-                self.__renderscan()
-
-            return
-
-        if self._mode == 0:
-            if self._modeclock >= 204:
-                self._modeclock = 0
-                self._line += 1
-
-                if self._line == 144:
-                    self._mode = 1
-                    pygame.display.update()
-                else:
-                    self._mode = 2
-            return
-
-        if self._mode == 1:
-            if self._modeclock >= 456:
-                self._modeclock = 0
-                self._line += 1
-                if self._line > 153:
-                    self._mode = 2
-                    self._line = 0
-            return
+        self._sched.run(self._sched.now + m)
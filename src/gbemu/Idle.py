@@ -0,0 +1,182 @@
+from .JIT import BIOS_BANK
+from .registers import PC
+from .Scheduler import NEVER
+
+ZERO = 0x80
+CARRY = 0x10
+
+# Instructions an idle loop may be built from: opcode -> (length, M-cycles)
+LOADS = {0xF0: (2, 3), 0xFA: (3, 4)}  # LDH A,(n), LD A,(nn)
+TESTS = {0xFE: (2, 2), 0xE6: (2, 2), 0xA7: (1, 1), 0xB7: (1, 1), 0xBF: (1, 1)}
+EXITS = {0x20: (2, 2), 0x28: (2, 2), 0x30: (2, 2), 0x38: (2, 2)}  # JR cc
+EXITS.update({0xC2: (3, 3), 0xCA: (3, 3), 0xD2: (3, 3), 0xDA: (3, 3)})  # JP cc
+JR_OPS = (0x18, 0x20, 0x28, 0x30, 0x38)
+
+# Registers whose value follows the clock rather than scheduled events:
+# DIV and TIMA
+CLOCKED = {0xFF04, 0xFF05}
+
+
+def loopCycles(rb, start, end):
+    """Return the M-cycles of one pass of an idle loop, or 0 if it isn't one.
+
+    The loop runs from start to the backward JR at end. It is idle when one
+    pass can only change A and F, A is loaded from memory before anything
+    uses it, and every early exit tests flags set earlier in the same pass:
+    then a pass is a function of memory alone, and memory only changes when
+    a scheduled event runs.
+
+    Args:
+        rb: Memory read function, used to decode the loop.
+        start: Address of the first instruction (the JR target).
+        end: Address of the backward JR.
+    """
+    addr = start
+    cycles = 2  # the JR back
+    loaded = False
+    flags = 0  # flags written so far in the pass
+    while addr < end:
+        op = rb(addr)
+        if op in LOADS:
+            length, m = LOADS[op]
+            if op == 0xF0:
+                src = 0xFF00 | rb(addr + 1)
+            else:
+                src = rb(addr + 1) | rb(addr + 2) << 8
+            if src in CLOCKED:
+                return 0
+            loaded = True
+        elif op in TESTS or (op == 0xCB and rb(addr + 1) & 0xC7 == 0x47):
+            # CP n, AND n, AND A, OR A, CP A, BIT b,A
+            if not loaded:
+                return 0
+            if op == 0xCB:
+                length, m = 2, 2
+                flags |= ZERO
+            else:
+                length, m = TESTS[op]
+                flags |= ZERO | CARRY
+        elif op in EXITS:
+            length, m = EXITS[op]
+            if not flags & (CARRY if op & 0x10 else ZERO):
+                return 0
+            if op < 0x40:
+                n = rb(addr + 1)
+                target = (addr + 2 + (n & 0x7F) - (n & 0x80)) & 0xFFFF
+            else:
+                target = rb(addr + 1) | rb(addr + 2) << 8
+            if start <= target <= end:
+                return 0
+        elif op == 0x00:
+            length, m = 1, 1
+        else:
+            return 0
+        addr += length
+        cycles += m
+    if addr != end:
+        return 0
+    return cycles
+
+
+class IdleLoops(object):
+    """Fast-forwards the CPU through loops that wait on memory-mapped state.
+
+    Loops like the boot ROM's ``LDH A,(44); CP 90; JR NZ`` spin until a
+    scheduled event (a GPU mode change, later a timer or an interrupt)
+    changes what they read. Once a loop has gone round one whole pass with
+    no event during it, every further pass up to the next event is
+    identical, so skip() adds those passes to the clock in one go. Cycle
+    totals and CPU state come out exactly as if they had run.
+
+    Only loops in ROM are considered. Their analysis is cached by
+    (bank, address), the same way the JIT keys its blocks.
+    """
+
+    def __init__(self, cpu, sched):
+        self._cpu = cpu
+        self._sched = sched
+        # (key, end) -> M-cycles per pass, 0 when not idle
+        self._loops = {}
+        # (key, clock) at the last backward jump into an idle loop
+        self._last = None
+        # Total M-cycles fast-forwarded
+        self.skipped = 0
+
+    def reset(self):
+        """Forget every analysed loop, e.g. when the cartridge changes."""
+        self._loops = {}
+        self._last = None
+
+    def key(self, pc):
+        """Return the cache key for code at pc, or None outside ROM."""
+        mem = self._cpu.MMU
+        if pc < 0x0100 and mem._biosf:
+            return (BIOS_BANK << 16) | pc
+        if pc < 0x4000:
+            return (mem._rom0bank << 16) | pc
+        if pc < 0x8000:
+            return (mem._rombank << 16) | pc
+        return None
+
+    def cycles(self, key, start, end):
+        """Return the cached loopCycles() of the loop [start, end]."""
+        try:
+            return self._loops[key, end]
+        except KeyError:
+            m = self._loops[key, end] = loopCycles(self._cpu.MMU.rb, start, end)
+            return m
+
+    def skip(self, key, cycles, clock):
+        """Called at the head of an idle loop after jumping back to it.
+
+        Args:
+            key: Cache key of the loop head.
+            cycles: M-cycles of one pass.
+            clock: The CPU clock at the loop head.
+
+        Returns:
+            The M-cycles to add to the clock: whole passes that fit before
+            the next scheduled event.
+        """
+        sched = self._sched
+        last = self._last
+        self._last = (key, clock)
+        # Only skip once a whole pass ran from the loop head with no event
+        # dispatched during it: its A and flags no longer depend on how the
+        # loop was entered, and the next passes will read the same memory
+        start = clock - cycles
+        if last != (key, start) or sched.lastRun > start or sched.next == NEVER:
+            return 0
+        # The pass just closed may already have run past the event
+        if clock >= sched.next:
+            return 0
+        skipped = (sched.next - clock) // cycles * cycles
+        if skipped > 0:
+            self.skipped += skipped
+            self._last = (key, clock + skipped)
+        return skipped
+
+    def install(self):
+        """Wrap the interpreter's JR handlers to fast-forward idle loops."""
+        opmap = self._cpu._opmap
+        for op in JR_OPS:
+            opmap[op] = self.__wrap(opmap[op])
+
+    def __wrap(self, handler):
+        cpu = self._cpu
+        rr = cpu._rr
+
+        def jr():
+            end = rr[PC] - 1
+            handler()
+            start = rr[PC]
+            if start <= end < 0x8000:
+                key = self.key(start)
+                cycles = self.cycles(key, start, end)
+                if cycles:
+                    # The interpreter adds the JR itself after the handler
+                    cpu._clock += self.skip(key, cycles, cpu._clock + cpu._m)
+
+        jr.__name__ = handler.__name__
+        jr.__doc__ = handler.__doc__
+        return jr
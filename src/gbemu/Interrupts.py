@@ -0,0 +1,74 @@
+# Interrupt sources, as bits of IE and IF, highest priority first
+VBLANK = 0x01
+STAT = 0x02
+TIMER = 0x04
+SERIAL = 0x08
+JOYPAD = 0x10
+
+# Source bit -> handler address
+VECTORS = {VBLANK: 0x40, STAT: 0x48, TIMER: 0x50, SERIAL: 0x58, JOYPAD: 0x60}
+
+
+class Interrupts(object):
+    """The interrupt enable (IE, 0xFFFF) and request (IF, 0xFF0F) registers.
+
+    Components raise a source with request(); an interrupt is pending once
+    its bit is set in both registers. A pending interrupt wakes a halted CPU
+    whether or not the CPU has interrupts enabled (IME).
+
+    The emulator only looks for pending interrupts when a scheduled event
+    has run, so nothing is checked per instruction. Anything that can make
+    an interrupt pending outside an event (IE and IF writes, requests from
+    the CPU side) schedules a checkpoint at the current cycle to get it
+    looked at before the next instruction.
+    """
+
+    def __init__(self):
+        self._sched = None
+        self.reset()
+
+    def reset(self):
+        self._enable = 0x00
+        self._flags = 0x00
+
+    def setScheduler(self, sched):
+        self._sched = sched
+
+    @property
+    def enable(self):
+        return self._enable
+
+    @enable.setter
+    def enable(self, value):
+        self._enable = value
+        self.__check()
+
+    @property
+    def flags(self):
+        return self._flags
+
+    @flags.setter
+    def flags(self, value):
+        self._flags = value & 0x1F
+        self.__check()
+
+    @property
+    def pending(self):
+        """Bits of the interrupts both enabled and requested."""
+        return self._enable & self._flags & 0x1F
+
+    def request(self, mask):
+        """Set the IF bits of the given sources."""
+        self._flags |= mask
+        self.__check()
+
+    def acknowledge(self):
+        """Clear the highest priority pending request and return its vector."""
+        pending = self._enable & self._flags & 0x1F
+        bit = pending & -pending
+        self._flags &= ~bit
+        return VECTORS[bit]
+
+    def __check(self):
+        if self._sched is not None:
+            self._sched.checkpoint()
@@ -0,0 +1,599 @@
+from .alu import ADC, AND, DEC, INC, OR, SBC, XOR
+from .registers import AF, BC, DE, HL, PC, SP, A, B, C, D, E, F, H, L
+
+# Register field encoding used by the opcode table (index 6 is [HL])
+R8 = [B, C, D, E, H, L, None, A]
+R8_NAMES = ["B", "C", "D", "E", "H", "L", "[HL]", "A"]
+R16 = [BC, DE, HL, SP]
+R16_NAMES = ["BC", "DE", "HL", "SP"]
+R16_STACK = [BC, DE, HL, AF]
+R16_STACK_NAMES = ["BC", "DE", "HL", "AF"]
+
+# Branch conditions, indexed by bits 3-4 of the opcode: NZ, Z, NC, C
+CONDITIONS = [
+    ("NZ", "not r[%d] & 0x80" % F),
+    ("Z", "r[%d] & 0x80" % F),
+    ("NC", "not r[%d] & 0x10" % F),
+    ("C", "r[%d] & 0x10" % F),
+]
+
+# Instruction lengths, everything else is a single byte
+LENGTH = [1] * 0x100
+for _op in (0x06, 0x0E, 0x16, 0x1E, 0x26, 0x2E, 0x36, 0x3E, 0xC6, 0xCE, 0xD6):
+    LENGTH[_op] = 2
+for _op in (0xDE, 0xE6, 0xEE, 0xF6, 0xFE, 0xE0, 0xF0, 0xE8, 0xF8, 0xCB):
+    LENGTH[_op] = 2
+for _op in (0x18, 0x20, 0x28, 0x30, 0x38):
+    LENGTH[_op] = 2
+for _op in (0x01, 0x11, 0x21, 0x31, 0x08, 0xEA, 0xFA):
+    LENGTH[_op] = 3
+for _op in (0xC3, 0xC2, 0xCA, 0xD2, 0xDA, 0xCD, 0xC4, 0xCC, 0xD4, 0xDC):
+    LENGTH[_op] = 3
+
+# Instructions after which execution may not fall through to the next
+# address, or after which interrupt state may change: they close a block
+ENDS_BLOCK = {0xC3, 0xC2, 0xCA, 0xD2, 0xDA, 0xE9}  # JP
+ENDS_BLOCK |= {0x18, 0x20, 0x28, 0x30, 0x38}  # JR
+ENDS_BLOCK |= {0xCD, 0xC4, 0xCC, 0xD4, 0xDC}  # CALL
+ENDS_BLOCK |= {0xC9, 0xC0, 0xC8, 0xD0, 0xD8, 0xD9}  # RET, RETI
+ENDS_BLOCK |= {0xC7, 0xCF, 0xD7, 0xDF, 0xE7, 0xEF, 0xF7, 0xFF}  # RST
+ENDS_BLOCK |= {0x76, 0x10, 0xF3, 0xFB}  # HALT, STOP, DI, EI
+
+# IF and IE: a block stops after a direct write to either, so an interrupt
+# it makes pending is taken before the next instruction
+INTERRUPT_REGISTERS = {0xFF0F, 0xFFFF}
+
+# Unassigned opcodes are left to the interpreter
+UNTRANSLATABLE = {0xD3, 0xDB, 0xDD, 0xE3, 0xE4, 0xEB, 0xEC, 0xED, 0xF4, 0xFC, 0xFD}
+
+# Instructions that may write memory. Blocks in RAM end after one of these
+# so a block never keeps running code it has just overwritten.
+WRITES = {0x02, 0x12, 0x22, 0x32, 0x34, 0x35, 0x36, 0x08, 0xE0, 0xE2, 0xEA, 0xCB}
+WRITES |= set(range(0x70, 0x76)) | {0x77}
+WRITES |= {0xC5, 0xD5, 0xE5, 0xF5}
+
+# Writes whose target isn't known when translating. Blocks in ROM end after
+# one of these (and after LD (nn),A below 0x8000 or to IE/IF) since it may
+# switch the bank the rest of the block was translated from or, for
+# LD (C),A, write IE or IF.
+ROM_WRITES = WRITES - {0x08, 0xE0, 0xEA, 0xC5, 0xD5, 0xE5, 0xF5}
+
+# 8-bit arithmetic/logic on A (register, [HL] and immediate forms) and
+# 8-bit INC/DEC, inlined through the gbemu.alu tables
+ALU_NAMES = ["ADD", "ADC", "SUB", "SBC", "AND", "XOR", "OR", "CP"]
+ALU_OPS = set(range(0x80, 0xC0)) | {0xC6, 0xCE, 0xD6, 0xDE, 0xE6, 0xEE, 0xF6, 0xFE}
+INC_DEC_OPS = {0x04 | d << 3 for d in range(8)} | {0x05 | d << 3 for d in range(8)}
+
+# Inlined instructions that neither read nor write F, for flag liveness
+FLAGLESS = {0x00, 0xF9, 0xC3, 0x18, 0xCD, 0xC9, 0xC1, 0xD1, 0xE1, 0xC5, 0xD5, 0xE5}
+FLAGLESS |= set(range(0x40, 0x80)) - {0x76}  # LD r,r'
+FLAGLESS |= {op for op in range(0x100) if op & 0xC7 == 0x06}  # LD r,n
+FLAGLESS |= {op for op in range(0x100) if op & 0xC7 in (0x01, 0x03)}  # rr,nn/INC/DEC
+FLAGLESS |= {0x0A, 0x1A, 0x02, 0x12, 0xFA, 0xEA, 0xF0, 0xE0, 0xF2, 0xE2}
+FLAGLESS |= {0x22, 0x2A, 0x32, 0x3A}
+
+# Bank number used in cache keys while the BIOS overlays 0x0000 - 0x00FF
+BIOS_BANK = 0xFFFF
+
+# Longest run of guest instructions translated into one block
+MAX_BLOCK = 32
+
+
+class JIT(object):
+    """Basic-block translation backend for the Z80 core.
+
+    Straight-line runs of guest instructions starting at PC are decoded once,
+    emitted as specialised Python source (operands folded to constants,
+    register moves, loads and 8-bit ALU operations inlined, everything else
+    calling the interpreter's opcode handler) and compiled with compile(). Blocks are
+    cached by (bank, PC) and only ROM, WRAM and HRAM are translated; any
+    other PC, and unassigned opcodes, fall back to Z80.cycle().
+
+    Blocks in WRAM/HRAM are dropped when MMU.wb writes over any of their
+    bytes: the JIT watches the pages holding such blocks.
+
+    With lazy_flags, the flags of inlined ALU instructions are only computed
+    when something can read them: a later instruction in the block that
+    tests them, an interpreter handler, or the end of the block (so F is
+    always exact between blocks, where IsFlagSet, interrupts and snapshots
+    look at it). Otherwise those instructions just compute their result.
+
+    Given an Idle.IdleLoops, a block that is a whole idle loop (it starts at
+    the target of its closing backward JR) ends by fast-forwarding the clock.
+    """
+
+    def __init__(self, cpu, lazy_flags=False, idle=None):
+        self._cpu = cpu
+        self._lazyflags = lazy_flags
+        self._idle = idle
+        self._mem = cpu.MMU
+        self._r = cpu._r
+        self._rr = cpu._rr
+
+        # (bank << 16 | pc) -> compiled block, or None when untranslatable
+        self._blocks = {}
+        # Guest address -> keys of RAM blocks covering it
+        self._owners = {}
+        # Page -> number of addresses with owners, for pages being watched
+        self._watched = {}
+
+    def reset(self):
+        """Drop every translated block."""
+        for page in self._watched:
+            self.__unwatch(page)
+        self._blocks = {}
+        self._owners = {}
+        self._watched = {}
+
+    def cycle(self):
+        """Execute one block (or one interpreted instruction) at PC.
+
+        Returns the number of guest instructions executed.
+        """
+        pc = self._rr[PC]
+        mem = self._mem
+        if pc < 0x0100 and mem._biosf:
+            key = (BIOS_BANK << 16) | pc
+        elif pc < 0x4000:
+            key = (mem._rom0bank << 16) | pc
+        elif pc < 0x8000:
+            key = (mem._rombank << 16) | pc
+        else:
+            key = pc
+
+        try:
+            block = self._blocks[key]
+        except KeyError:
+            block = self._blocks[key] = self.__translate(pc, key)
+
+        if block is None:
+            self._cpu.cycle()
+            return 1
+        return block()
+
+    def __region(self, pc):
+        """Return (end, writable) of the translatable region holding pc."""
+        if pc < 0x0100 and self._mem._biosf:
+            return 0x0100, False
+        if pc < 0x4000:
+            return 0x4000, False
+        if pc < 0x8000:
+            return 0x8000, False
+        if 0xC000 <= pc < 0xE000:
+            return 0xE000, True
+        if 0xFF80 <= pc < 0xFFFF:
+            return 0xFFFF, True
+        return None, False
+
+    def __translate(self, pc, key):
+        end, writable = self.__region(pc)
+        if end is None:
+            return None
+
+        rb = self._mem.rb
+        decoded = []
+        addr = pc
+        closed = False
+        for _ in range(MAX_BLOCK):
+            op = rb(addr)
+            if op in UNTRANSLATABLE or addr + LENGTH[op] > end:
+                break
+            operands = [rb(addr + i) for i in range(1, LENGTH[op])]
+            decoded.append((op, addr, operands))
+            addr += LENGTH[op]
+            if op in ENDS_BLOCK:
+                closed = True
+                break
+            if op == 0xE0 and 0xFF00 | operands[0] in INTERRUPT_REGISTERS:
+                break
+            if op == 0xEA:
+                target = operands[0] | operands[1] << 8
+                # Below 0x8000 it switches banks, maybe the one running
+                if target in INTERRUPT_REGISTERS or target < 0x8000:
+                    break
+            if op in (WRITES if writable else ROM_WRITES):
+                # Of the CB opcodes only RLC..SET on [HL] write memory
+                if op != 0xCB or (operands[0] & 7 == 6 and operands[0] & 0xC0 != 0x40):
+                    break
+
+        if not decoded:
+            return None
+
+        lines = []
+        handlers = set()
+        cycles = 0
+        dynamic = False
+        for (op, at, operands), flags in zip(decoded, self.__liveFlags(decoded)):
+            if op in ALU_OPS or op in INC_DEC_OPS:
+                code, m = self.__emitALU(op, at, operands, flags)
+            else:
+                code, m = self.__emit(op, at, operands)
+            lines.extend(code)
+            if m is None:
+                handlers.add(op)
+                lines.append("m += cpu._m")
+                dynamic = True
+            else:
+                if op == 0xCB:
+                    handlers.add(0x100 | operands[0])
+                cycles += m
+        count = len(decoded)
+
+        body = ["m = 0"] if dynamic else []
+        body += lines
+        if not closed:
+            body.append("rr[%d] = 0x%04X" % (PC, addr & 0xFFFF))
+        total = "m + %d" % cycles if dynamic else "%d" % cycles
+        body.append("cpu._m = " + total)
+        body.append("cpu._clock += cpu._m")
+        body.extend(self.__idleCheck(pc, key, decoded))
+        body.append("return %d" % count)
+
+        source = ["def make(cpu, r, rr, rb, wb, rw, ww, ops):"]
+        for op in sorted(handlers):
+            source.append("    op_%03X = ops[0x%03X]" % (op, op))
+        source.append("    def block():")
+        source.extend("        " + line for line in body)
+        source.append("    return block")
+
+        namespace = {
+            "ADC": ADC,
+            "SBC": SBC,
+            "AND": AND,
+            "OR": OR,
+            "XOR": XOR,
+            "INC": INC,
+            "DEC": DEC,
+            "skip": self._idle.skip if self._idle is not None else None,
+        }
+        code = compile("\n".join(source), "<block %05X>" % key, "exec")
+        exec(code, namespace)
+        mem = self._mem
+        block = namespace["make"](
+            self._cpu,
+            self._r,
+            self._rr,
+            mem.rb,
+            mem.wb,
+            mem.rw,
+            mem.ww,
+            self._cpu._opmap,
+        )
+        if writable:
+            self.__own(key, pc, addr)
+        return block
+
+    def __idleCheck(self, pc, key, decoded):
+        """Return the source lines fast-forwarding a block that is an idle loop."""
+        op, addr, operands = decoded[-1]
+        if self._idle is None or op not in (0x18, 0x20, 0x28, 0x30, 0x38):
+            return []
+        n = operands[0]
+        if (addr + 2 + (n & 0x7F) - (n & 0x80)) & 0xFFFF != pc or pc >= 0x8000:
+            return []
+        cycles = self._idle.cycles(key, pc, addr)
+        if not cycles:
+            return []
+        return [
+            "# idle loop, %d M-cycles per pass" % cycles,
+            "if rr[%d] == 0x%04X:" % (PC, pc),
+            "    cpu._clock += skip(0x%X, %d, cpu._clock)" % (key, cycles),
+        ]
+
+    def __liveFlags(self, decoded):
+        """Return, per decoded instruction, whether its flags must be computed.
+
+        Walks the block backwards tracking which of Z/N/H/C may still be
+        read. Flags are all live at the end of the block; an inlined ALU
+        instruction kills them (keeping C live if it consumes the carry),
+        POP AF overwrites them, and anything else that is not known to
+        leave F alone is assumed to read all of them.
+        """
+        if not self._lazyflags:
+            return [True] * len(decoded)
+
+        live = 0xF0
+        needed = []
+        for op, addr, operands in reversed(decoded):
+            if op in ALU_OPS:
+                needed.append(live != 0)
+                # ADC and SBC add the incoming carry to the result
+                live = 0x10 if (op >> 3) & 7 in (1, 3) else 0
+            elif op in INC_DEC_OPS:
+                needed.append(live != 0)
+                # The carry they leave behind is derived from the old one
+                live &= 0x10
+            else:
+                needed.append(True)
+                if op == 0xF1:
+                    live = 0
+                elif op not in FLAGLESS and not (op == 0xCB and operands[0] >= 0x80):
+                    live = 0xF0
+        needed.reverse()
+        return needed
+
+    def __emitALU(self, op, addr, operands, flags):
+        """Return (source lines, M-cycles) for an 8-bit ALU or INC/DEC op.
+
+        Without flags only the result is computed and F is left stale; the
+        caller guarantees nothing reads it before it is overwritten.
+        """
+        if op in INC_DEC_OPS:
+            dst = (op >> 3) & 7
+            name = "DEC" if op & 1 else "INC"
+            sign = "-" if op & 1 else "+"
+            code = ["# %04X %s %s" % (addr, name, R8_NAMES[dst])]
+            if dst == 6:
+                code.append("hl = rr[%d]" % HL)
+                if flags:
+                    code.append("t = %s[rb(hl)]" % name)
+                    code.append("wb(hl, t >> 8)")
+                else:
+                    code.append("wb(hl, (rb(hl) %s 1) & 0xFF)" % sign)
+                m = 3
+            else:
+                reg = R8[dst]
+                if flags:
+                    code.append("t = %s[r[%d]]" % (name, reg))
+                    code.append("r[%d] = t >> 8" % reg)
+                else:
+                    code.append("r[%d] = (r[%d] %s 1) & 0xFF" % (reg, reg, sign))
+                m = 1
+            if flags:
+                code.append("r[%d] = (t & 0xFF) | (r[%d] & 0x10)" % (F, F))
+            return code, m
+
+        kind = (op >> 3) & 7
+        if op >= 0xC0:
+            value, operand, m = "0x%02X" % operands[0], "0x%02X" % operands[0], 2
+        elif op & 7 == 6:
+            value, operand, m = "rb(rr[%d])" % HL, "[HL]", 2
+        else:
+            value, operand, m = "r[%d]" % R8[op & 7], R8_NAMES[op & 7], 1
+        code = ["# %04X %s A,%s" % (addr, ALU_NAMES[kind], operand)]
+        carry = "(r[%d] & 0x10) << 12 | " % F if kind in (1, 3) else ""
+        if flags:
+            if kind <= 3:
+                table = "SBC" if kind & 2 else "ADC"
+                code.append(
+                    "rr[%d] = %s[%sr[%d] << 8 | %s]" % (AF, table, carry, A, value)
+                )
+            elif kind == 7:
+                code.append("r[%d] = SBC[r[%d] << 8 | %s] & 0xFF" % (F, A, value))
+            else:
+                table, sym = [("AND", "&"), ("XOR", "^"), ("OR", "|")][kind - 4]
+                code.append("rr[%d] = %s[r[%d] %s %s]" % (AF, table, A, sym, value))
+        elif kind <= 3:
+            sym = "-" if kind & 2 else "+"
+            carry = " %s (r[%d] >> 4 & 1)" % (sym, F) if kind in (1, 3) else ""
+            code.append("r[%d] = (r[%d] %s %s%s) & 0xFF" % (A, A, sym, value, carry))
+        elif kind == 7:
+            # A compare whose flags are never read does nothing
+            if op & 7 == 6 and op < 0xC0:
+                code.append(value)
+        else:
+            sym = ["&", "^", "|"][kind - 4]
+            code.append("r[%d] %s= %s" % (A, sym, value))
+        return code, m
+
+    def __emit(self, op, addr, operands):
+        """Return (source lines, M-cycles) for one instruction.
+
+        M-cycles is None when the instruction is delegated to its interpreter
+        handler, whose cycle count is read back from cpu._m.
+        """
+        nxt = addr + LENGTH[op]
+        n = operands[0] if operands else 0
+        nn = operands[1] << 8 | operands[0] if len(operands) == 2 else 0
+
+        if op == 0x00:
+            return ["# %04X NOP" % addr], 1
+
+        # LD r,r' / LD r,[HL] / LD [HL],r
+        if 0x40 <= op <= 0x7F and op != 0x76:
+            dst, src = (op >> 3) & 7, op & 7
+            comment = "# %04X LD %s,%s" % (addr, R8_NAMES[dst], R8_NAMES[src])
+            if dst == 6:
+                return [comment, "wb(rr[%d], r[%d])" % (HL, R8[src])], 2
+            if src == 6:
+                return [comment, "r[%d] = rb(rr[%d])" % (R8[dst], HL)], 2
+            if dst == src:
+                return [comment], 1
+            return [comment, "r[%d] = r[%d]" % (R8[dst], R8[src])], 1
+
+        # LD r,n / LD [HL],n
+        if op & 0xC7 == 0x06:
+            dst = (op >> 3) & 7
+            comment = "# %04X LD %s,0x%02X" % (addr, R8_NAMES[dst], n)
+            if dst == 6:
+                return [comment, "wb(rr[%d], 0x%02X)" % (HL, n)], 3
+            return [comment, "r[%d] = 0x%02X" % (R8[dst], n)], 2
+
+        # LD rr,nn
+        if op & 0xCF == 0x01:
+            reg = (op >> 4) & 3
+            comment = "# %04X LD %s,0x%04X" % (addr, R16_NAMES[reg], nn)
+            return [comment, "rr[%d] = 0x%04X" % (R16[reg], nn)], 3
+
+        # INC rr / DEC rr
+        if op & 0xC7 == 0x03:
+            reg = (op >> 4) & 3
+            sign = "-" if op & 0x08 else "+"
+            name = "DEC" if op & 0x08 else "INC"
+            return [
+                "# %04X %s %s" % (addr, name, R16_NAMES[reg]),
+                "rr[%d] = (rr[%d] %s 1) & 0xFFFF" % (R16[reg], R16[reg], sign),
+            ], 2
+
+        if op in (0x0A, 0x1A):
+            reg = BC if op == 0x0A else DE
+            comment = "# %04X LD A,[%s]" % (addr, "BC" if op == 0x0A else "DE")
+            return [comment, "r[%d] = rb(rr[%d])" % (A, reg)], 2
+        if op in (0x02, 0x12):
+            reg = BC if op == 0x02 else DE
+            comment = "# %04X LD [%s],A" % (addr, "BC" if op == 0x02 else "DE")
+            return [comment, "wb(rr[%d], r[%d])" % (reg, A)], 2
+        if op == 0xFA:
+            comment = "# %04X LD A,[0x%04X]" % (addr, nn)
+            return [comment, "r[%d] = rb(0x%04X)" % (A, nn)], 4
+        if op == 0xEA:
+            comment = "# %04X LD [0x%04X],A" % (addr, nn)
+            return [comment, "wb(0x%04X, r[%d])" % (nn, A)], 4
+        if op == 0xF0:
+            comment = "# %04X LDH A,[0xFF%02X]" % (addr, n)
+            return [comment, "r[%d] = rb(0x%04X)" % (A, 0xFF00 + n)], 3
+        if op == 0xE0:
+            comment = "# %04X LDH [0xFF%02X],A" % (addr, n)
+            return [comment, "wb(0x%04X, r[%d])" % (0xFF00 + n, A)], 3
+        if op == 0xF2:
+            comment = "# %04X LD A,[C]" % addr
+            return [comment, "r[%d] = rb(0xFF00 + r[%d])" % (A, C)], 2
+        if op == 0xE2:
+            comment = "# %04X LD [C],A" % addr
+            return [comment, "wb(0xFF00 + r[%d], r[%d])" % (C, A)], 2
+
+        # LDI / LDD
+        if op in (0x22, 0x2A, 0x32, 0x3A):
+            sign = "+" if op < 0x30 else "-"
+            name = "LDI" if op < 0x30 else "LDD"
+            if op & 0x08:
+                access = "r[%d] = rb(hl)" % A
+                comment = "# %04X %s A,[HL]" % (addr, name)
+            else:
+                access = "wb(hl, r[%d])" % A
+                comment = "# %04X %s [HL],A" % (addr, name)
+            return [
+                comment,
+                "hl = rr[%d]" % HL,
+                access,
+                "rr[%d] = (hl %s 1) & 0xFFFF" % (HL, sign),
+            ], 2
+
+        if op == 0xF9:
+            return ["# %04X LD SP,HL" % addr, "rr[%d] = rr[%d]" % (SP, HL)], 2
+
+        # PUSH rr / POP rr
+        if op & 0xCF == 0xC5:
+            reg = (op >> 4) & 3
+            return [
+                "# %04X PUSH %s" % (addr, R16_STACK_NAMES[reg]),
+                "sp = (rr[%d] - 2) & 0xFFFF" % SP,
+                "rr[%d] = sp" % SP,
+                "ww(sp, rr[%d])" % R16_STACK[reg],
+            ], 4
+        if op & 0xCF == 0xC1:
+            reg = (op >> 4) & 3
+            return [
+                "# %04X POP %s" % (addr, R16_STACK_NAMES[reg]),
+                "sp = rr[%d]" % SP,
+                "rr[%d] = rw(sp)" % R16_STACK[reg],
+                "rr[%d] = (sp + 2) & 0xFFFF" % SP,
+            ], 3
+
+        # Control flow
+        if op == 0xC3:
+            return ["# %04X JP 0x%04X" % (addr, nn), "rr[%d] = 0x%04X" % (PC, nn)], 3
+        if op == 0x18:
+            target = (nxt + (n & 0x7F) - (n & 0x80)) & 0xFFFF
+            return [
+                "# %04X JR 0x%04X" % (addr, target),
+                "rr[%d] = 0x%04X" % (PC, target),
+            ], 2
+        if op in (0x20, 0x28, 0x30, 0x38, 0xC2, 0xCA, 0xD2, 0xDA):
+            name, test = CONDITIONS[(op >> 3) & 3]
+            if op < 0x40:
+                target = (nxt + (n & 0x7F) - (n & 0x80)) & 0xFFFF
+                mnemonic, m = "JR", 2
+            else:
+                target = nn
+                mnemonic, m = "JP", 3
+            return [
+                "# %04X %s %s,0x%04X" % (addr, mnemonic, name, target),
+                "if %s:" % test,
+                "    rr[%d] = 0x%04X" % (PC, target),
+                "else:",
+                "    rr[%d] = 0x%04X" % (PC, nxt),
+            ], m
+        if op == 0xCD:
+            return [
+                "# %04X CALL 0x%04X" % (addr, nn),
+                "sp = (rr[%d] - 2) & 0xFFFF" % SP,
+                "rr[%d] = sp" % SP,
+                "ww(sp, 0x%04X)" % nxt,
+                "rr[%d] = 0x%04X" % (PC, nn),
+            ], 3
+        if op == 0xC9:
+            return [
+                "# %04X RET" % addr,
+                "sp = rr[%d]" % SP,
+                "rr[%d] = rw(sp)" % PC,
+                "rr[%d] = (sp + 2) & 0xFFFF" % SP,
+            ], 2
+
+        # CB-prefixed: the sub-opcode is known, so call its handler directly.
+        # None of them touch PC and their timing only depends on the operand.
+        if op == 0xCB:
+            return [
+                "# %04X CB %02X" % (addr, n),
+                "op_%03X()" % (0x100 | n),
+            ], (4 if n & 7 == 6 else 2)
+
+        # Everything else runs the interpreter handler. Handlers fetch their
+        # own operands through PC, so point it just past the opcode first.
+        code = ["# %04X opcode 0x%02X (handler)" % (addr, op)]
+        if LENGTH[op] > 1 or op in ENDS_BLOCK:
+            code.append("rr[%d] = 0x%04X" % (PC, addr + 1))
+        code.append("op_%03X()" % op)
+        return code, None
+
+    def __own(self, key, start, end):
+        """Record a RAM block over [start, end) and watch its pages."""
+        for addr in range(start, end):
+            owners = self._owners.get(addr)
+            if owners is None:
+                owners = self._owners[addr] = set()
+                page = addr >> 8
+                if page not in self._watched:
+                    self._watched[page] = 0
+                    self.__watch(page)
+                self._watched[page] += 1
+            owners.add(key)
+
+    def __invalidate(self, addr):
+        if addr >= 0xE000 and addr < 0xFE00:
+            addr -= 0x2000
+        owners = self._owners.get(addr)
+        if not owners:
+            return
+        for key in list(owners):
+            self.__drop(key)
+
+    def __drop(self, key):
+        del self._blocks[key]
+        pc = key & 0xFFFF
+        end, _ = self.__region(pc)
+        addr = pc
+        while addr < end:
+            owners = self._owners.get(addr)
+            if owners is None or key not in owners:
+                break
+            owners.discard(key)
+            if not owners:
+                del self._owners[addr]
+                page = addr >> 8
+                self._watched[page] -= 1
+                if not self._watched[page]:
+                    del self._watched[page]
+                    self.__unwatch(page)
+            addr += 1
+
+    def __watch(self, page):
+        self._mem.watchWrites(page, self.__invalidate)
+        # WRAM is also reachable through echo RAM
+        if 0xC0 <= page < 0xDE:
+            self._mem.watchWrites(page + 0x20, self.__invalidate)
+
+    def __unwatch(self, page):
+        self._mem.unwatchWrites(page)
+        if 0xC0 <= page < 0xDE:
+            self._mem.unwatchWrites(page + 0x20)
@@ -0,0 +1,126 @@
+from .Interrupts import JOYPAD
+
+# Button -> bit in a joypad state: buttons in the low nibble, directions in
+# the high one, each in the order of its P1 input lines
+BUTTONS = {
+    "a": 0x01,
+    "b": 0x02,
+    "select": 0x04,
+    "start": 0x08,
+    "right": 0x10,
+    "left": 0x20,
+    "up": 0x40,
+    "down": 0x80,
+}
+
+# Button -> pygame key (the name after K_) in the windowed frontend
+KEYS = {
+    "a": "z",
+    "b": "x",
+    "select": "BACKSPACE",
+    "start": "RETURN",
+    "right": "RIGHT",
+    "left": "LEFT",
+    "up": "UP",
+    "down": "DOWN",
+}
+
+
+def buttons(*names):
+    """Return the state with the named buttons held, e.g. buttons("a", "up")."""
+    state = 0
+    for name in names:
+        state |= BUTTONS[name.lower()]
+    return state
+
+
+def readScript(path):
+    """Read a scripted input file into (cycle, state) events.
+
+    Each line holds an M-cycle and the buttons held from then on, e.g.
+    ``35112 start`` or ``70224`` to let go of everything. Text after a #
+    is a comment.
+    """
+    events = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            try:
+                events.append((int(fields[0], 0), buttons(*fields[1:])))
+            except (KeyError, ValueError):
+                raise ValueError(
+                    f"{path}:{number}: bad input line {line.strip()!r}"
+                ) from None
+    return events
+
+
+class Joypad(object):
+    """The joypad register (P1, 0xFF00) and its input queue.
+
+    Input arrives as (cycle, state) events, a state being the BUTTONS bits
+    held, from whatever frontend drives the emulator: the window's keys
+    polled once a frame, a script (readScript) or inject() calls. Each is
+    scheduled and takes effect at exactly its cycle, so the CPU never checks
+    for input. A button press that pulls a selected input line low raises
+    the joypad interrupt, which is also what ends STOP.
+    """
+
+    def __init__(self, sched, request=None):
+        """Create the joypad.
+
+        Args:
+            sched: Scheduler the input events are queued on.
+            request: Callable raising interrupts, e.g. Interrupts.request.
+        """
+        self._sched = sched
+        self._request = request
+        self.reset()
+
+    def reset(self):
+        # P14/P15 select bits as written; 0 selects
+        self._select = 0x30
+        self._state = 0
+
+    @property
+    def state(self):
+        """The buttons currently held, as BUTTONS bits."""
+        return self._state
+
+    def inject(self, cycle, state):
+        """Hold exactly the buttons in state from the given M-cycle on.
+
+        A cycle already past takes effect at the next scheduler run.
+        """
+        self._sched.schedule(cycle, lambda cycle: self.__apply(state))
+
+    def ioHandlers(self):
+        """Return {address: (read, write)} for the joypad register.
+
+        Registers:
+            0xFF00 - P1: bits 4 and 5 select directions and buttons (0
+                selects), bits 0-3 read the selected lines, 0 if held
+        """
+        return {0xFF00: (self.__rbP1, self.__wbP1)}
+
+    def __lines(self):
+        lines = 0x0F
+        if not self._select & 0x10:
+            lines &= ~self._state >> 4
+        if not self._select & 0x20:
+            lines &= ~self._state
+        return lines & 0x0F
+
+    def __apply(self, state):
+        before = self.__lines()
+        self._state = state
+        # Interrupt on a high to low transition of any line
+        if before & ~self.__lines() and self._request is not None:
+            self._request(JOYPAD)
+
+    def __rbP1(self, addr):
+        return 0xC0 | self._select | self.__lines()
+
+    def __wbP1(self, addr, val):
+        self._select = val & 0x30
@@ -0,0 +1,159 @@
+"""Cartridge memory bank controllers.
+
+A controller only decodes writes to 0x0000-0x7FFF and tells the MMU which
+banks to map; the MMU switches a bank by pointing its page table at
+pre-sliced views of the cartridge image, so nothing is ever copied.
+"""
+
+# External RAM size by header byte 0x149
+RAM_SIZES = {0x00: 0, 0x01: 0x800, 0x02: 0x2000, 0x03: 0x8000, 0x04: 0x20000}
+RAM_SIZES[0x05] = 0x10000
+
+
+class MBC(object):
+    """No controller: 32 KiB of ROM and at most 8 KiB of unbanked RAM."""
+
+    def __init__(self, mmu):
+        self._mmu = mmu
+
+    @staticmethod
+    def ramSize(rom):
+        """Bytes of external RAM the cartridge header asks for."""
+        return RAM_SIZES.get(rom[0x149], 0) if len(rom) > 0x149 else 0
+
+    def reset(self):
+        """Map the power-on banks."""
+        self._mmu.mapROMBank(1)
+
+    def wb(self, addr, data):
+        """Handle a write to 0x0000-0x7FFF."""
+        return
+
+
+class MBC1(MBC):
+    """MBC1: up to 2 MiB of ROM and 32 KiB of RAM.
+
+    0x2000-0x3FFF selects the low 5 bits of the ROM bank (0 reads as 1)
+    and 0x4000-0x5FFF two more bits. In mode 1 (0x6000-0x7FFF) those two
+    bits also select the RAM bank and the bank seen at 0x0000-0x3FFF.
+    """
+
+    def reset(self):
+        self._ramon = False
+        self._low = 1
+        self._high = 0
+        self._mode = 0
+        self.__map()
+
+    def wb(self, addr, data):
+        if addr < 0x2000:
+            self._ramon = data & 0x0F == 0x0A
+        elif addr < 0x4000:
+            self._low = data & 0x1F or 1
+        elif addr < 0x6000:
+            self._high = data & 0x03
+        else:
+            self._mode = data & 0x01
+        self.__map()
+
+    def __map(self):
+        mmu = self._mmu
+        mmu.mapROMBank(self._high << 5 | self._low)
+        mmu.mapROM0Bank(self._high << 5 if self._mode else 0)
+        if self._ramon:
+            mmu.mapRAMBank(self._high if self._mode else 0)
+        else:
+            mmu.mapRAMBank(None)
+
+
+class MBC3(MBC):
+    """MBC3: up to 2 MiB of ROM, 32 KiB of RAM and a real-time clock.
+
+    The clock is a stub: its registers (selected with 0x08-0x0C at
+    0x4000-0x5FFF) keep whatever is written to them and never tick.
+    """
+
+    def reset(self):
+        self._ramon = False
+        self._rombank = 1
+        self._select = 0
+        self._rtc = bytearray(5)
+        self.__map()
+
+    def wb(self, addr, data):
+        if addr < 0x2000:
+            self._ramon = data & 0x0F == 0x0A
+        elif addr < 0x4000:
+            self._rombank = data & 0x7F or 1
+        elif addr < 0x6000:
+            self._select = data
+        else:
+            # Latching the clock does nothing while it doesn't run
+            return
+        self.__map()
+
+    def __map(self):
+        mmu = self._mmu
+        mmu.mapROMBank(self._rombank)
+        if not self._ramon:
+            mmu.mapRAMBank(None)
+        elif 0x08 <= self._select <= 0x0C:
+            mmu.mapRAMHandlers(self.__rbRTC, self.__wbRTC)
+        else:
+            mmu.mapRAMBank(self._select & 0x03)
+
+    def __rbRTC(self, addr):
+        return self._rtc[self._select - 0x08]
+
+    def __wbRTC(self, addr, data):
+        self._rtc[self._select - 0x08] = data
+
+
+class MBC5(MBC):
+    """MBC5: up to 8 MiB of ROM (9-bit bank, bank 0 allowed) and 128 KiB
+    of RAM."""
+
+    def reset(self):
+        self._ramon = False
+        self._rombank = 1
+        self._rambank = 0
+        self.__map()
+
+    def wb(self, addr, data):
+        if addr < 0x2000:
+            self._ramon = data & 0x0F == 0x0A
+        elif addr < 0x3000:
+            self._rombank = (self._rombank & 0x100) | data
+        elif addr < 0x4000:
+            self._rombank = (data & 0x01) << 8 | (self._rombank & 0xFF)
+        elif addr < 0x6000:
+            self._rambank = data & 0x0F
+        else:
+            return
+        self.__map()
+
+    def __map(self):
+        self._mmu.mapROMBank(self._rombank)
+        self._mmu.mapRAMBank(self._rambank if self._ramon else None)
+
+
+# Cartridge types with a battery keeping their RAM
+BATTERY = {0x03, 0x06, 0x09, 0x0D, 0x0F, 0x10, 0x13, 0x1B, 0x1E, 0xFF}
+
+# Cartridge type (header byte 0x147) -> controller. Types missing here
+# (MBC2, MMM01, ...) are run without banking.
+CONTROLLERS = {0x01: MBC1, 0x02: MBC1, 0x03: MBC1}
+CONTROLLERS.update(dict.fromkeys(range(0x0F, 0x14), MBC3))
+CONTROLLERS.update(dict.fromkeys(range(0x19, 0x1F), MBC5))
+
+
+def hasBattery(rom):
+    """Whether the cartridge's RAM should be saved."""
+    return len(rom) > 0x147 and rom[0x147] in BATTERY
+
+
+def controllerFor(rom):
+    """Return the controller class for a cartridge image."""
+    if len(rom) <= 0x147:
+        return MBC
+    return CONTROLLERS.get(rom[0x147], MBC)
@@ -1,451 +1,804 @@
+import sys
+
+from . import MBC
+from .Interrupts import Interrupts
+
+# Bytes per switchable ROM and external RAM bank
+ROM_BANK = 0x4000
+RAM_BANK = 0x2000
+
+# M-cycles OAM stays locked by a DMA transfer (one byte per cycle)
+DMA_CYCLES = 160
+
+
 class MMU(object):
+    @property
+    def interrupts(self):
+        """The IE/IF registers (see Interrupts.py)."""
+        return self._interrupts
+
     @property
     def biosf(self):
         return self._biosf
 
     @biosf.setter
     def biosf(self, value):
-        self._biosf = value
+        if value != self._biosf:
+            self._biosf = value
+            self.__mapROM0()
 
     def __init__(self):
         # Flag, True iif BIOS is mapped in
-        # Bios is unmapped with the first instruction above 0x00FF
+        # The BIOS unmaps itself by writing to 0xFF50 when it finishes
         self._biosf = True
 
         # Memory regions
         # 0x0000 - 0x00FF
-        self._bios = [
-            0x31,
-            0xFE,
-            0xFF,
-            0xAF,
-            0x21,
-            0xFF,
-            0x9F,
-            0x32,
-            0xCB,
-            0x7C,
-            0x20,
-            0xFB,
-            0x21,
-            0x26,
-            0xFF,
-            0x0E,
-            0x11,
-            0x3E,
-            0x80,
-            0x32,
-            0xE2,
-            0x0C,
-            0x3E,
-            0xF3,
-            0xE2,
-            0x32,
-            0x3E,
-            0x77,
-            0x77,
-            0x3E,
-            0xFC,
-            0xE0,
-            0x47,
-            0x11,
-            0x04,
-            0x01,
-            0x21,
-            0x10,
-            0x80,
-            0x1A,
-            0xCD,
-            0x95,
-            0x00,
-            0xCD,
-            0x96,
-            0x00,
-            0x13,
-            0x7B,
-            0xFE,
-            0x34,
-            0x20,
-            0xF3,
-            0x11,
-            0xD8,
-            0x00,
-            0x06,
-            0x08,
-            0x1A,
-            0x13,
-            0x22,
-            0x23,
-            0x05,
-            0x20,
-            0xF9,
-            0x3E,
-            0x19,
-            0xEA,
-            0x10,
-            0x99,
-            0x21,
-            0x2F,
-            0x99,
-            0x0E,
-            0x0C,
-            0x3D,
-            0x28,
-            0x08,
-            0x32,
-            0x0D,
-            0x20,
-            0xF9,
-            0x2E,
-            0x0F,
-            0x18,
-            0xF3,
-            0x67,
-            0x3E,
-            0x64,
-            0x57,
-            0xE0,
-            0x42,
-            0x3E,
-            0x91,
-            0xE0,
-            0x40,
-            0x04,
-            0x1E,
-            0x02,
-            0x0E,
-            0x0C,
-            0xF0,
-            0x44,
-            0xFE,
-            0x90,
-            0x20,
-            0xFA,
-            0x0D,
-            0x20,
-            0xF7,
-            0x1D,
-            0x20,
-            0xF2,
-            0x0E,
-            0x13,
-            0x24,
-            0x7C,
-            0x1E,
-            0x83,
-            0xFE,
-            0x62,
-            0x28,
-            0x06,
-            0x1E,
-            0xC1,
-            0xFE,
-            0x64,
-            0x20,
-            0x06,
-            0x7B,
-            0xE2,
-            0x0C,
-            0x3E,
-            0x87,
-            0xF2,
-            0xF0,
-            0x42,
-            0x90,
-            0xE0,
-            0x42,
-            0x15,
-            0x20,
-            0xD2,
-            0x05,
-            0x20,
-            0x4F,
-            0x16,
-            0x20,
-            0x18,
-            0xCB,
-            0x4F,
-            0x06,
-            0x04,
-            0xC5,
-            0xCB,
-            0x11,
-            0x17,
-            0xC1,
-            0xCB,
-            0x11,
-            0x17,
-            0x05,
-            0x20,
-            0xF5,
-            0x22,
-            0x23,
-            0x22,
-            0x23,
-            0xC9,
-            0xCE,
-            0xED,
-            0x66,
-            0x66,
-            0xCC,
-            0x0D,
-            0x00,
-            0x0B,
-            0x03,
-            0x73,
-            0x00,
-            0x83,
-            0x00,
-            0x0C,
-            0x00,
-            0x0D,
-            0x00,
-            0x08,
-            0x11,
-            0x1F,
-            0x88,
-            0x89,
-            0x00,
-            0x0E,
-            0xDC,
-            0xCC,
-            0x6E,
-            0xE6,
-            0xDD,
-            0xDD,
-            0xD9,
-            0x99,
-            0xBB,
-            0xBB,
-            0x67,
-            0x63,
-            0x6E,
-            0x0E,
-            0xEC,
-            0xCC,
-            0xDD,
-            0xDC,
-            0x99,
-            0x9F,
-            0xBB,
-            0xB9,
-            0x33,
-            0x3E,
-            0x3C,
-            0x42,
-            0xB9,
-            0xA5,
-            0xB9,
-            0xA5,
-            0x42,
-            0x3C,
-            0x21,
-            0x04,
-            0x01,
-            0x11,
-            0xA8,
-            0x00,
-            0x1A,
-            0x13,
-            0xBE,
-            0x20,
-            0xFE,
-            0x23,
-            0x7D,
-            0xFE,
-            0x34,
-            0x20,
-            0xF5,
-            0x06,
-            0x19,
-            0x78,
-            0x86,
-            0x23,
-            0x05,
-            0x20,
-            0xFB,
-            0x86,
-            0x20,
-            0xFE,
-            0x3E,
-            0x01,
-            0xE0,
-            0x50,
-        ]
+        self._bios = bytes(
+            [
+                0x31,
+                0xFE,
+                0xFF,
+                0xAF,
+                0x21,
+                0xFF,
+                0x9F,
+                0x32,
+                0xCB,
+                0x7C,
+                0x20,
+                0xFB,
+                0x21,
+                0x26,
+                0xFF,
+                0x0E,
+                0x11,
+                0x3E,
+                0x80,
+                0x32,
+                0xE2,
+                0x0C,
+                0x3E,
+                0xF3,
+                0xE2,
+                0x32,
+                0x3E,
+                0x77,
+                0x77,
+                0x3E,
+                0xFC,
+                0xE0,
+                0x47,
+                0x11,
+                0x04,
+                0x01,
+                0x21,
+                0x10,
+                0x80,
+                0x1A,
+                0xCD,
+                0x95,
+                0x00,
+                0xCD,
+                0x96,
+                0x00,
+                0x13,
+                0x7B,
+                0xFE,
+                0x34,
+                0x20,
+                0xF3,
+                0x11,
+                0xD8,
+                0x00,
+                0x06,
+                0x08,
+                0x1A,
+                0x13,
+                0x22,
+                0x23,
+                0x05,
+                0x20,
+                0xF9,
+                0x3E,
+                0x19,
+                0xEA,
+                0x10,
+                0x99,
+                0x21,
+                0x2F,
+                0x99,
+                0x0E,
+                0x0C,
+                0x3D,
+                0x28,
+                0x08,
+                0x32,
+                0x0D,
+                0x20,
+                0xF9,
+                0x2E,
+                0x0F,
+                0x18,
+                0xF3,
+                0x67,
+                0x3E,
+                0x64,
+                0x57,
+                0xE0,
+                0x42,
+                0x3E,
+                0x91,
+                0xE0,
+                0x40,
+                0x04,
+                0x1E,
+                0x02,
+                0x0E,
+                0x0C,
+                0xF0,
+                0x44,
+                0xFE,
+                0x90,
+                0x20,
+                0xFA,
+                0x0D,
+                0x20,
+                0xF7,
+                0x1D,
+                0x20,
+                0xF2,
+                0x0E,
+                0x13,
+                0x24,
+                0x7C,
+                0x1E,
+                0x83,
+                0xFE,
+                0x62,
+                0x28,
+                0x06,
+                0x1E,
+                0xC1,
+                0xFE,
+                0x64,
+                0x20,
+                0x06,
+                0x7B,
+                0xE2,
+                0x0C,
+                0x3E,
+                0x87,
+                0xF2,
+                0xF0,
+                0x42,
+                0x90,
+                0xE0,
+                0x42,
+                0x15,
+                0x20,
+                0xD2,
+                0x05,
+                0x20,
+                0x4F,
+                0x16,
+                0x20,
+                0x18,
+                0xCB,
+                0x4F,
+                0x06,
+                0x04,
+                0xC5,
+                0xCB,
+                0x11,
+                0x17,
+                0xC1,
+                0xCB,
+                0x11,
+                0x17,
+                0x05,
+                0x20,
+                0xF5,
+                0x22,
+                0x23,
+                0x22,
+                0x23,
+                0xC9,
+                0xCE,
+                0xED,
+                0x66,
+                0x66,
+                0xCC,
+                0x0D,
+                0x00,
+                0x0B,
+                0x03,
+                0x73,
+                0x00,
+                0x83,
+                0x00,
+                0x0C,
+                0x00,
+                0x0D,
+                0x00,
+                0x08,
+                0x11,
+                0x1F,
+                0x88,
+                0x89,
+                0x00,
+                0x0E,
+                0xDC,
+                0xCC,
+                0x6E,
+                0xE6,
+                0xDD,
+                0xDD,
+                0xD9,
+                0x99,
+                0xBB,
+                0xBB,
+                0x67,
+                0x63,
+                0x6E,
+                0x0E,
+                0xEC,
+                0xCC,
+                0xDD,
+                0xDC,
+                0x99,
+                0x9F,
+                0xBB,
+                0xB9,
+                0x33,
+                0x3E,
+                0x3C,
+                0x42,
+                0xB9,
+                0xA5,
+                0xB9,
+                0xA5,
+                0x42,
+                0x3C,
+                0x21,
+                0x04,
+                0x01,
+                0x11,
+                0xA8,
+                0x00,
+                0x1A,
+                0x13,
+                0xBE,
+                0x20,
+                0xFE,
+                0x23,
+                0x7D,
+                0xFE,
+                0x34,
+                0x20,
+                0xF5,
+                0x06,
+                0x19,
+                0x78,
+                0x86,
+                0x23,
+                0x05,
+                0x20,
+                0xFB,
+                0x86,
+                0x20,
+                0xFE,
+                0x3E,
+                0x01,
+                0xE0,
+                0x50,
+            ]
+        )
+
+        # The whole address space is one contiguous buffer. Each region below
+        # is a zero-copy memoryview slice of it; the GPU shares the VRAM and
+        # OAM slices.
+        self._memory = bytearray(0x10000)
+        mem = memoryview(self._memory)
+
         # 0x0000 - 0x3FFF 16k
         # ROM Bank 0
-        self._romb0 = [0] * 0x4000
-
         # 0x3FFF - 0x7FFF 16k
         # ROM Bank 1-N
-        self._rombn = [0] * 0x4000
+        # Both are mapped straight from the cartridge image (see loadROM),
+        # by default a blank 32k one
+        self._rom = memoryview(bytearray(2 * ROM_BANK))
 
         # 0x8000 - 0x9FFF 8k
         # Video RAM (gpu)
+        self._vram = mem[0x8000:0xA000]
 
         # 0xA000 - 0xBFFF 8k
-        # External RAM
-        self._eram = [0] * 0x2000
+        # External RAM. Cartridges with a bank controller bring their own
+        # (_ram), switched in 8k banks.
+        self._eram = mem[0xA000:0xC000]
+        self._ram = None
 
         # 0xC000 - 0xCFFF 4k
         # Work RAM Bank 0
-        self._wramb0 = [0] * 0x1000
+        self._wramb0 = mem[0xC000:0xD000]
 
         # 0xD000 - 0xDFFF 4k
         # Work RAM Bank 1-N
-        self._wrambn = [0] * 0x1000
+        self._wrambn = mem[0xD000:0xE000]
 
         # 0xE000 - 0xFDFF
         # Mirror 0xC000 - 0xDDFF
 
         # 0xFE00 - 0xFE9F
         # OAM
-        self._oam = [0] * 0xA0
+        self._oam = mem[0xFE00:0xFEA0]
 
         # 0xFEA0 - 0xFEFF
         # Not usable
 
         # 0xFF00 - 0xFF7F
-        # I/O Registers
-        self._io = [0] * 0x80
+        # I/O Registers. Components register (read, write) handlers for
+        # theirs with mapIO(); the rest are plain bytes stored here.
+        self._io = mem[0xFF00:0xFF80]
+        self._ioread = [None] * 0x80
+        self._iowrite = [None] * 0x80
 
         # 0xFF80 - 0xFFFE
         # HRAM
-        self._hram = [0] * 0x7F
-
-        # 0xFFFF
-        self._ienable = 0x00
+        self._hram = mem[0xFF80:0xFFFF]
+
+        # 0xFF0F (IF) and 0xFFFF (IE)
+        self._interrupts = Interrupts()
+
+        self._gpu = None
+        self._sched = None
+        # Cycle the running OAM DMA transfer ends on
+        self._dmaend = 0
+
+        # ROM banks currently mapped at 0x4000 - 0x7FFF and 0x0000 - 0x3FFF
+        self._rombank = 1
+        self._rom0bank = 0
+        # Bank -> its 256-byte page views, sliced on first use
+        self._rombanks = [None] * 2
+        self._rambanks = []
+        # External RAM bank mapped at 0xA000 - 0xBFFF, None if disabled
+        self._rambank = None
+        # Battery-backed RAM (SaveRAM) and its pages, numbered from the
+        # start of the RAM, written since the last flushRAM()
+        self._battery = None
+        self._ramdirty = set()
+
+        # Page -> (view, handler) saved while the page's writes are watched
+        self._watchers = {}
+
+        # Page tables, one entry per high address byte. Plain pages hold a
+        # 256-byte memoryview so an access is page[addr & 0xFF]; pages with
+        # side effects hold None and are served by the page's handler.
+        self._rpage = [None] * 0x100
+        self._wpage = [None] * 0x100
+        self._rhandler = [None] * 0x100
+        self._whandler = [None] * 0x100
+
+        self.__mapROM0()
+        self.__mapHandlers(0x00, 0x80, write=self.__wbROM)
+        self.__mapPages(0x80, 0xA0, self._vram, 0x8000)
+        self.__mapPages(0xA0, 0xC0, self._eram, 0xA000)
+        self._mbc = MBC.MBC(self)
+        self._mbc.reset()
+        self.__mapPages(0xC0, 0xD0, self._wramb0, 0xC000)
+        self.__mapPages(0xD0, 0xE0, self._wrambn, 0xD000)
+        # Echo RAM 0xE000 - 0xFDFF aliases the WRAM pages
+        self._rpage[0xE0:0xFE] = self._rpage[0xC0:0xDE]
+        self._wpage[0xE0:0xFE] = self._wpage[0xC0:0xDE]
+        self.__mapHandlers(0xFE, 0xFF, read=self.__rbOAM, write=self.__wbOAM)
+        self.__mapHandlers(0xFF, 0x100, read=self.__rbIO, write=self.__wbIO)
+        self.mapIO(
+            {
+                0xFF0F: (self.__rbIF, self.__wbIF),
+                0xFF46: (None, self.__wbDMA),
+                0xFF50: (None, self.__wbBoot),
+            }
+        )
+
+    def __mapPages(self, first, last, buf, base, read=True, write=True):
+        """Point pages [first, last) at 256-byte slices of buf, which starts
+        at address base."""
+        for page in range(first, last):
+            offset = (page << 8) - base
+            view = buf[offset : offset + 0x100]
+            if read:
+                self._rpage[page] = view
+            if write:
+                self._wpage[page] = view
+
+    def __mapHandlers(self, first, last, read=None, write=None):
+        """Route pages [first, last) through handler callbacks."""
+        for page in range(first, last):
+            if read is not None:
+                self._rpage[page] = None
+                self._rhandler[page] = read
+            if write is not None:
+                self._wpage[page] = None
+                self._whandler[page] = write
+
+    def __mapROM0(self):
+        self._rpage[0x00:0x40] = self.__romPages(self._rom0bank)
+        if self._biosf:
+            self._rpage[0x00] = memoryview(self._bios)
+
+    def __romPages(self, bank):
+        pages = self._rombanks[bank]
+        if pages is None:
+            base = bank * ROM_BANK
+            rom = self._rom
+            pages = [
+                rom[base + i : base + i + 0x100] for i in range(0, ROM_BANK, 0x100)
+            ]
+            self._rombanks[bank] = pages
+        return pages
+
+    def mapROMBank(self, bank):
+        """Map ROM bank `bank` (wrapped to the ROM size) at 0x4000 - 0x7FFF."""
+        bank %= len(self._rombanks)
+        self._rpage[0x40:0x80] = self.__romPages(bank)
+        self._rombank = bank
+
+    def mapROM0Bank(self, bank):
+        """Map ROM bank `bank` at 0x0000 - 0x3FFF (MBC1 mode 1 only)."""
+        bank %= len(self._rombanks)
+        if bank != self._rom0bank:
+            self._rom0bank = bank
+            self.__mapROM0()
+
+    def mapRAMBank(self, bank):
+        """Map external RAM bank `bank` at 0xA000 - 0xBFFF.
+
+        None, or a cartridge without RAM, disables the area: reads return
+        0xFF and writes are dropped.
+        """
+        if bank is None or not self._rambanks:
+            self.mapRAMHandlers(self.__rbOpenBus, self.__wbNothing)
+            return
+        bank %= len(self._rambanks)
+        self._rambank = bank
+        pages = self._rambanks[bank]
+        self._rpage[0xA0:0xC0] = pages
+        if self._battery is None:
+            self._wpage[0xA0:0xC0] = pages
+            return
+        # Clean pages of a save go through __wbSave until first written
+        first = bank * 0x20
+        for i, page in enumerate(pages):
+            if first + i in self._ramdirty:
+                self._wpage[0xA0 + i] = page
+            else:
+                self._wpage[0xA0 + i] = None
+                self._whandler[0xA0 + i] = self.__wbSave
+
+    def mapRAMHandlers(self, read, write):
+        """Route 0xA000 - 0xBFFF through handlers, e.g. for MBC registers."""
+        self._rambank = None
+        self.__mapHandlers(0xA0, 0xC0, read=read, write=write)
+
+    def watchWrites(self, page, callback):
+        """Call callback(addr) after every write to the given page."""
+        view = self._wpage[page]
+        handler = self._whandler[page]
+        self._watchers[page] = (view, handler)
+        if view is not None:
+
+            def hook(addr, data):
+                view[addr & 0xFF] = data
+                callback(addr)
+
+        else:
+
+            def hook(addr, data):
+                handler(addr, data)
+                callback(addr)
+
+        self.__mapHandlers(page, page + 1, write=hook)
+
+    def unwatchWrites(self, page):
+        """Restore the page's write mapping from before watchWrites."""
+        view, handler = self._watchers.pop(page)
+        self._wpage[page] = view
+        self._whandler[page] = handler
+
+    def mapIO(self, handlers):
+        """Serve I/O registers from handlers, {address: (read, write)}."""
+        for addr, (read, write) in handlers.items():
+            self._ioread[addr & 0x7F] = read
+            self._iowrite[addr & 0x7F] = write
 
     def setGPU(self, gpu):
         self._gpu = gpu
+        self.mapIO(gpu.ioHandlers())
+        gpu.setVRAM(self._vram)
+        gpu.setOAM(self._oam)
+        gpu.setInterruptRequest(self._interrupts.request)
+        # Writes to tile data (0x8000 - 0x97FF) go through a handler so the
+        # GPU can refresh its decoded tileset; the tile maps stay plain
+        self.__mapHandlers(0x80, 0x98, write=self.__wbVRAM)
+
+    def setScheduler(self, sched):
+        """Share the emulator's clock, used to time OAM DMA transfers."""
+        self._sched = sched
+
+    def setTimer(self, timer):
+        """Serve 0xFF04-0xFF07 from timer instead of plain I/O storage."""
+        self.mapIO(timer.ioHandlers())
+
+    def setJoypad(self, joypad):
+        """Serve 0xFF00 from joypad instead of plain I/O storage."""
+        self.mapIO(joypad.ioHandlers())
+
+    def setSerial(self, serial):
+        """Serve 0xFF01-0xFF02 from serial instead of plain I/O storage."""
+        self.mapIO(serial.ioHandlers())
 
     def setROM0(self, rom):
-        self._romb0 = rom
+        """Patch the start of ROM bank 0.
+
+        An image loaded from bytes or a file is read-only; it is copied the
+        first time either setter patches it.
+        """
+        self.__writableROM()
+        self._rom[: len(rom)] = bytes(rom)
 
     def setROMB(self, rom):
-        self._rombn = rom
+        """Patch the start of the ROM bank mapped at 0x4000 - 0x7FFF."""
+        self.__writableROM()
+        base = self._rombank * ROM_BANK
+        self._rom[base : base + len(rom)] = bytes(rom)
+
+    def __writableROM(self):
+        if not self._rom.readonly:
+            return
+        self._rom = memoryview(bytearray(self._rom))
+        # Remap the current banks from the copy
+        self._rombanks = [None] * len(self._rombanks)
+        self.__mapROM0()
+        self.mapROMBank(self._rombank)
 
     def setVRAM(self, vram):
-        self._vram = vram
+        self._vram[: len(vram)] = bytes(vram)
+        if self._gpu is not None:
+            for addr in range(0, min(len(vram), 0x1800), 16):
+                self._gpu.updateTile(addr)
 
     def setOAM(self, oam):
-        self._oam = oam
+        self._oam[: len(oam)] = bytes(oam)
 
     def setWRAMB(self, wram):
-        self._wrambn = wram
+        self._wrambn[: len(wram)] = bytes(wram)
 
     def loadROM(self, rom):
-        self.setROM0(rom[:0x4000])
-        self.setROMB(rom[0x4000:0x8000])
+        """Insert a cartridge image.
+
+        The image is mapped in place, 256-byte page views into it switched
+        by its memory bank controller (see MBC.py); bank switches never
+        copy. Images under 32k are padded, and lists are converted.
+
+        Args:
+            rom: The whole image as bytes, bytearray, memoryview or a list
+                of ints.
+        """
+        if isinstance(rom, list):
+            rom = bytes(rom)
+        if len(rom) < 2 * ROM_BANK:
+            rom = bytes(rom) + bytes(2 * ROM_BANK - len(rom))
+        self._rom = memoryview(rom).cast("B")
+        self._rombanks = [None] * (len(self._rom) // ROM_BANK)
+        self._rom0bank = 0
+        self.__mapROM0()
+
+        controller = MBC.controllerFor(self._rom)
+        size = controller.ramSize(self._rom)
+        if controller is MBC.MBC:
+            # Plain cartridge RAM, always there
+            self._ram = None
+            self._rambanks = []
+            self.__mapPages(0xA0, 0xC0, self._eram, 0xA000)
+        else:
+            self.setRAM(bytearray(max(size, RAM_BANK)) if size else None)
+        self._mbc = controller(self)
+        self._mbc.reset()
+
+    def setRAM(self, ram):
+        """Use ram (a writable buffer, or None) as banked external RAM."""
+        self._ram = ram
+        self._rambanks = []
+        self._battery = None
+        self._ramdirty = set()
+        if ram is not None:
+            view = memoryview(ram)
+            for base in range(0, len(view) - RAM_BANK + 1, RAM_BANK):
+                self._rambanks.append(
+                    [
+                        view[base + i : base + i + 0x100]
+                        for i in range(0, RAM_BANK, 0x100)
+                    ]
+                )
+
+    def setBattery(self, save):
+        """Use a SaveRAM's mapped file as the cartridge's external RAM.
+
+        Writes then track dirty pages for flushRAM(): a page's first write
+        after a flush goes through a handler that records it and maps the
+        page directly again, so later writes cost nothing extra.
+        """
+        self.setRAM(save.buffer)
+        self._battery = save
+        if self._rambank is not None:
+            self.mapRAMBank(self._rambank)
+
+    @property
+    def ramSize(self):
+        """Bytes of banked external RAM, 0 for cartridges without any."""
+        return len(self._ram) if self._ram is not None else 0
+
+    def flushRAM(self):
+        """Pass the save RAM pages written since the last call to the
+        battery to be synced to disk, and start watching them again."""
+        if self._battery is None or not self._ramdirty:
+            return
+        dirty = self._ramdirty
+        self._ramdirty = set()
+        if self._rambank is not None:
+            self.mapRAMBank(self._rambank)
+        self._battery.flush(dirty)
+
+    def footprint(self):
+        """Return the bytes held by this MMU's backing buffers."""
+        size = sys.getsizeof(self._memory) + sys.getsizeof(self._bios)
+        if self._ram is not None:
+            size += sys.getsizeof(self._ram)
+        return size
 
     # Read 8bits
     def rb(self, addr):
-        # BIOS / ROM0
-        if addr & 0xF000 <= 0x3FFF:
-            if self._biosf and addr <= 0x0FF:
-                return self._bios[addr]
-            return self._romb0[addr]
-        # ROMN
-        if addr <= 0x7FFF:
-            return self._rombn[addr ^ 0x4000]
-
-        # VRAM
-        if addr <= 0x9FFF:
-            return self._gpu.VRAM[addr ^ 0x8000]
-
-        # ERAM
-        if addr <= 0xBFFF:
-            return self._eram[addr ^ 0xA000]
-
-        # WRAM
-        if addr <= 0xCFFF:
-            return self._wramb0[addr ^ 0xC000]
-
-        # WRAMN
-        if addr <= 0xDFFF:
-            return self._wrambn[addr ^ 0xD000]
-
-        # MIRROR
-        if addr <= 0xFDFF:
-            return self.rb(addr ^ 0x2000)
-
-        # OAM
-        if addr <= 0xFE9F:
-            return self._oam[addr ^ 0xFE00]
-
-        # IO
-        if addr <= 0xFF7F:
-            if 0xFF40 <= addr <= 0xFF7F:
-                return self._gpu.rb(addr)
-            return self._io[addr ^ 0xFF00]
-
-        # HRAM
-        if addr <= 0xFFFE:
-            return self._hram[addr ^ 0xFF80]
-
-        # ienable
-        if addr == 0xFFFF:
-            return self._ienable
+        page = self._rpage[addr >> 8]
+        if page is None:
+            return self._rhandler[addr >> 8](addr)
+        return page[addr & 0xFF]
 
     # Read 16bits
     def rw(self, addr):
+        # Both bytes in one page (all but 1 in 256 addresses): one lookup
+        lo = addr & 0xFF
+        if lo != 0xFF:
+            page = self._rpage[addr >> 8]
+            if page is not None:
+                return page[lo] | page[lo + 1] << 8
+            # The stack starts in HRAM, sharing its page with I/O
+            if 0xFF80 <= addr < 0xFFFE:
+                hram = self._hram
+                return hram[lo ^ 0x80] | hram[(lo ^ 0x80) + 1] << 8
         l = self.rb(addr)
         h = self.rb((addr + 1) & 0xFFFF)
         return (h << 8) | l
 
     # Write 8bits
     def wb(self, addr, data):
-        # VRAM
-        if 0x8000 <= addr <= 0x9FFF:
-            self._gpu.VRAM[addr ^ 0x8000] = data
-            if addr <= 0x97FF:
-                self._gpu.updateTile(addr ^ 0x8000)
-
+        page = self._wpage[addr >> 8]
+        if page is None:
+            self._whandler[addr >> 8](addr, data)
             return
+        page[addr & 0xFF] = data
 
-        # ERAM
-        if 0xA000 <= addr <= 0xBFFF:
-            self._eram[addr ^ 0xA000] = data
-            return
+    # write 16bits
+    def ww(self, addr, data):
+        lo = addr & 0xFF
+        if lo != 0xFF:
+            page = self._wpage[addr >> 8]
+            if page is not None:
+                page[lo] = data & 0xFF
+                page[lo + 1] = data >> 8
+                return
+            # Unless the JIT is watching HRAM for code being overwritten
+            if 0xFF80 <= addr < 0xFFFE and 0xFF not in self._watchers:
+                hram = self._hram
+                hram[lo ^ 0x80] = data & 0xFF
+                hram[(lo ^ 0x80) + 1] = data >> 8
+                return
+        self.wb(addr, data & 0xFF)
+        self.wb((addr + 1) & 0xFFFF, data >> 8)
 
-        # WRAM
-        if 0xC000 <= addr <= 0xCFFF:
-            self._wramb0[addr ^ 0xC000] = data
-            return
+    # Page handlers
+    def __wbROM(self, addr, data):
+        # ROM is read only; writes talk to the bank controller
+        self._mbc.wb(addr, data)
 
-        # WRAMN
-        if 0xD000 <= addr <= 0xDFFF:
-            self._wrambn[addr ^ 0xD000] = data
-            return
+    def __wbSave(self, addr, data):
+        slot = addr >> 8
+        page = self._rambanks[self._rambank][slot - 0xA0]
+        page[addr & 0xFF] = data
+        self._ramdirty.add(self._rambank * 0x20 + slot - 0xA0)
+        self._wpage[slot] = page
 
-        # MIRROR
-        if 0xE000 <= addr <= 0xFDFF:
-            self.wb(addr ^ 0x2000, data)
-            return
+    def __rbOpenBus(self, addr):
+        return 0xFF
 
-        # OAM
-        if 0xFE00 <= addr <= 0xFE9F:
+    def __wbNothing(self, addr, data):
+        return
+
+    def __wbVRAM(self, addr, data):
+        self._vram[addr ^ 0x8000] = data
+        self._gpu.updateTile(addr ^ 0x8000)
+
+    def __rbOAM(self, addr):
+        if addr <= 0xFE9F:
+            if self.__dmaRunning():
+                return 0xFF
+            return self._oam[addr ^ 0xFE00]
+        # 0xFEA0 - 0xFEFF is not usable
+        return 0x00
+
+    def __wbOAM(self, addr, data):
+        if addr <= 0xFE9F and not self.__dmaRunning():
             self._oam[addr ^ 0xFE00] = data
-            return
 
-        # IO
-        if 0xFF00 <= addr <= 0xFF7F:
-            self._io[addr ^ 0xFF00] = data
-            if 0xFF40 <= addr <= 0xFF47:
-                self._gpu.wb(addr, data)
-            return
+    def __dma(self, data):
+        """OAM DMA: copy 0xXX00 - 0xXX9F to OAM.
+
+        The hardware moves a byte per M-cycle while the CPU runs on (from
+        HRAM); here the whole table is copied at once and OAM reads as 0xFF
+        to the CPU until the transfer would have finished.
+        """
+        page = self._rpage[data]
+        if page is not None:
+            self._oam[:] = page[:0xA0]
+        else:
+            base = data << 8
+            self._oam[:] = bytes(self.rb(base | i) for i in range(0xA0))
+        if self._sched is not None:
+            self._dmaend = self._sched.now + DMA_CYCLES
+
+    def __dmaRunning(self):
+        return self._sched is not None and self._sched.now < self._dmaend
+
+    def __rbIO(self, addr):
+        # HRAM
+        if addr >= 0xFF80:
+            if addr == 0xFFFF:
+                return self._interrupts.enable
+            return self._hram[addr ^ 0xFF80]
 
+        read = self._ioread[addr ^ 0xFF00]
+        if read is None:
+            return self._io[addr ^ 0xFF00]
+        return read(addr)
+
+    def __wbIO(self, addr, data):
         # HRAM
-        if 0xFF80 <= addr <= 0xFFFE:
+        if addr >= 0xFF80:
+            if addr == 0xFFFF:
+                self._interrupts.enable = data
+                return
             self._hram[addr ^ 0xFF80] = data
             return
 
-        # ienable
-        if addr == 0xFFFF:
-            self._ienable = data
-            return
+        write = self._iowrite[addr ^ 0xFF00]
+        if write is None:
+            self._io[addr ^ 0xFF00] = data
+        else:
+            write(addr, data)
 
-    # write 16bits
-    def ww(self, addr, data):
-        self.wb(addr, data & 0xFF)
-        self.wb((addr + 1) & 0xFFFF, data >> 8)
+    # The unused top bits of IF read as 1
+    def __rbIF(self, addr):
+        return 0xE0 | self._interrupts.flags
+
+    def __wbIF(self, addr, data):
+        self._interrupts.flags = data
+
+    def __wbDMA(self, addr, data):
+        self._io[0x46] = data
+        self.__dma(data)
+
+    # The boot ROM's last instruction writes 1 here to unmap itself
+    def __wbBoot(self, addr, data):
+        self._io[0x50] = data
+        if data:
+            self.biosf = False
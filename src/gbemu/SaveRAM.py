@@ -0,0 +1,70 @@
+import mmap
+import os
+import queue
+import threading
+
+# Bytes the MMU tracks as one dirty unit: one page table entry
+PAGE = 0x100
+
+
+class SaveRAM(object):
+    """Battery-backed cartridge RAM, kept in a memory-mapped .sav file.
+
+    The emulator reads and writes the mapping directly, so loading a save
+    is just mapping the file and a write is a store into it. The MMU notes
+    which 256-byte pages were written since the last flush (see
+    MMU.flushRAM()) and hands them to flush(), which queues them for a
+    background thread to sync to disk; the emulation thread never waits on
+    a syscall.
+    """
+
+    def __init__(self, path, size):
+        """Map path as size bytes of RAM, creating or growing the file.
+
+        Args:
+            path: The .sav file. An existing one keeps its contents.
+            size: Bytes of cartridge RAM.
+        """
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self.buffer = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self.__flusher, name="SaveRAM flush", daemon=True
+        )
+        self._thread.start()
+
+    def flush(self, pages):
+        """Queue the given dirty pages (by index) to be written to disk."""
+        if pages:
+            self._queue.put(pages)
+
+    def close(self):
+        """Write everything out and stop the flush thread.
+
+        The mapping itself stays valid for anything still viewing it.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.buffer.flush()
+
+    def __flusher(self):
+        size = len(self.buffer)
+        # msync works on whole OS pages
+        granularity = mmap.ALLOCATIONGRANULARITY
+        while True:
+            pages = self._queue.get()
+            if pages is None:
+                return
+            for offset in sorted(
+                {page * PAGE // granularity * granularity for page in pages}
+            ):
+                self.buffer.flush(offset, min(granularity, size - offset))
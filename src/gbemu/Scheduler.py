@@ -0,0 +1,108 @@
+import heapq
+
+# Sorts after every real cycle count
+NEVER = float("inf")
+
+
+def _noop(cycle):
+    pass
+
+
+class Scheduler(object):
+    """Cycle-based event queue shared by the emulated components.
+
+    Components register a callback at an absolute M-cycle instead of being
+    stepped after every instruction; the main loop runs the CPU freely while
+    ``cpu._clock < scheduler.next`` and then calls run() to dispatch whatever
+    came due. Events are kept in a min-heap ordered by cycle, ties in
+    scheduling order.
+
+    Each callback receives the cycle it was scheduled for, not the (possibly
+    later) cycle the CPU had reached, so periodic events can re-schedule
+    themselves without drifting.
+    """
+
+    def __init__(self, clock=None):
+        """Create an empty scheduler.
+
+        Args:
+            clock: Callable returning the current M-cycle, used by sync() to
+                catch up in the middle of an instruction. Defaults to the
+                cycle of the last run().
+        """
+        self._heap = []
+        self._seq = 0
+        self._now = 0
+        self._clock = clock if clock is not None else lambda: self._now
+        # Cycle of the earliest pending event
+        self.next = NEVER
+
+    @property
+    def now(self):
+        """The current M-cycle, as seen by the clock."""
+        return self._clock()
+
+    @property
+    def lastRun(self):
+        """The M-cycle passed to the latest run()."""
+        return self._now
+
+    @property
+    def pending(self):
+        """Number of events still queued, cancelled ones excluded."""
+        return sum(1 for event in self._heap if event[2] is not None)
+
+    def schedule(self, cycle, callback):
+        """Call callback(cycle) once the clock reaches the given M-cycle.
+
+        Returns:
+            A handle for cancel().
+        """
+        event = [cycle, self._seq, callback]
+        self._seq += 1
+        heapq.heappush(self._heap, event)
+        if cycle < self.next:
+            self.next = cycle
+        return event
+
+    def checkpoint(self, cycle=None):
+        """Schedule a no-op, by default now, so the CPU's free run ends there.
+
+        Returns:
+            A handle for cancel().
+        """
+        return self.schedule(self.now if cycle is None else cycle, _noop)
+
+    def cancel(self, event):
+        """Drop a scheduled event. Cancelling a fired event does nothing."""
+        # Left in the heap and skipped when it comes up
+        event[2] = None
+
+    def run(self, now):
+        """Dispatch every event due at or before now, in cycle order.
+
+        Callbacks may schedule further events; those that are already due
+        run in the same call.
+        """
+        heap = self._heap
+        self._now = now
+        while heap and heap[0][0] <= now:
+            cycle, _, callback = heapq.heappop(heap)
+            if callback is not None:
+                callback(cycle)
+        self.next = heap[0][0] if heap else NEVER
+
+    def sync(self):
+        """Bring every component up to the current clock.
+
+        Called before reads of state that events update (LY, STAT), which
+        can happen between the due cycle and the main loop's next run().
+        """
+        now = self._clock()
+        if now >= self.next:
+            self.run(now)
+
+    def clear(self):
+        """Drop every pending event."""
+        self._heap = []
+        self.next = NEVER
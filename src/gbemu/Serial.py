@@ -0,0 +1,73 @@
+from .Interrupts import SERIAL
+
+# M-cycles to shift a byte out on the internal 8192 Hz clock
+TRANSFER_CYCLES = 8 * 128
+
+
+class Serial(object):
+    """The serial port (SB 0xFF01, SC 0xFF02) with no link cable attached.
+
+    Setting SC bit 7 with the internal clock selected sends SB; the
+    transfer ends TRANSFER_CYCLES later with 0xFF shifted in, as nothing
+    answers, and raises the serial interrupt. Every byte sent is appended
+    to output, which is where test ROMs print their results. A transfer on
+    the external clock waits for a partner that never comes.
+    """
+
+    def __init__(self, sched, request=None):
+        """Create the port.
+
+        Args:
+            sched: Scheduler providing the clock and ending transfers.
+            request: Callable raising interrupts, e.g. Interrupts.request.
+        """
+        self._sched = sched
+        self._request = request
+        self._event = None
+        self.reset()
+
+    def reset(self):
+        if self._event is not None:
+            self._sched.cancel(self._event)
+            self._event = None
+        self._sb = 0
+        self._sc = 0
+        # Bytes sent since the last reset
+        self.output = bytearray()
+
+    def ioHandlers(self):
+        """Return {address: (read, write)} for the serial registers.
+
+        Registers:
+            0xFF01 - SB: byte to send, replaced by the one received
+            0xFF02 - SC: bit 7 starts a transfer, bit 0 selects the clock
+        """
+        return {
+            0xFF01: (self.__rbSB, self.__wbSB),
+            0xFF02: (self.__rbSC, self.__wbSC),
+        }
+
+    def __rbSB(self, addr):
+        return self._sb
+
+    def __wbSB(self, addr, val):
+        self._sb = val
+
+    def __rbSC(self, addr):
+        # Bits 1-6 are unused
+        return 0x7E | self._sc
+
+    def __wbSC(self, addr, val):
+        self._sc = val & 0x81
+        if self._sc == 0x81 and self._event is None:
+            self.output.append(self._sb)
+            self._event = self._sched.schedule(
+                self._sched.now + TRANSFER_CYCLES, self.__done
+            )
+
+    def __done(self, cycle):
+        self._event = None
+        self._sb = 0xFF
+        self._sc &= 0x01
+        if self._request is not None:
+            self._request(SERIAL)
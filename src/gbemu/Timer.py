@@ -0,0 +1,139 @@
+from .Interrupts import TIMER
+
+# M-cycles per TIMA increment, by TAC bits 0-1 (4096, 262144, 65536 and
+# 16384 Hz)
+PERIODS = (256, 4, 16, 64)
+
+# DIV counts at 16384 Hz, every 64 M-cycles
+DIV_SHIFT = 6
+
+
+class Timer(object):
+    """The DIV/TIMA/TMA/TAC timer (0xFF04-0xFF07), computed from the clock.
+
+    Nothing counts per instruction. DIV is the time since it was last reset;
+    TIMA is the value it was last set to plus the ticks of its period seen
+    since. The only event is the next TIMA overflow, which reloads TMA,
+    requests the timer interrupt and schedules the following one. Writes
+    that change the count or its rate re-anchor TIMA at the current cycle
+    and reschedule the overflow.
+
+    TIMA ticks on multiples of its period counted from the last DIV reset,
+    so like the hardware both share one internal counter.
+    """
+
+    def __init__(self, sched, request=None):
+        """Create the timer.
+
+        Args:
+            sched: Scheduler providing the clock and running the overflow.
+            request: Callable raising interrupts, e.g. Interrupts.request.
+        """
+        self._sched = sched
+        self._request = request
+        self._event = None
+        # I/O register -> (read, write) handlers
+        self._io = {
+            0xFF04: (self.__rbDIV, self.__wbDIV),
+            0xFF05: (self.__rbTIMA, self.__wbTIMA),
+            0xFF06: (self.__rbTMA, self.__wbTMA),
+            0xFF07: (self.__rbTAC, self.__wbTAC),
+        }
+        self.reset()
+
+    def reset(self):
+        """Reset all timer registers, restarting DIV at the current cycle."""
+        if self._event is not None:
+            self._sched.cancel(self._event)
+            self._event = None
+        now = self._sched.now
+        # Cycle DIV was last reset on
+        self._divbase = now
+        # TIMA as of cycle _anchor
+        self._tima = 0
+        self._anchor = now
+        self._tma = 0
+        self._tac = 0
+
+    def __ticks(self, cycle):
+        """TIMA periods elapsed between the last DIV reset and cycle."""
+        return (cycle - self._divbase) // PERIODS[self._tac & 3]
+
+    def __tima(self, now):
+        if not self._tac & 0x04:
+            return self._tima
+        return self._tima + self.__ticks(now) - self.__ticks(self._anchor)
+
+    def __rearm(self, now, tima):
+        """Count on from tima at now and schedule the next overflow."""
+        if self._event is not None:
+            self._sched.cancel(self._event)
+            self._event = None
+        self._tima = tima
+        self._anchor = now
+        if self._tac & 0x04:
+            period = PERIODS[self._tac & 3]
+            cycle = self._divbase + (self.__ticks(now) + 0x100 - tima) * period
+            self._event = self._sched.schedule(cycle, self.__overflow)
+
+    def __overflow(self, cycle):
+        self._event = None
+        if self._request is not None:
+            self._request(TIMER)
+        self.__rearm(cycle, self._tma)
+
+    def ioHandlers(self):
+        """Return {address: (read, write)} for the timer registers.
+
+        Registers:
+            0xFF04 - DIV:  upper byte of the internal counter
+            0xFF05 - TIMA: counter, raises the timer interrupt on overflow
+            0xFF06 - TMA:  value TIMA reloads on overflow
+            0xFF07 - TAC:  bit 2 enables TIMA, bits 0-1 select its rate
+
+        Any write to DIV resets the internal counter to 0.
+        """
+        return dict(self._io)
+
+    def rb(self, addr):
+        """Read a timer register. See ioHandlers() for the map."""
+        return self._io[addr][0](addr)
+
+    def wb(self, addr, val):
+        """Write a timer register. See ioHandlers() for the map."""
+        self._io[addr][1](addr, val)
+
+    def __rbDIV(self, addr):
+        return ((self._sched.now - self._divbase) >> DIV_SHIFT) & 0xFF
+
+    def __wbDIV(self, addr, val):
+        self._sched.sync()
+        now = self._sched.now
+        tima = self.__tima(now)
+        self._divbase = now
+        self.__rearm(now, tima)
+
+    def __rbTIMA(self, addr):
+        # An overflow may be due but not dispatched yet
+        self._sched.sync()
+        return self.__tima(self._sched.now)
+
+    def __wbTIMA(self, addr, val):
+        self._sched.sync()
+        self.__rearm(self._sched.now, val)
+
+    def __rbTMA(self, addr):
+        return self._tma
+
+    def __wbTMA(self, addr, val):
+        self._tma = val
+
+    def __rbTAC(self, addr):
+        return 0xF8 | self._tac
+
+    def __wbTAC(self, addr, val):
+        self._sched.sync()
+        now = self._sched.now
+        tima = self.__tima(now)
+        self._tac = val & 0x07
+        self.__rearm(now, tima)
@@ -1,10 +1,10 @@
 """Game Boy Emulator package."""
 
-from .GBEmu import GBEmu
+from .GBEmu import GBEmu, RunStats
 from .GPU import GPU
 from .MMU import MMU
-from .registers import R8, R16
+from .registers import RegisterFile
 from .Z80 import Z80
 
 __version__ = "0.1.0"
-__all__ = ["GBEmu", "Z80", "MMU", "GPU", "R8", "R16"]
+__all__ = ["GBEmu", "RunStats", "Z80", "MMU", "GPU", "RegisterFile"]
@@ -1,23 +1,53 @@
 """Entry point for the Game Boy emulator.
 
 Usage:
-    python -m gbemu <rom_file>
+    python -m gbemu [--headless] [--backend {interpreter,jit}] [--frames N]
+                    [--input FILE] <rom_file>
 """
 
-import sys
+import argparse
 
-from .GBEmu import GBEmu
+from .GBEmu import BACKENDS, GBEmu
 
 
 def main():
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <rom_file>")
-        sys.exit(1)
-
-    rom_path = sys.argv[1]
-    emu = GBEmu()
-    emu.loadROM(rom_path)
-    emu.start()
+    parser = argparse.ArgumentParser(prog="gbemu")
+    parser.add_argument("rom_file")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without opening a window (pygame is not imported)",
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="interpreter")
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=None,
+        help="run this many frames and exit instead of running forever",
+    )
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="play back scripted joypad input (lines of 'cycle [button ...]')",
+    )
+    args = parser.parse_args()
+
+    emu = GBEmu(backend=args.backend, headless=args.headless)
+    emu.loadROM(args.rom_file)
+    if args.input is not None:
+        emu.loadInput(args.input)
+    try:
+        if args.frames is None:
+            emu.start()
+        else:
+            stats = emu.run_frames(args.frames)
+            print(
+                f"{args.frames} frames, {stats.instructions} instructions, "
+                f"{stats.cycles} M-cycles in {stats.seconds:.2f}s "
+                f"({stats.skipped} M-cycles idle, fast-forwarded)"
+            )
+    finally:
+        emu.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+"""Precomputed results for the 8-bit ALU instructions.
+
+Every entry packs ``result << 8 | flags``, which is exactly the layout of the
+AF register pair, so most arithmetic opcodes are a single table lookup
+written straight to ``AF``:
+
+    ADC[carry << 16 | a << 8 | b]  ADD/ADC A,b (ADD uses carry = 0)
+    SBC[carry << 16 | a << 8 | b]  SUB/SBC/CP A,b (SUB and CP use carry = 0)
+    AND[a & b], OR[a | b], XOR[a ^ b]
+    INC[v], DEC[v]                 callers keep the previous carry flag
+
+The CB-prefixed rotates, shifts and BIT tests are tabled the same way:
+
+    SHIFT[op << 9 | carry << 8 | v]  op in CB order: RLC, RRC, RL, RR, SLA,
+                                     SRA, SWAP, SRL
+    BIT[b << 8 | v]                  the Z and H flags of BIT b,v
+
+The tables reproduce the core's flag rules bit for bit, including feeding
+``b + carry`` through the same half-carry check as the plain operation.
+They are built once at import and shared by every CPU instance; see
+footprint() for their size.
+"""
+
+import sys
+from array import array
+
+import numpy as np
+
+ZERO = 0x80
+SUB = 0x40
+HALF_CARRY = 0x20
+CARRY = 0x10
+
+
+def _pack(result, flags):
+    return array("H", ((result & 0xFF) << 8 | flags).astype(np.uint16).tobytes())
+
+
+def _add(a, b):
+    result = a + b
+    flags = np.where((result & 0xFF) == 0, ZERO, 0)
+    flags |= np.where(result > 0xFF, CARRY, 0)
+    flags |= np.where((a & 0xF) + (b & 0xF) > 0xF, HALF_CARRY, 0)
+    return _pack(result, flags)
+
+
+def _sub(a, b):
+    result = a - b
+    carrybits = a ^ b ^ result
+    flags = SUB | np.where((result & 0xFF) == 0, ZERO, 0)
+    flags |= np.where(carrybits & 0x100, CARRY, 0)
+    flags |= np.where(carrybits & 0x10, HALF_CARRY, 0)
+    return _pack(result, flags)
+
+
+def _logic(result, flags):
+    return _pack(result, flags | np.where(result == 0, ZERO, 0))
+
+
+_index = np.arange(0x20000, dtype=np.int64)
+_carry, _a, _b = _index >> 16, (_index >> 8) & 0xFF, _index & 0xFF
+_v = np.arange(0x100, dtype=np.int64)
+
+ADC = _add(_a, _b + _carry)
+SBC = _sub(_a, _b + _carry)
+AND = _logic(_v, HALF_CARRY)
+OR = _logic(_v, 0)
+XOR = OR
+INC = _add(_v, 1)
+DEC = _sub(_v, 1)
+
+
+def _shifts(c, v):
+    """(result, carry out) of each CB shift, in opcode order."""
+    return [
+        ((v << 1) | (v >> 7), v >> 7),  # RLC
+        ((v >> 1) | (v << 7), v & 1),  # RRC
+        ((v << 1) | c, v >> 7),  # RL
+        ((v >> 1) | (c << 7), v & 1),  # RR
+        (v << 1, v >> 7),  # SLA
+        ((v >> 1) | (v & 0x80), v & 1),  # SRA
+        ((v >> 4) | (v << 4), 0 * v),  # SWAP
+        (v >> 1, v & 1),  # SRL
+    ]
+
+
+_c, _v8 = _index[:0x200] >> 8, _index[:0x200] & 0xFF
+SHIFT = array("H")
+for _result, _out in _shifts(_c, _v8):
+    _result &= 0xFF
+    SHIFT += _pack(_result, np.where(_result == 0, ZERO, 0) | _out * CARRY)
+
+_bit, _v8 = _index[:0x800] >> 8, _index[:0x800] & 0xFF
+BIT = _pack(0 * _v8, HALF_CARRY | np.where((_v8 >> _bit) & 1, 0, ZERO))
+
+del _index, _carry, _a, _b, _v, _c, _v8, _bit, _result, _out
+
+
+def footprint():
+    """Return the bytes held by the shared ALU tables."""
+    tables = (ADC, SBC, AND, OR, INC, DEC, SHIFT, BIT)
+    return sum(sys.getsizeof(t) for t in tables)
@@ -1,44 +1,32 @@
-class R16(object):
-    def __init__(self):
-        self._l = R8()
-        self._h = R8()
-
-    @property
-    def value(self):
-        return (self._h.value << 8) | self._l.value
+import sys
 
-    @value.setter
-    def value(self, val):
-        val &= 0xFFFF
-        self._l.value = val & 0xFF
-        self._h.value = val >> 8
+# The whole register file lives in one 12-byte buffer. Each 16-bit pair is
+# stored low byte first on little-endian hosts (high byte first otherwise) so
+# the same memory can be viewed both as bytes and as native unsigned shorts.
+if sys.byteorder == "little":
+    F, A, C, B, E, D, L, H = range(8)
+else:
+    A, F, B, C, D, E, H, L = range(8)
 
-    @property
-    def high(self):
-        return self._h.value
+# Indices into the 16-bit view
+AF, BC, DE, HL, SP, PC = range(6)
 
-    @property
-    def low(self):
-        return self._l.value
 
-    @low.setter
-    def low(self, value):
-        self._l.value = value
+class RegisterFile(object):
+    """Flat CPU register storage with named 8-bit and 16-bit views.
 
-    @high.setter
-    def high(self, value):
-        self._h.value = value
+    ``r8`` is a bytearray indexed by ``A``, ``F``, ``B``, ``C``, ``D``, ``E``,
+    ``H`` and ``L``; ``r16`` is a memoryview over the same bytes indexed by
+    ``AF``, ``BC``, ``DE``, ``HL``, ``SP`` and ``PC``. Writing one view is
+    immediately visible through the other.
 
+    Both views reject out of range values instead of wrapping, so callers
+    mask with 0xFF / 0xFFFF where an operation can overflow.
+    """
 
-class R8(object):
     def __init__(self):
-        self._value = 0
-
-    @property
-    def value(self):
-        return self._value
+        self.r8 = bytearray(12)
+        self.r16 = memoryview(self.r8).cast("H")
 
-    @value.setter
-    def value(self, val):
-        self._value = val
-        self._value &= 0xFF
+    def reset(self):
+        self.r8[:] = bytes(12)
@@ -5,6 +5,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 sys.path.insert(0, os.path.dirname(__file__))
 
+from gbemu import GBEmu
+from gbemu.registers import PC, SP
 from gbemu.Z80 import Z80
 
 
@@ -14,3 +16,26 @@ def cpu():
     cpu = Z80()
     cpu.Reset()
     return cpu
+
+
+@pytest.fixture
+def program_emulator():
+    """Factory for emulators running a program from ROM 0x100.
+
+    Call it as program_emulator(backend, program, handler=(), vector=0x40)
+    to also install handler at the given interrupt vector; idle_skip is
+    passed on to GBEmu. The boot ROM is unmapped and SP starts at 0xFFFE.
+    """
+
+    def make(backend, program, handler=(), vector=0x40, idle_skip=True):
+        emulator = GBEmu(backend=backend, headless=True, idle_skip=idle_skip)
+        rom = bytearray(0x8000)
+        rom[vector : vector + len(handler)] = bytes(handler)
+        rom[0x100 : 0x100 + len(program)] = bytes(program)
+        emulator._mmu.loadROM(rom)
+        emulator._mmu.biosf = False
+        emulator._cpu._rr[PC] = 0x100
+        emulator._cpu._rr[SP] = 0xFFFE
+        return emulator
+
+    return make
@@ -18,6 +18,7 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
+from gbemu import registers as regs
 from gbemu.Z80 import Z80
 
 
@@ -92,74 +93,63 @@ class CPUStateValidator:
 
     # Register access mapping
     REGISTER_GETTERS = {
-        Register.A: lambda cpu: cpu._AF.high,
-        Register.F: lambda cpu: cpu._AF.low,
-        Register.AF: lambda cpu: cpu._AF.value,
-        Register.B: lambda cpu: cpu._BC.high,
-        Register.C: lambda cpu: cpu._BC.low,
-        Register.BC: lambda cpu: cpu._BC.value,
-        Register.D: lambda cpu: cpu._DE.high,
-        Register.E: lambda cpu: cpu._DE.low,
-        Register.DE: lambda cpu: cpu._DE.value,
-        Register.H: lambda cpu: cpu._HL.high,
-        Register.L: lambda cpu: cpu._HL.low,
-        Register.HL: lambda cpu: cpu._HL.value,
-        Register.SP: lambda cpu: cpu._SP.value,
-        Register.PC: lambda cpu: cpu._PC.value,
+        Register.A: lambda cpu: cpu._r[regs.A],
+        Register.F: lambda cpu: cpu._r[regs.F],
+        Register.AF: lambda cpu: cpu._rr[regs.AF],
+        Register.B: lambda cpu: cpu._r[regs.B],
+        Register.C: lambda cpu: cpu._r[regs.C],
+        Register.BC: lambda cpu: cpu._rr[regs.BC],
+        Register.D: lambda cpu: cpu._r[regs.D],
+        Register.E: lambda cpu: cpu._r[regs.E],
+        Register.DE: lambda cpu: cpu._rr[regs.DE],
+        Register.H: lambda cpu: cpu._r[regs.H],
+        Register.L: lambda cpu: cpu._r[regs.L],
+        Register.HL: lambda cpu: cpu._rr[regs.HL],
+        Register.SP: lambda cpu: cpu._rr[regs.SP],
+        Register.PC: lambda cpu: cpu._rr[regs.PC],
     }
 
     REGISTER_SETTERS = {
-        Register.A: lambda cpu, val: setattr(cpu._AF, "high", val),
-        Register.F: lambda cpu, val: setattr(cpu._AF, "low", val),
-        Register.AF: lambda cpu, val: setattr(cpu._AF, "value", val),
-        Register.B: lambda cpu, val: setattr(cpu._BC, "high", val),
-        Register.C: lambda cpu, val: setattr(cpu._BC, "low", val),
-        Register.BC: lambda cpu, val: setattr(cpu._BC, "value", val),
-        Register.D: lambda cpu, val: setattr(cpu._DE, "high", val),
-        Register.E: lambda cpu, val: setattr(cpu._DE, "low", val),
-        Register.DE: lambda cpu, val: setattr(cpu._DE, "value", val),
-        Register.H: lambda cpu, val: setattr(cpu._HL, "high", val),
-        Register.L: lambda cpu, val: setattr(cpu._HL, "low", val),
-        Register.HL: lambda cpu, val: setattr(cpu._HL, "value", val),
-        Register.SP: lambda cpu, val: setattr(cpu._SP, "value", val),
-        Register.PC: lambda cpu, val: setattr(cpu._PC, "value", val),
+        Register.A: lambda cpu, val: cpu._r.__setitem__(regs.A, val & 0xFF),
+        Register.F: lambda cpu, val: cpu._r.__setitem__(regs.F, val & 0xFF),
+        Register.AF: lambda cpu, val: cpu._rr.__setitem__(regs.AF, val & 0xFFFF),
+        Register.B: lambda cpu, val: cpu._r.__setitem__(regs.B, val & 0xFF),
+        Register.C: lambda cpu, val: cpu._r.__setitem__(regs.C, val & 0xFF),
+        Register.BC: lambda cpu, val: cpu._rr.__setitem__(regs.BC, val & 0xFFFF),
+        Register.D: lambda cpu, val: cpu._r.__setitem__(regs.D, val & 0xFF),
+        Register.E: lambda cpu, val: cpu._r.__setitem__(regs.E, val & 0xFF),
+        Register.DE: lambda cpu, val: cpu._rr.__setitem__(regs.DE, val & 0xFFFF),
+        Register.H: lambda cpu, val: cpu._r.__setitem__(regs.H, val & 0xFF),
+        Register.L: lambda cpu, val: cpu._r.__setitem__(regs.L, val & 0xFF),
+        Register.HL: lambda cpu, val: cpu._rr.__setitem__(regs.HL, val & 0xFFFF),
+        Register.SP: lambda cpu, val: cpu._rr.__setitem__(regs.SP, val & 0xFFFF),
+        Register.PC: lambda cpu, val: cpu._rr.__setitem__(regs.PC, val & 0xFFFF),
     }
 
     # Flag access mapping
     FLAG_GETTERS = {
-        Flag.ZERO: lambda cpu: (cpu._AF.low & 0x80) != 0,
-        Flag.SUB: lambda cpu: (cpu._AF.low & 0x40) != 0,
-        Flag.HALF_CARRY: lambda cpu: (cpu._AF.low & 0x20) != 0,
-        Flag.CARRY: lambda cpu: (cpu._AF.low & 0x10) != 0,
+        Flag.ZERO: lambda cpu: (cpu._r[regs.F] & 0x80) != 0,
+        Flag.SUB: lambda cpu: (cpu._r[regs.F] & 0x40) != 0,
+        Flag.HALF_CARRY: lambda cpu: (cpu._r[regs.F] & 0x20) != 0,
+        Flag.CARRY: lambda cpu: (cpu._r[regs.F] & 0x10) != 0,
         Flag.STOP: lambda cpu: cpu._stop,
         Flag.HALT: lambda cpu: cpu._halt,
     }
 
+    # Flag setters return the new F value; setup_state writes it back
     FLAG_SETTERS = {
-        Flag.ZERO: lambda cpu, val: setattr(
-            cpu._AF, "low", (cpu._AF.low | 0x80) if val else (cpu._AF.low & ~0x80)
-        )
-        or (cpu._AF.low | 0x80)
-        if val
-        else (cpu._AF.low & ~0x80),
-        Flag.SUB: lambda cpu, val: setattr(
-            cpu._AF, "low", (cpu._AF.low | 0x40) if val else (cpu._AF.low & ~0x40)
-        )
-        or (cpu._AF.low | 0x40)
-        if val
-        else (cpu._AF.low & ~0x40),
-        Flag.HALF_CARRY: lambda cpu, val: setattr(
-            cpu._AF, "low", (cpu._AF.low | 0x20) if val else (cpu._AF.low & ~0x20)
-        )
-        or (cpu._AF.low | 0x20)
-        if val
-        else (cpu._AF.low & ~0x20),
-        Flag.CARRY: lambda cpu, val: setattr(
-            cpu._AF, "low", (cpu._AF.low | 0x10) if val else (cpu._AF.low & ~0x10)
-        )
-        or (cpu._AF.low | 0x10)
-        if val
-        else (cpu._AF.low & ~0x10),
+        Flag.ZERO: lambda cpu, val: (
+            (cpu._r[regs.F] | 0x80) if val else (cpu._r[regs.F] & ~0x80)
+        ),
+        Flag.SUB: lambda cpu, val: (
+            (cpu._r[regs.F] | 0x40) if val else (cpu._r[regs.F] & ~0x40)
+        ),
+        Flag.HALF_CARRY: lambda cpu, val: (
+            (cpu._r[regs.F] | 0x20) if val else (cpu._r[regs.F] & ~0x20)
+        ),
+        Flag.CARRY: lambda cpu, val: (
+            (cpu._r[regs.F] | 0x10) if val else (cpu._r[regs.F] & ~0x10)
+        ),
         Flag.STOP: lambda cpu, val: setattr(cpu, "_stop", val),
         Flag.HALT: lambda cpu, val: setattr(cpu, "_halt", val),
     }
@@ -176,7 +166,8 @@ class CPUStateValidator:
                 cpu._mem.wb(item.address, item.value)
             elif isinstance(item, FlagValue):
                 new_flags = CPUStateValidator.FLAG_SETTERS[item.flag](cpu, item.value)
-                cpu._AF.low = new_flags
+                if new_flags is not None:
+                    cpu._r[regs.F] = new_flags
 
     @staticmethod
     def verify_state(
@@ -212,15 +203,15 @@ class CPUStateValidator:
     def execute_instruction(cpu: Z80, opcode: int):
         """Execute single instruction and handle PC increment."""
         # Store initial PC for instruction fetch
-        initial_pc = cpu._PC.value
+        initial_pc = cpu._rr[regs.PC]
 
         # Execute the instruction (it should handle its own PC increment)
         cpu._opmap[opcode]()
 
         # If PC didn't change during instruction execution, increment by 1
         # This handles single-byte instructions that don't increment PC themselves
-        if cpu._PC.value == initial_pc:
-            cpu._PC.value += 1
+        if cpu._rr[regs.PC] == initial_pc:
+            cpu._rr[regs.PC] = (initial_pc + 1) & 0xFFFF
 
     @staticmethod
     def assert_state(cpu: Z80, test_case: InstructionTestCase):
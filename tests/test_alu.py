@@ -0,0 +1,81 @@
+import pytest
+
+from gbemu import alu
+
+
+def add8(v1, v2):
+    result = v1 + v2
+    flags = 0
+    if (result & 0xFF) == 0:
+        flags |= alu.ZERO
+    if result > 0xFF:
+        flags |= alu.CARRY
+    if (v1 & 0xF) + (v2 & 0xF) > 0xF:
+        flags |= alu.HALF_CARRY
+    return (result & 0xFF) << 8 | flags
+
+
+def sub8(v1, v2):
+    result = v1 - v2
+    carrybits = v1 ^ v2 ^ result
+    flags = alu.SUB
+    if (result & 0xFF) == 0:
+        flags |= alu.ZERO
+    if carrybits & 0x100:
+        flags |= alu.CARRY
+    if carrybits & 0x10:
+        flags |= alu.HALF_CARRY
+    return (result & 0xFF) << 8 | flags
+
+
+def logic(result, flags=0):
+    return result << 8 | flags | (alu.ZERO if result == 0 else 0)
+
+
+@pytest.mark.parametrize("carry", [0, 1])
+def test_adc_sbc_tables(carry):
+    for a in range(256):
+        for b in range(256):
+            index = carry << 16 | a << 8 | b
+            assert alu.ADC[index] == add8(a, b + carry)
+            assert alu.SBC[index] == sub8(a, b + carry)
+
+
+def test_logic_and_inc_dec_tables():
+    for v in range(256):
+        assert alu.AND[v] == logic(v, alu.HALF_CARRY)
+        assert alu.OR[v] == logic(v)
+        assert alu.XOR[v] == logic(v)
+        assert alu.INC[v] == add8(v, 1)
+        assert alu.DEC[v] == sub8(v, 1)
+
+
+def test_footprint():
+    # Two 128K-entry and four 256-entry 16-bit tables
+    assert alu.footprint() >= 2 * 0x20000 * 2 + 4 * 0x100 * 2
+
+
+def test_shift_table():
+    """RLC, RRC, RL, RR, SLA, SRA, SWAP, SRL in CB opcode order."""
+    for carry in (0, 1):
+        for v in range(256):
+            expected = [
+                ((v << 1 | v >> 7) & 0xFF, v >> 7),
+                ((v >> 1 | v << 7) & 0xFF, v & 1),
+                ((v << 1 | carry) & 0xFF, v >> 7),
+                (v >> 1 | carry << 7, v & 1),
+                ((v << 1) & 0xFF, v >> 7),
+                (v >> 1 | v & 0x80, v & 1),
+                ((v << 4 | v >> 4) & 0xFF, 0),
+                (v >> 1, v & 1),
+            ]
+            for op, (result, out) in enumerate(expected):
+                flags = (alu.ZERO if result == 0 else 0) | (alu.CARRY if out else 0)
+                assert alu.SHIFT[op << 9 | carry << 8 | v] == result << 8 | flags
+
+
+def test_bit_table():
+    for b in range(8):
+        for v in range(256):
+            zero = 0 if v & (1 << b) else alu.ZERO
+            assert alu.BIT[b << 8 | v] == zero | alu.HALF_CARRY
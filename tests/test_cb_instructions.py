@@ -1,4 +1,5 @@
 import pytest
+from gbemu import registers as regs
 from helpers import (
     Register, Flag,
     RegisterValue, MemoryValue, FlagValue,
@@ -1085,12 +1086,12 @@ def test_rotation_shift_operations(cpu, test_case):
     CPUStateValidator.setup_state(cpu, test_case.setup)
 
     # Execute instruction (CB-prefixed opcodes need special handling)
-    initial_pc = cpu._PC.value
+    initial_pc = cpu._rr[regs.PC]
 
     # Write the CB prefix and opcode to memory, then execute from PC
     cpu._mem.wb(initial_pc, 0xCB)
     cpu._mem.wb(initial_pc + 1, test_case.opcode & 0xFF)
-    cpu._PC.value += 2  # Skip to after the CB opcode
+    cpu._rr[regs.PC] += 2  # Skip to after the CB opcode
 
     # Execute the CB opcode directly (it should execute what we just wrote)
     cb_method = getattr(cpu, f"OPCode_CB{test_case.opcode & 0xFF:02X}")
@@ -1167,12 +1168,12 @@ def test_bit_operations(cpu, test_case):
     CPUStateValidator.setup_state(cpu, test_case.setup)
 
     # Execute instruction (CB-prefixed opcodes need special handling)
-    initial_pc = cpu._PC.value
+    initial_pc = cpu._rr[regs.PC]
 
     # Write the CB prefix and opcode to memory, then execute from PC
     cpu._mem.wb(initial_pc, 0xCB)
     cpu._mem.wb(initial_pc + 1, test_case.opcode & 0xFF)
-    cpu._PC.value += 2  # Skip to after the CB opcode
+    cpu._rr[regs.PC] += 2  # Skip to after the CB opcode
 
     # Execute the CB opcode directly (it should execute what we just wrote)
     cb_method = getattr(cpu, f"OPCode_CB{test_case.opcode & 0xFF:02X}")
@@ -1244,11 +1245,11 @@ def test_cb_set_completeness(cpu, test_case):
 # --- CB dispatcher (covers lines 1499-1501) ---
 def test_cb_dispatcher(cpu):
     """Test the CB prefix dispatcher (0xCB) routes to CB sub-opcode."""
-    cpu._PC.value = 0xC000
+    cpu._rr[regs.PC] = 0xC000
     cpu._mem.wb(0xC000, 0x37)  # CB opcode for SWAP A
-    cpu._AF.high = 0xF0
+    cpu._r[regs.A] = 0xF0
     CPUStateValidator.execute_instruction(cpu, 0xCB)
-    assert cpu._AF.high == 0x0F, "CB dispatcher should route to SWAP A"
-    assert cpu._PC.value == 0xC001, "PC should advance past CB sub-opcode byte"
+    assert cpu._r[regs.A] == 0x0F, "CB dispatcher should route to SWAP A"
+    assert cpu._rr[regs.PC] == 0xC001, "PC should advance past CB sub-opcode byte"
 
 
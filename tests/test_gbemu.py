@@ -1,11 +1,18 @@
+import mmap
+import os
+import subprocess
+import sys
+
 import pytest
 
-from src.gbemu import GPU, MMU, R8, R16, Z80, GBEmu
+from src.gbemu import GPU, MMU, Z80, GBEmu, RegisterFile
+from src.gbemu import registers as regs
+from src.gbemu.GBEmu import CYCLES_PER_FRAME
 
 
 def test_gbemu_initialization():
     """Test that GBEmu can be initialized without errors."""
-    emulator = GBEmu()
+    emulator = GBEmu(headless=True)
     assert emulator._mmu is not None
     assert emulator._cpu is not None
     assert emulator._gpu is not None
@@ -14,25 +21,31 @@ def test_gbemu_initialization():
 def test_z80_registers():
     """Test Z80 register initialization."""
     cpu = Z80()
-    assert cpu._PC.value == 0
-    assert cpu._SP.value == 0
-    assert cpu._AF.value == 0
-    assert cpu._BC.value == 0
-    assert cpu._DE.value == 0
-    assert cpu._HL.value == 0
+    assert cpu._rr[regs.PC] == 0
+    assert cpu._rr[regs.SP] == 0
+    assert cpu._rr[regs.AF] == 0
+    assert cpu._rr[regs.BC] == 0
+    assert cpu._rr[regs.DE] == 0
+    assert cpu._rr[regs.HL] == 0
 
 
 def test_register_classes():
-    """Test register classes work correctly."""
-    r8 = R8()
-    r8.value = 255
-    assert r8.value == 255
+    """Test the register file's 8-bit and 16-bit views alias each other."""
+    rf = RegisterFile()
+    rf.r8[regs.B] = 255
+    assert rf.r8[regs.B] == 255
+
+    rf.r16[regs.HL] = 0x1234
+    assert rf.r8[regs.H] == 0x12
+    assert rf.r8[regs.L] == 0x34
+    assert rf.r16[regs.HL] == 0x1234
 
-    r16 = R16()
-    r16.value = 0x1234
-    assert r16.high == 0x12
-    assert r16.low == 0x34
-    assert r16.value == 0x1234
+    rf.r8[regs.A] = 0xAB
+    rf.r8[regs.F] = 0xC0
+    assert rf.r16[regs.AF] == 0xABC0
+
+    rf.reset()
+    assert rf.r16[regs.HL] == 0
 
 
 def test_mmu_initialization():
@@ -40,3 +53,273 @@ def test_mmu_initialization():
     mmu = MMU()
     assert mmu.biosf == True
     assert len(mmu._bios) > 0
+
+
+def test_vram_oam_shared_with_gpu():
+    """MMU and GPU see the same VRAM/OAM bytes without copying."""
+    emulator = GBEmu(headless=True)
+    emulator._mmu.wb(0x8010, 0xFF)
+    emulator._mmu.wb(0xFE05, 0x12)
+    assert emulator._gpu.VRAM[0x10] == 0xFF
+    assert emulator._gpu.OAM[0x05] == 0x12
+    assert emulator._gpu.tileset[1, 0].tolist() == [1] * 8
+
+
+def test_footprint():
+    """The address space is a single 64 KiB buffer."""
+    footprint = GBEmu(headless=True).footprint()
+    assert 0x10000 <= footprint["mmu"] < 0x10000 + 0x400
+
+
+def test_load_rom_maps_file(tmp_path):
+    """ROM files are memory-mapped, not read into Python objects."""
+    rom = bytearray(0x10000)
+    rom[0x147] = 0x19  # MBC5
+    rom[0xC000] = 0x5A
+    path = tmp_path / "game.gb"
+    path.write_bytes(bytes(rom))
+    emulator = GBEmu(headless=True)
+    emulator.loadROM(str(path))
+    mmu = emulator._mmu
+    assert isinstance(mmu._rom.obj, mmap.mmap)
+    mmu.wb(0x2000, 0x03)
+    assert mmu.rb(0x4000) == 0x5A
+
+
+def test_load_rom_from_bytes():
+    emulator = GBEmu(headless=True)
+    emulator.loadROM(bytes([0x77] * 0x8000))
+    emulator._mmu.biosf = False
+    assert emulator._mmu.rb(0x0000) == 0x77
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_load_rom_replaces_translated_code(backend):
+    """Code cached for one cartridge never runs for the next."""
+    emulator = GBEmu(backend=backend, headless=True)
+    cpu = emulator._cpu
+    for value in (0x11, 0x22):
+        rom = bytearray(0x8000)
+        rom[0x100:0x104] = bytes([0x06, value, 0x18, 0xFE])  # LD B,value; JR -2
+        emulator.loadROM(bytes(rom))
+        emulator._mmu.biosf = False
+        cpu._rr[regs.PC] = 0x100
+        emulator.run_cycles(100)
+        assert cpu._r[regs.B] == value
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_run_cycles(backend):
+    """run_cycles executes at least the requested cycles and reports them."""
+    emulator = GBEmu(backend=backend, headless=True)
+    stats = emulator.run_cycles(1000)
+    assert stats.cycles >= 1000
+    assert stats.cycles == emulator._cpu._clock
+    assert 0 < stats.instructions <= stats.cycles
+    assert stats.seconds > 0
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_run_frames_stop_on_frame_boundary(backend):
+    emulator = GBEmu(backend=backend, headless=True)
+    emulator.run_cycles(100)
+    emulator.run_frame()
+    clock = emulator._cpu._clock
+    assert CYCLES_PER_FRAME <= clock < CYCLES_PER_FRAME + 100
+    stats = emulator.run_frames(2)
+    assert 3 * CYCLES_PER_FRAME <= emulator._cpu._clock < 3 * CYCLES_PER_FRAME + 100
+    assert stats.cycles == emulator._cpu._clock - clock
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        GBEmu(backend="dynarec", headless=True)
+    with pytest.raises(ValueError):
+        GBEmu(lazy_flags=True, headless=True)
+
+
+def test_lazy_flags_frames_match():
+    """Lazy flags leave the boot ROM's run identical to eager flags."""
+    eager = GBEmu(backend="jit", headless=True)
+    lazy = GBEmu(backend="jit", headless=True, lazy_flags=True)
+    for emulator in (eager, lazy):
+        emulator.run_frames(30)
+    assert bytes(lazy._cpu._r) == bytes(eager._cpu._r)
+    assert lazy._cpu._clock == eager._cpu._clock
+    assert lazy.frameBytes() == eager.frameBytes()
+
+
+def test_headless_does_not_import_pygame():
+    code = (
+        "import sys; from gbemu import GBEmu; "
+        "GBEmu(headless=True).run_cycles(1000); "
+        "assert 'pygame' not in sys.modules"
+    )
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    subprocess.run([sys.executable, "-c", code], cwd=src, check=True)
+
+
+def test_headless_framebuffer():
+    """The boot ROM draws the logo into the in-memory framebuffer."""
+    emulator = GBEmu(headless=True)
+    frame = emulator.frame()
+    assert frame.shape == (144, 160, 3)
+    assert (frame == 255).all()
+
+    emulator.run_frames(120)
+    frame = emulator.frame()
+    assert (frame != 255).any()
+    assert emulator.frameBytes() == frame.tobytes()
+
+
+def test_frame_sink_called_at_vblank():
+    """Each V-Blank hands the palette-converted frame to the sink once."""
+    gpu = GPU(headless=True)
+    frames = []
+    gpu.setFrameSink(frames.append)
+    gpu._fb[10, 20] = 3
+    gpu.wb(0xFF47, 0xE4)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(CYCLES_PER_FRAME)
+    assert len(frames) == 1
+    assert frames[0].shape == (144, 160, 3)
+    # Line 10 was re-rendered from blank VRAM, shade 0 is white
+    assert frames[0][10, 20].tolist() == [255, 255, 255]
+    gpu._fb[0, 0] = 3
+    assert gpu.frame()[0, 0].tolist() == [0, 0, 0]
+
+
+def test_boot_rom_hands_over_at_0x100():
+    """The BIOS runs to completion, unmaps itself and jumps to the cartridge."""
+    emulator = GBEmu(backend="jit", headless=True)
+    mmu, cpu = emulator._mmu, emulator._cpu
+    rom = bytearray(0x8000)
+    # The logo and header checksum the BIOS verifies
+    rom[0x104:0x134] = mmu._bios[0xA8:0xD8]
+    rom[0x14D] = 0xE7
+    rom[0x100:0x104] = [0x18, 0xFE, 0x00, 0x00]  # JR -2
+    mmu.loadROM(rom)
+
+    # Running code above 0x00FF doesn't unmap the BIOS by itself
+    cpu._rr[regs.PC] = 0x0100
+    emulator.run_cycles(10)
+    assert mmu.biosf
+    cpu._rr[regs.PC] = 0x0000
+
+    while mmu.biosf and cpu._clock < 400 * CYCLES_PER_FRAME:
+        emulator.run_frame()
+    assert not mmu.biosf
+    assert cpu._rr[regs.PC] == 0x0100
+    assert mmu.rb(0x0000) == 0x00
+
+
+def test_ly_read_catches_up_with_clock():
+    """LY reads run mode changes that came due since the last dispatch."""
+    emulator = GBEmu(headless=True)
+    mmu, cpu = emulator._mmu, emulator._cpu
+    mmu.wb(0xFF40, 0x80)
+    assert mmu.rb(0xFF44) == 0
+    # As if the CPU ran ahead without the main loop dispatching events
+    cpu._clock += 114 * 5 + 10
+    assert emulator._gpu._line == 0
+    assert mmu.rb(0xFF44) == 5
+    assert mmu.rb(0xFF41) & 0x03 == 2
+
+
+# Clear IF, HALT until V-Blank, count it in B, repeat
+# fmt: off
+HALT_LOOP = [
+    0x3E, 0x01,  # LD A,0x01
+    0xE0, 0xFF,  # LDH (FF),A    IE = V-Blank
+    0x3E, 0x91,  # LD A,0x91
+    0xE0, 0x40,  # LDH (40),A    LCD on
+    # loop (0x0108)
+    0xAF,        # XOR A
+    0xE0, 0x0F,  # LDH (0F),A    IF = 0
+    0x76,        # HALT
+    0x04,        # INC B
+    0x18, 0xF9,  # JR loop
+]
+# fmt: on
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_halt_sleeps_until_vblank(backend, program_emulator):
+    """A halted CPU fetches nothing and wakes on the V-Blank request."""
+    emulator = program_emulator(backend, HALT_LOOP)
+    cpu = emulator._cpu
+    stats = emulator.run_frames(10)
+    assert cpu._r[regs.B] == 10
+    assert cpu._halt
+    assert stats.cycles == 10 * CYCLES_PER_FRAME
+    assert stats.instructions < 100
+
+
+def test_halt_wakes_on_the_vblank_cycle(program_emulator):
+    emulator = program_emulator("interpreter", HALT_LOOP)
+    cpu = emulator._cpu
+    emulator.run_frames(10)
+    # The LCD came on with the fourth instruction, 7 M-cycles in, so each
+    # V-Blank starts 144 lines after that; INC B runs on that very cycle
+    emulator.run_cycles(144 * 114 + 7)
+    assert cpu._halt
+    assert cpu._r[regs.B] == 10
+    emulator.run_cycles(1)
+    assert cpu._r[regs.B] == 11
+    assert cpu._rr[regs.PC] == 0x010D
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_stop_waits_for_joypad(backend, program_emulator):
+    emulator = program_emulator(backend, [0x10, 0x00, 0x04, 0x18, 0xFE])
+    cpu, mmu = emulator._cpu, emulator._mmu
+    mmu.wb(0xFFFF, 0x1F)
+    mmu.wb(0xFF40, 0x91)
+    emulator.run_frames(3)
+    assert cpu._stop
+    assert mmu.interrupts.pending & 0x01
+    assert cpu._r[regs.B] == 0
+
+    mmu.interrupts.request(0x10)
+    emulator.run_cycles(10)
+    assert not cpu._stop
+    assert cpu._r[regs.B] == 1
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_injected_press_ends_stop(backend, tmp_path, program_emulator):
+    # XOR A; LDH (00),A selects every line; STOP; INC B; JR -2
+    emulator = program_emulator(
+        backend, [0xAF, 0xE0, 0x00, 0x10, 0x00, 0x04, 0x18, 0xFE]
+    )
+    cpu = emulator._cpu
+    script = tmp_path / "input.txt"
+    script.write_text("5000 start\n")
+    emulator.loadInput(str(script))
+    emulator.run_cycles(4990)
+    assert cpu._stop
+    emulator.run_cycles(20)
+    assert not cpu._stop
+    assert cpu._r[regs.B] >= 1
+    assert emulator.joypad.state == 0x08
+    assert emulator._mmu.rb(0xFF00) == 0xC0 | 0x07
+
+
+def test_start_sleeps_out_each_frame(monkeypatch, program_emulator):
+    """Real-time mode sleeps away the host time a fast frame leaves over."""
+    module = sys.modules[GBEmu.__module__]
+    emulator = program_emulator("interpreter", HALT_LOOP)
+    sleeps = []
+    real_sleep = module.time.sleep
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        real_sleep(seconds)
+        if len(sleeps) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(module.time, "sleep", sleep)
+    with pytest.raises(KeyboardInterrupt):
+        emulator.start()
+    assert emulator._cpu._clock == 3 * CYCLES_PER_FRAME
+    assert all(0 < s <= module.FRAME_SECONDS for s in sleeps)
@@ -0,0 +1,168 @@
+import random
+
+import pytest
+
+from gbemu import GPU
+
+
+def random_gpu(seed):
+    rng = random.Random(seed)
+    gpu = GPU(headless=True)
+    for addr in range(0x2000):
+        gpu.VRAM[addr] = rng.randrange(256)
+        if addr < 0x1800:
+            gpu.updateTile(addr)
+    gpu.wb(0xFF40, 0x81 | rng.choice([0, 0x08]) | rng.choice([0, 0x10]))
+    gpu.wb(0xFF42, rng.randrange(256))
+    gpu.wb(0xFF43, rng.randrange(256))
+    gpu.wb(0xFF47, rng.randrange(256))
+    return gpu, rng
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_renderscan_matches_reference(seed):
+    """The vectorized scanline renderer matches the pixel loop."""
+    gpu, rng = random_gpu(seed)
+    for line in [0, 143] + rng.sample(range(1, 143), 10):
+        gpu._line = line
+        gpu._GPU__renderscan()
+        fast = gpu._fb[line].copy()
+        gpu._fb[line] = 0xFF
+        gpu._renderscanReference()
+        assert gpu._fb[line].tolist() == fast.tolist()
+
+
+def test_renderscan_wraps_scx():
+    """Pixels past the 256th background column wrap to column 0."""
+    gpu, _ = random_gpu(0)
+    gpu.wb(0xFF40, 0x91)
+    gpu.wb(0xFF42, 0)
+    gpu.wb(0xFF43, 0xFC)
+    gpu.wb(0xFF47, 0xE4)
+    gpu._line = 0
+    gpu._GPU__renderscan()
+    first = gpu._tileset[gpu.VRAM[0x1800], 0]
+    last = gpu._tileset[gpu.VRAM[0x181F], 0]
+    assert gpu._fb[0, :4].tolist() == last[4:].tolist()
+    assert gpu._fb[0, 4:12].tolist() == first.tolist()
+
+
+def test_tile_writes_decode_lazily():
+    """VRAM writes only mark tiles; they are decoded before the next render."""
+    gpu = GPU(headless=True)
+    gpu.VRAM[0x20] = 0b10100101
+    gpu.VRAM[0x21] = 0b11000011
+    gpu.updateTile(0x20)
+    gpu.updateTile(0x21)
+    assert gpu._tileset[2].sum() == 0
+
+    assert gpu.tileset[2, 0].tolist() == [3, 2, 1, 0, 0, 1, 2, 3]
+    assert not gpu._tilesdirty
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tile_decode_matches_bitwise(seed):
+    gpu, _ = random_gpu(seed)
+    vram = gpu.VRAM
+    for tile in range(384):
+        for y in range(8):
+            lo = vram[tile * 16 + y * 2]
+            hi = vram[tile * 16 + y * 2 + 1]
+            row = [((lo >> b) & 1) | ((hi >> b) & 1) << 1 for b in range(7, -1, -1)]
+            assert gpu.tileset[tile, y].tolist() == row
+
+
+def test_mode_timing():
+    """Mode changes land on 80/172/204 T-cycle boundaries, V-Blank at line 144."""
+    gpu = GPU(headless=True)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(19)
+    assert (gpu._mode, gpu._line) == (2, 0)
+    gpu.step(1)
+    assert gpu._mode == 3
+    gpu.step(43)
+    assert gpu._mode == 0
+    gpu.step(51)
+    assert (gpu._mode, gpu._line) == (2, 1)
+    gpu.step(114 * 143)
+    assert (gpu._mode, gpu._line) == (1, 144)
+    gpu.step(114 * 10)
+    assert (gpu._mode, gpu._line) == (2, 0)
+
+
+def test_lcd_off_freezes_state_machine():
+    gpu = GPU(headless=True)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(114 * 3 + 30)
+    assert (gpu._mode, gpu._line) == (3, 3)
+    gpu.wb(0xFF40, 0x00)
+    gpu.step(1000)
+    assert (gpu._mode, gpu._line) == (3, 3)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(32)
+    assert gpu._mode == 3
+    gpu.step(1)
+    assert gpu._mode == 0
+
+
+def test_stat():
+    gpu = GPU(headless=True)
+    gpu.wb(0xFF41, 0xFF)
+    gpu.wb(0xFF45, 2)
+    assert gpu.rb(0xFF41) == 0xF8
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(114 * 2 + 25)
+    assert gpu.rb(0xFF44) == 2
+    assert gpu.rb(0xFF45) == 2
+    assert gpu.rb(0xFF41) == 0xF8 | 0x04 | 3
+
+
+def test_vblank_requests_interrupt():
+    gpu = GPU(headless=True)
+    requests = []
+    gpu.setInterruptRequest(requests.append)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(114 * 144 - 1)
+    assert requests == []
+    gpu.step(1)
+    assert requests == [0x01]
+    gpu.step(17556)
+    assert requests == [0x01, 0x01]
+
+
+@pytest.mark.parametrize("bgp", [0x00, 0x1B, 0xE4, 0xFF, 0x93])
+def test_bgp_round_trips_and_unpacks(bgp):
+    gpu = GPU(headless=True)
+    gpu.wb(0xFF47, bgp)
+    assert gpu.rb(0xFF47) == bgp
+    assert list(gpu._bgpal) == [(bgp >> shift) & 3 for shift in (0, 2, 4, 6)]
+
+
+@pytest.mark.parametrize(
+    "select, count",
+    [(0x08, 144), (0x10, 1), (0x20, 144), (0x40, 1), (0x48, 145), (0x00, 0)],
+)
+def test_stat_interrupt_sources(select, count):
+    """Each selected STAT source requests the interrupt once per frame."""
+    gpu = GPU(headless=True)
+    requests = []
+    gpu.setInterruptRequest(requests.append)
+    gpu.wb(0xFF41, select)
+    gpu.wb(0xFF45, 10)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(17556)
+    assert requests.count(0x02) == count
+
+
+def test_lyc_interrupt_on_its_line():
+    gpu = GPU(headless=True)
+    requests = []
+    gpu.setInterruptRequest(requests.append)
+    gpu.wb(0xFF41, 0x40)
+    gpu.wb(0xFF45, 10)
+    gpu.wb(0xFF40, 0x80)
+    gpu.step(114 * 10 - 1)
+    assert requests == []
+    gpu.step(1)
+    assert requests == [0x02]
+    assert gpu.rb(0xFF44) == 10
@@ -0,0 +1,94 @@
+import pytest
+
+from gbemu.Idle import loopCycles
+
+
+def cycles_of(code, start=0x100):
+    """loopCycles of code placed at start, closed by its last instruction."""
+    mem = dict(enumerate(code, start))
+    return loopCycles(mem.__getitem__, start, start + len(code) - 2)
+
+
+@pytest.mark.parametrize(
+    "code, cycles",
+    [
+        ([0xF0, 0x44, 0xFE, 0x90, 0x20, 0xFA], 7),  # LDH A,(44); CP 90; JR NZ
+        ([0x18, 0xFE], 2),  # JR -2
+        ([0xFA, 0x00, 0xC0, 0xA7, 0x28, 0xFA], 7),  # LD A,(C000); AND A; JR Z
+        ([0xF0, 0x41, 0xCB, 0x4F, 0x20, 0xFA], 7),  # LDH A,(41); BIT 1,A; JR NZ
+        # An exit taken on this pass's flags
+        ([0xF0, 0x44, 0xFE, 0x90, 0x28, 0x10, 0x18, 0xF8], 9),
+        ([0x05, 0x20, 0xFD], 0),  # DEC B; JR NZ
+        ([0xF0, 0x04, 0xA7, 0x20, 0xFB], 0),  # reads DIV
+        ([0xF0, 0x05, 0xA7, 0x20, 0xFB], 0),  # reads TIMA
+        ([0xFE, 0x90, 0xF0, 0x44, 0x20, 0xFA], 0),  # uses A before loading it
+        ([0xF0, 0x44, 0xE0, 0x80, 0x20, 0xFA], 0),  # writes memory
+        ([0x28, 0x04, 0xF0, 0x44, 0xA7, 0x18, 0xF9], 0),  # exits on stale flags
+        ([0xF0, 0x44, 0xA7, 0x28, 0x00, 0x18, 0xF9], 0),  # branches inside
+    ],
+)
+def test_loop_cycles(code, cycles):
+    assert cycles_of(code) == cycles
+
+
+# Wait for line 0x90, then do it again forever
+WAIT = [0xF0, 0x44, 0xFE, 0x90, 0x20, 0xFA, 0x18, 0xF8]
+
+
+@pytest.fixture
+def wait_emulator(program_emulator):
+    """Factory for emulators running WAIT with the LCD on."""
+
+    def make(backend, idle_skip):
+        emulator = program_emulator(backend, WAIT, idle_skip=idle_skip)
+        emulator._mmu.wb(0xFF40, 0x91)
+        return emulator
+
+    return make
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_fast_forward_matches_running(backend, wait_emulator):
+    """Skipped passes leave clock, registers and GPU exactly as running them."""
+    slow = wait_emulator(backend, idle_skip=False)
+    fast = wait_emulator(backend, idle_skip=True)
+    for n in [1, 7, 100, 333, 5000, 17556, 40000]:
+        stats = slow.run_cycles(n)
+        assert stats.skipped == 0
+        fast.run_cycles(n)
+        assert fast._cpu._clock == slow._cpu._clock
+        assert bytes(fast._cpu._r) == bytes(slow._cpu._r)
+        assert (fast._gpu._line, fast._gpu._mode) == (slow._gpu._line, slow._gpu._mode)
+    assert fast.skippedCycles > 0
+    assert slow.skippedCycles == 0
+
+
+def test_run_stats_report_skipped_cycles(wait_emulator):
+    emulator = wait_emulator("jit", idle_skip=True)
+    stats = emulator.run_frames(2)
+    assert 0 < stats.skipped < stats.cycles
+    assert emulator.skippedCycles == stats.skipped
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_skip_never_moves_clock_back(backend, monkeypatch, wait_emulator):
+    """A pass ending past the next event skips nothing rather than rewinding."""
+    emulator = wait_emulator(backend, idle_skip=True)
+    idle = emulator._idle
+    skip = idle.skip
+    results = []
+
+    def checked(key, cycles, clock):
+        skipped = skip(key, cycles, clock)
+        results.append((clock, skipped))
+        return skipped
+
+    monkeypatch.setattr(idle, "skip", checked)
+    if emulator._jit is not None:
+        # Translated blocks bind skip when they're built
+        emulator._jit.reset()
+    emulator.run_frames(20)
+    assert results
+    assert all(skipped >= 0 for _, skipped in results)
+    clocks = [clock + skipped for clock, skipped in results]
+    assert clocks == sorted(clocks)
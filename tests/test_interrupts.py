@@ -0,0 +1,179 @@
+import pytest
+
+from gbemu import GBEmu
+from gbemu.Interrupts import JOYPAD, STAT, TIMER, VBLANK, Interrupts
+from gbemu.registers import PC, SP, A, B, C
+
+
+def test_acknowledge_takes_highest_priority():
+    interrupts = Interrupts()
+    interrupts.flags = 0xFF
+    interrupts.enable = STAT | TIMER | JOYPAD
+    assert interrupts.flags == 0x1F
+    assert interrupts.acknowledge() == 0x48
+    assert interrupts.flags == 0x1F & ~STAT
+    assert interrupts.acknowledge() == 0x50
+    assert interrupts.acknowledge() == 0x60
+    assert interrupts.pending == 0
+    assert interrupts.flags == VBLANK | 0x08
+
+
+def test_cpu_interrupt_pushes_pc():
+    emulator = GBEmu(headless=True)
+    cpu = emulator._cpu
+    cpu._rr[SP] = 0xFFFE
+    cpu._rr[PC] = 0x1234
+    cpu._ime = True
+    cpu._halt = True
+    clock = cpu._clock
+    cpu.interrupt(0x50)
+    assert cpu._rr[PC] == 0x50
+    assert cpu._rr[SP] == 0xFFFC
+    assert emulator._mmu.rw(0xFFFC) == 0x1234
+    assert not cpu._ime and not cpu._halt
+    assert cpu._clock == clock + 5
+
+
+# fmt: off
+VBLANK_COUNTER = [
+    0x3E, 0x01,  # LD A,0x01
+    0xE0, 0xFF,  # LDH (FF),A    IE = V-Blank
+    0x3E, 0x91,  # LD A,0x91
+    0xE0, 0x40,  # LDH (40),A    LCD on
+    0xFB,        # EI
+    0x18, 0xFE,  # JR -2
+]
+# fmt: on
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+@pytest.mark.parametrize("halt", [False, True])
+def test_vblank_handler_runs_once_per_frame(backend, halt, program_emulator):
+    program = list(VBLANK_COUNTER)
+    if halt:
+        program[-2:] = [0x76, 0x18, 0xFD]  # HALT; JR -3
+    emulator = program_emulator(backend, program, [0x0C, 0xD9])  # INC C; RETI
+    cpu = emulator._cpu
+    emulator.run_frames(10)
+    assert cpu._r[C] == 10
+    assert cpu._rr[SP] == 0xFFFE
+    assert emulator._mmu.interrupts.flags & VBLANK == 0
+
+
+# The handler stores B where the test can see it and leaves IME off
+STORE_B = [0x78, 0xEA, 0x00, 0xC0, 0xC9]  # LD A,B; LD (C000),A; RET
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_ei_takes_effect_after_next_instruction(backend, program_emulator):
+    # IE and IF already set: EI; INC B; INC B; JR -2
+    program = [0xFB, 0x04, 0x04, 0x18, 0xFE]
+    emulator = program_emulator(backend, program, STORE_B)
+    mmu = emulator._mmu
+    mmu.wb(0xFFFF, VBLANK)
+    mmu.wb(0xFF0F, VBLANK)
+    mmu.wb(0xC000, 0xFF)
+    emulator.run_cycles(100)
+    assert mmu.rb(0xC000) == 1
+    assert emulator._cpu._r[B] == 2
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_ei_di_takes_nothing(backend, program_emulator):
+    program = [0xFB, 0xF3, 0x04, 0x18, 0xFE]  # EI; DI; INC B; JR -2
+    emulator = program_emulator(backend, program, STORE_B)
+    mmu = emulator._mmu
+    mmu.wb(0xFFFF, VBLANK)
+    mmu.wb(0xFF0F, VBLANK)
+    emulator.run_cycles(100)
+    assert mmu.rb(0xC000) == 0
+    assert mmu.interrupts.pending == VBLANK
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+@pytest.mark.parametrize(
+    "store",
+    [
+        [0xE0, 0xFF],  # LDH (FF),A
+        [0x0E, 0xFF, 0xE2],  # LD C,0xFF; LD (C),A
+    ],
+)
+def test_ie_write_is_noticed_at_once(backend, store, program_emulator):
+    # fmt: off
+    program = [
+        0xFB,        # EI
+        0x00,        # NOP
+        0x3E, 0x01,  # LD A,0x01
+    ] + store + [    # IE = V-Blank, already requested
+        0x06, 0x07,  # LD B,7
+        0x18, 0xFE,  # JR -2
+    ]
+    # fmt: on
+    emulator = program_emulator(backend, program, STORE_B)
+    mmu = emulator._mmu
+    mmu.wb(0xFF0F, VBLANK)
+    emulator.run_cycles(100)
+    # Taken before LD B,7
+    assert mmu.rb(0xC000) == 0
+    assert emulator._cpu._r[B] == 7
+    assert emulator._cpu._rr[PC] == 0x104 + len(store) + 2
+    assert emulator._cpu._r[A] == 0
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_halt_without_ime_resumes_without_dispatch(backend, program_emulator):
+    program = [0x3E, 0x91, 0xE0, 0x40, 0x76, 0x04, 0x18, 0xFE]
+    emulator = program_emulator(backend, program, [0x0C, 0xD9])
+    emulator._mmu.wb(0xFFFF, VBLANK)
+    emulator.run_frames(2)
+    cpu = emulator._cpu
+    assert cpu._r[B] == 1
+    assert cpu._r[C] == 0
+    assert not cpu._ime
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_lyc_match_requests_and_wakes_on_stat(backend, program_emulator):
+    # fmt: off
+    program = [
+        0x3E, 0x02,  # LD A,0x02
+        0xE0, 0xFF,  # LDH (FF),A    IE = STAT
+        0x3E, 0x48,  # LD A,0x48
+        0xE0, 0x41,  # LDH (41),A    STAT: LY=LYC and H-Blank sources
+        0x3E, 0x0A,  # LD A,10
+        0xE0, 0x45,  # LDH (45),A    LYC = 10
+        0x3E, 0x91,  # LD A,0x91
+        0xE0, 0x40,  # LDH (40),A    LCD on
+        0x76,        # HALT
+        0x04,        # INC B
+        0x18, 0xFE,  # JR -2
+    ]
+    # fmt: on
+    emulator = program_emulator(backend, program)
+    emulator.run_frames(2)
+    cpu = emulator._cpu
+    mmu = emulator._mmu
+    assert cpu._r[B] == 1
+    assert mmu.rb(0xFF0F) & STAT
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_stat_handler_runs_on_lyc_line(backend, program_emulator):
+    # fmt: off
+    program = [
+        0x3E, 0x02,  # LD A,0x02
+        0xE0, 0xFF,  # LDH (FF),A    IE = STAT
+        0x3E, 0x40,  # LD A,0x40
+        0xE0, 0x41,  # LDH (41),A    STAT: LY=LYC source
+        0x3E, 0x0A,  # LD A,10
+        0xE0, 0x45,  # LDH (45),A    LYC = 10
+        0x3E, 0x91,  # LD A,0x91
+        0xE0, 0x40,  # LDH (40),A    LCD on
+        0xFB,        # EI
+        0x18, 0xFE,  # JR -2
+    ]
+    # fmt: on
+    # INC C; RETI at the STAT vector
+    emulator = program_emulator(backend, program, [0x0C, 0xD9], vector=0x48)
+    emulator.run_frames(3)
+    assert emulator._cpu._r[C] == 3
@@ -0,0 +1,208 @@
+import random
+
+import pytest
+import test_arithmetic
+import test_logic
+from helpers import CPUStateValidator, InstructionTestCase, Register, RegisterValue
+
+from gbemu import JIT as jit_module
+from gbemu import registers as regs
+from gbemu.JIT import ALU_OPS, INC_DEC_OPS, JIT
+from gbemu.Z80 import Z80
+
+
+def make_cpu(program, base=0x0150):
+    """Return a CPU with program loaded in ROM at base and PC pointing at it."""
+    rom = bytearray(0x8000)
+    rom[base : base + len(program)] = bytes(program)
+    cpu = Z80()
+    cpu.Reset()
+    cpu.MMU.loadROM(rom)
+    cpu.MMU.biosf = False
+    cpu._rr[regs.PC] = base
+    cpu._rr[regs.SP] = 0xDFF0
+    cpu._rr[regs.HL] = 0xC100
+    return cpu
+
+
+def snapshot(cpu):
+    return (bytes(cpu._r), cpu._clock, bytes(cpu.MMU._memory[0xC000:0xE000]))
+
+
+def run_both(program, blocks=200, lazy_flags=False):
+    """Run program under the JIT and the interpreter; compare at block ends."""
+    interp = make_cpu(program)
+    jitted = make_cpu(program)
+    jit = JIT(jitted, lazy_flags=lazy_flags)
+    for _ in range(blocks):
+        jit.cycle()
+        while interp._clock < jitted._clock:
+            interp.cycle()
+        assert snapshot(interp) == snapshot(jitted)
+
+
+# Opcodes that keep HL and SP pointing into WRAM, so random sequences stay
+# away from I/O
+SAFE_REGS = [0, 1, 2, 3, 7]  # B, C, D, E, A
+SAFE_OPS = (
+    [0x00, 0x07, 0x0F, 0x17, 0x1F, 0x27, 0x2F, 0x37, 0x3F]
+    + [0x40 | d << 3 | s for d in SAFE_REGS for s in SAFE_REGS + [6]]
+    + [0x70 | s for s in SAFE_REGS]
+    + [0x80 | op << 3 | s for op in range(8) for s in SAFE_REGS + [6]]
+    + [0x04 | d << 3 for d in SAFE_REGS]
+    + [0x05 | d << 3 for d in SAFE_REGS]
+    + [0x03, 0x13, 0x0B, 0x1B, 0x09, 0x19]
+)
+
+
+def random_program(rng, length=120):
+    program = []
+    while len(program) < length:
+        kind = rng.random()
+        if kind < 0.7:
+            program.append(rng.choice(SAFE_OPS))
+        elif kind < 0.8:
+            program += [rng.choice([0x06, 0x0E, 0x16, 0x1E, 0x3E]), rng.randrange(256)]
+        elif kind < 0.85:
+            program += [rng.choice([0xC6, 0xCE, 0xD6, 0xDE, 0xE6, 0xEE, 0xF6, 0xFE])]
+            program.append(rng.randrange(256))
+        elif kind < 0.9:
+            reg = rng.choice(SAFE_REGS + [6])
+            program += [0xCB, rng.randrange(32) << 3 | reg]
+        elif kind < 0.95:
+            pair = rng.choice([0xC5, 0xD5, 0xF5])
+            program += [pair, pair - 4]  # PUSH rr / POP rr
+        else:
+            # Short conditional forward jump over one NOP
+            program += [rng.choice([0x20, 0x28, 0x30, 0x38]), 0x01, 0x00]
+    # Reset HL and loop back to the start
+    return program + [0x21, 0x00, 0xC1, 0xC3, 0x50, 0x01]
+
+
+@pytest.mark.parametrize("lazy_flags", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_jit_matches_interpreter(seed, lazy_flags):
+    """Translated blocks leave registers, WRAM and clock as the interpreter does."""
+    run_both(random_program(random.Random(seed)), lazy_flags=lazy_flags)
+
+
+def alu_cases():
+    for module in (test_arithmetic, test_logic):
+        for value in vars(module).values():
+            if isinstance(value, list):
+                for case in value:
+                    if not isinstance(case, InstructionTestCase):
+                        continue
+                    if case.opcode in ALU_OPS or case.opcode in INC_DEC_OPS:
+                        yield case
+
+
+@pytest.mark.parametrize("test_case", list(alu_cases()), ids=lambda case: case.name)
+def test_inlined_alu_matches_instruction_cases(cpu, monkeypatch, test_case):
+    """Inlined ALU ops (lazy flags on) pass the interpreter's instruction cases."""
+    monkeypatch.setattr(jit_module, "MAX_BLOCK", 1)
+    CPUStateValidator.setup_state(cpu, test_case.setup)
+    pcs = [
+        item.value
+        for item in test_case.setup
+        if isinstance(item, RegisterValue) and item.register == Register.PC
+    ]
+    if test_case.opcode >= 0xC0:
+        # Immediate forms: the case points PC at the operand
+        addr = pcs[0] - 1
+    else:
+        addr = pcs[0] if pcs else 0xD000
+    cpu._mem.wb(addr, test_case.opcode)
+    cpu._rr[regs.PC] = addr
+
+    JIT(cpu, lazy_flags=True).cycle()
+
+    CPUStateValidator.assert_state(cpu, test_case)
+    assert cpu._m == test_case.cycles
+
+
+def test_lazy_flags_liveness():
+    """Only flags that can be read before being overwritten are computed."""
+    jit = JIT(Z80(), lazy_flags=True)
+    live = jit._JIT__liveFlags
+    block = [0x80, 0x91, 0xAF, 0xFE, 0xA3]  # ADD, SUB, XOR A, CP n, AND
+    decoded = [(op, 0, [0x10] if op == 0xFE else []) for op in block]
+    assert live(decoded) == [False, False, False, False, True]
+    # ADC consumes the carry of the op before it
+    decoded = [(0x80, 0, []), (0x88, 0, []), (0xB0, 0, [])]
+    assert live(decoded) == [True, False, True]
+    # Loads and RES/SET leave F alone, handlers may read it
+    decoded = [(0x80, 0, []), (0x7E, 0, []), (0xCB, 0, [0x87]), (0xB0, 0, [])]
+    assert live(decoded) == [False, True, True, True]
+    decoded = [(0x80, 0, []), (0x27, 0, []), (0xB0, 0, [])]  # DAA
+    assert live(decoded)[0]
+    assert JIT(Z80())._JIT__liveFlags(decoded[:1]) == [True]
+
+
+def test_jit_loop_with_calls():
+    """Loads, LDI, CALL/RET and PUSH/POP across block boundaries."""
+    # fmt: off
+    program = [
+        0x06, 0x00,  # LD B,0
+        0x7E,  # LD A,[HL]
+        0x80,  # ADD A,B
+        0x22,  # LDI [HL],A
+        0x04,  # INC B
+        0x20, 0xF9,  # JR NZ,-7
+        0xCD, 0x60, 0x01,  # CALL 0x0160
+        0xC3, 0x50, 0x01,  # JP 0x0150
+        0x00, 0x00,
+        0xC5, 0xE1, 0x2A, 0x12, 0xC9,  # PUSH BC; POP HL; LDI A,[HL]; LD [DE],A; RET
+    ]
+    # fmt: on
+    run_both(program, blocks=2000)
+
+
+def test_ram_block_invalidated_on_write(cpu):
+    """Writing over a translated WRAM block retranslates it."""
+    cpu.MMU.biosf = False
+    for addr, byte in enumerate([0x3E, 0x01, 0x18, 0xFC]):  # LD A,1; JR -4
+        cpu.MMU.wb(0xC000 + addr, byte)
+    cpu._rr[regs.PC] = 0xC000
+    jit = JIT(cpu)
+
+    jit.cycle()
+    assert cpu._r[regs.A] == 0x01
+    assert cpu._rr[regs.PC] == 0xC000
+
+    cpu.MMU.wb(0xC001, 0x02)
+    jit.cycle()
+    assert cpu._r[regs.A] == 0x02
+
+    # Echo RAM writes hit the same bytes
+    cpu.MMU.wb(0xE001, 0x03)
+    jit.cycle()
+    assert cpu._r[regs.A] == 0x03
+
+
+def test_hram_block_invalidated_by_word_write(cpu):
+    """16-bit writes (PUSH, CALL, ww) over an HRAM block retranslate it."""
+    cpu.MMU.biosf = False
+    for addr, byte in enumerate([0x3E, 0x11, 0x18, 0xFC]):  # LD A,0x11; JR -4
+        cpu.MMU.wb(0xFF90 + addr, byte)
+    cpu._rr[regs.PC] = 0xFF90
+    jit = JIT(cpu)
+
+    jit.cycle()
+    assert cpu._r[regs.A] == 0x11
+
+    cpu.MMU.ww(0xFF90, 0x223E)  # LD A,0x22
+    jit.cycle()
+    assert cpu._r[regs.A] == 0x22
+
+
+def test_untranslatable_pc_falls_back(cpu):
+    """Code outside ROM/WRAM/HRAM runs through the interpreter."""
+    cpu.MMU.biosf = False
+    cpu.MMU.wb(0xA000, 0x3C)  # INC A in external RAM
+    cpu._rr[regs.PC] = 0xA000
+    jit = JIT(cpu)
+    jit.cycle()
+    assert cpu._r[regs.A] == 0x01
+    assert cpu._rr[regs.PC] == 0xA001
+    assert jit._blocks[0xA000] is None
@@ -0,0 +1,64 @@
+import pytest
+
+from gbemu.Interrupts import JOYPAD
+from gbemu.Joypad import Joypad, buttons, readScript
+from gbemu.Scheduler import Scheduler
+
+
+def make_joypad():
+    sched = Scheduler()
+    requests = []
+    joypad = Joypad(sched, requests.append)
+    read, write = joypad.ioHandlers()[0xFF00]
+    return sched, requests, joypad, read, write
+
+
+def test_p1_reads_selected_lines():
+    sched, requests, joypad, read, write = make_joypad()
+    assert read(0xFF00) == 0xFF
+    joypad.inject(0, buttons("a", "start", "left"))
+    sched.run(0)
+    write(0xFF00, 0x10)  # buttons
+    assert read(0xFF00) == 0xD0 | 0x06
+    write(0xFF00, 0x20)  # directions
+    assert read(0xFF00) == 0xE0 | 0x0D
+    write(0xFF00, 0x00)
+    assert read(0xFF00) == 0xC0 | 0x04
+    write(0xFF00, 0x30)
+    assert read(0xFF00) == 0xFF
+
+
+def test_input_applies_at_its_cycle():
+    sched, requests, joypad, read, write = make_joypad()
+    write(0xFF00, 0x20)
+    joypad.inject(1000, buttons("down"))
+    sched.run(999)
+    assert read(0xFF00) & 0x0F == 0x0F
+    assert requests == []
+    sched.run(1000)
+    assert read(0xFF00) & 0x0F == 0x07
+    assert requests == [JOYPAD]
+
+
+def test_interrupt_only_on_selected_press():
+    sched, requests, joypad, read, write = make_joypad()
+    write(0xFF00, 0x10)  # buttons only
+    joypad.inject(10, buttons("up"))
+    joypad.inject(20, buttons("up", "b"))
+    joypad.inject(30, 0)
+    sched.run(30)
+    assert requests == [JOYPAD]
+    assert joypad.state == 0
+
+
+def test_read_script(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("# boot\n\n35112 start  # title screen\n0x11250 A Up\n70224\n")
+    assert readScript(str(path)) == [
+        (35112, buttons("start")),
+        (0x11250, buttons("a", "up")),
+        (70224, 0),
+    ]
+    path.write_text("100 turbo\n")
+    with pytest.raises(ValueError, match="input.txt:1"):
+        readScript(str(path))
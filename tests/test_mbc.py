@@ -0,0 +1,180 @@
+import pytest
+
+from gbemu import GBEmu
+from gbemu.MBC import MBC1, MBC3, MBC5, controllerFor
+from gbemu.MMU import MMU
+from gbemu.registers import PC, SP, B, C
+
+
+def cartridge(kind, banks, ram=0x00):
+    """A ROM image whose every bank starts with its own number."""
+    rom = bytearray(banks * 0x4000)
+    for bank in range(banks):
+        rom[bank * 0x4000] = bank & 0xFF
+        rom[bank * 0x4000 + 1] = bank >> 8
+    rom[0x147] = kind
+    rom[0x149] = ram
+    return bytes(rom)
+
+
+def loaded(kind, banks, ram=0x00):
+    mmu = MMU()
+    mmu.biosf = False
+    mmu.loadROM(cartridge(kind, banks, ram))
+    return mmu
+
+
+def bank_at(mmu, addr):
+    return mmu.rb(addr) | mmu.rb(addr + 1) << 8
+
+
+@pytest.mark.parametrize(
+    "kind, controller", [(0x00, None), (0x01, MBC1), (0x13, MBC3), (0x1B, MBC5)]
+)
+def test_controller_from_header(kind, controller):
+    mmu = loaded(kind, 4)
+    if controller is None:
+        assert type(mmu._mbc).__name__ == "MBC"
+    else:
+        assert type(mmu._mbc) is controller
+    assert controllerFor(b"") is controllerFor(cartridge(0x00, 2))
+
+
+def test_mbc1_rom_banks():
+    mmu = loaded(0x01, 128)
+    assert bank_at(mmu, 0x4000) == 1
+    mmu.wb(0x2000, 0x05)
+    assert bank_at(mmu, 0x4000) == 5
+    # Bank 0 can't be selected at 0x4000
+    mmu.wb(0x2000, 0x00)
+    assert bank_at(mmu, 0x4000) == 1
+    # Upper bits from 0x4000 - 0x5FFF
+    mmu.wb(0x2000, 0x03)
+    mmu.wb(0x4000, 0x02)
+    assert bank_at(mmu, 0x4000) == 0x43
+    assert bank_at(mmu, 0x0000) == 0
+    # Mode 1 banks 0x0000 - 0x3FFF with the upper bits too
+    mmu.wb(0x6000, 0x01)
+    assert bank_at(mmu, 0x0000) == 0x40
+
+
+def test_mbc1_ram_banks():
+    mmu = loaded(0x03, 4, ram=0x03)
+    assert mmu.rb(0xA000) == 0xFF
+    mmu.wb(0xA000, 0x12)
+    mmu.wb(0x0000, 0x0A)
+    assert mmu.rb(0xA000) == 0x00
+    mmu.wb(0xA000, 0x12)
+    mmu.wb(0x6000, 0x01)
+    mmu.wb(0x4000, 0x02)
+    mmu.wb(0xA000, 0x34)
+    mmu.wb(0x4000, 0x00)
+    assert mmu.rb(0xA000) == 0x12
+    mmu.wb(0x4000, 0x02)
+    assert mmu.rb(0xA000) == 0x34
+    # Disabled RAM reads open bus and keeps its contents
+    mmu.wb(0x0000, 0x00)
+    assert mmu.rb(0xA000) == 0xFF
+    mmu.wb(0x0000, 0x0A)
+    assert mmu.rb(0xA000) == 0x34
+
+
+def test_mbc3_ram_and_clock_registers():
+    mmu = loaded(0x13, 128, ram=0x03)
+    mmu.wb(0x2000, 0x7F)
+    assert bank_at(mmu, 0x4000) == 0x7F
+    mmu.wb(0x0000, 0x0A)
+    mmu.wb(0x4000, 0x03)
+    mmu.wb(0xBFFF, 0x56)
+    mmu.wb(0x4000, 0x08)
+    mmu.wb(0xA000, 0x2A)
+    assert mmu.rb(0xB000) == 0x2A
+    mmu.wb(0x6000, 0x00)
+    mmu.wb(0x6000, 0x01)
+    assert mmu.rb(0xA000) == 0x2A
+    mmu.wb(0x4000, 0x03)
+    assert mmu.rb(0xBFFF) == 0x56
+
+
+def test_mbc5_nine_bit_bank():
+    mmu = loaded(0x19, 512)
+    mmu.wb(0x2000, 0x00)
+    assert bank_at(mmu, 0x4000) == 0
+    mmu.wb(0x2000, 0x34)
+    mmu.wb(0x3000, 0x01)
+    assert bank_at(mmu, 0x4000) == 0x134
+    mmu.wb(0x3000, 0x00)
+    assert bank_at(mmu, 0x4000) == 0x34
+
+
+def test_bank_number_wraps_to_rom_size():
+    mmu = loaded(0x19, 8)
+    mmu.wb(0x2000, 0x0B)
+    assert bank_at(mmu, 0x4000) == 3
+
+
+def test_switch_maps_views_without_copying():
+    rom = bytearray(cartridge(0x19, 4))
+    mmu = MMU()
+    mmu.loadROM(rom)
+    mmu.wb(0x2000, 0x02)
+    page = mmu._rpage[0x40]
+    assert page.obj is rom
+    mmu.wb(0x2000, 0x03)
+    mmu.wb(0x2000, 0x02)
+    assert mmu._rpage[0x40] is page
+    # The image is mapped in place
+    rom[0x8000] = 0xEE
+    assert mmu.rb(0x4000) == 0xEE
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_code_follows_bank_switch(backend):
+    """The same address runs each bank's own code."""
+    rom = bytearray(cartridge(0x19, 4))
+    # Bank 0: switch to bank 2, call 0x4000, switch to bank 3, call it again
+    code = [0x3E, 0x02, 0xEA, 0x00, 0x20, 0xCD, 0x00, 0x40]
+    code += [0x3E, 0x03, 0xEA, 0x00, 0x20, 0xCD, 0x00, 0x40, 0x76]
+    rom[0x0150 : 0x0150 + len(code)] = bytes(code)
+    # Bank n: LD B,n (or C); RET
+    rom[2 * 0x4000 : 2 * 0x4000 + 3] = bytes([0x06, 0x22, 0xC9])
+    rom[3 * 0x4000 : 3 * 0x4000 + 3] = bytes([0x0E, 0x33, 0xC9])
+    emu = GBEmu(backend=backend, headless=True)
+    emu._mmu.loadROM(bytes(rom))
+    emu._mmu.biosf = False
+    cpu = emu._cpu
+    cpu._rr[PC] = 0x0150
+    cpu._rr[SP] = 0xFFFE
+    emu.run_cycles(200)
+    assert cpu._r[B] == 0x22 and cpu._r[C] == 0x33
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_switch_from_switched_bank(backend):
+    """Code in the switched bank that switches it away runs the new bank."""
+    rom = bytearray(cartridge(0x01, 4))
+    rom[0x0150:0x0153] = bytes([0xC3, 0x00, 0x40])  # JP 0x4000
+    # Bank 1: LD HL,0x2000; LD A,2; LD (HL),A, then LD B,0x11
+    switch = [0x21, 0x00, 0x20, 0x3E, 0x02, 0x77, 0x06, 0x11, 0x76]
+    rom[0x4000 : 0x4000 + len(switch)] = bytes(switch)
+    # Bank 2 continues at 0x4006 with LD B,0x22
+    rom[0x8006:0x8009] = bytes([0x06, 0x22, 0x76])
+    emu = GBEmu(backend=backend, headless=True)
+    emu.loadROM(bytes(rom))
+    emu._mmu.biosf = False
+    cpu = emu._cpu
+    cpu._rr[PC] = 0x0150
+    emu.run_cycles(100)
+    assert cpu._r[B] == 0x22
+
+
+def test_rom_setters_patch_read_only_image():
+    mmu = loaded(0x19, 4)
+    mmu.wb(0x2000, 0x02)
+    mmu.setROMB([0xAB, 0xCD])
+    mmu.setROM0([0x12])
+    assert bank_at(mmu, 0x4000) == 0xCDAB
+    assert mmu.rb(0x0000) == 0x12
+    # Other banks are untouched
+    mmu.wb(0x2000, 0x03)
+    assert bank_at(mmu, 0x4000) == 3
@@ -1,4 +1,5 @@
 import pytest
+from gbemu import registers as regs
 from helpers import (
     Register, Flag,
     RegisterValue, MemoryValue, FlagValue,
@@ -12,10 +13,10 @@ MISCELLANEOUS_OPERATIONS_CASES = [
         opcode=0x10,
         setup=[
             RegisterValue(Register.PC, 0xC000),  # Set PC to a test location
-            MemoryValue(0xC001, 0x00),  # STOP requires 0x00 as next byte
+            MemoryValue(0xC000, 0x00),  # STOP requires 0x00 as next byte
         ],
         expected=[
-            RegisterValue(Register.PC, 0xC002),  # PC should advance past both bytes
+            RegisterValue(Register.PC, 0xC001),  # PC should advance past the 0x00
             FlagValue(Flag.STOP, True),  # STOP flag should be set
         ],
         description="STOP instruction halts CPU until button press",
@@ -889,7 +890,7 @@ def test_carry_flag_ops(cpu, test_case):
 # --- STOP with invalid second byte (covers line 1610) ---
 def test_stop_invalid_byte(cpu):
     """Test STOP (0x10) with non-zero second byte treats as NOP."""
-    cpu._PC.value = 0xC000
+    cpu._rr[regs.PC] = 0xC000
     cpu._mem.wb(0xC000, 0x42)  # Invalid: second byte should be 0x00
     CPUStateValidator.execute_instruction(cpu, 0x10)
     assert cpu._m == 1, "STOP with invalid byte should take 1 cycle (NOP)"
@@ -0,0 +1,144 @@
+import pytest
+
+from gbemu import GPU
+from gbemu.MMU import DMA_CYCLES, MMU
+from gbemu.Scheduler import Scheduler
+
+
+@pytest.fixture
+def mmu():
+    return MMU()
+
+
+def test_echo_ram_aliases_wram(mmu):
+    """Echo RAM reads and writes land in the mirrored WRAM bytes."""
+    mmu.wb(0xC123, 0x42)
+    assert mmu.rb(0xE123) == 0x42
+    mmu.wb(0xFDFF, 0x99)
+    assert mmu.rb(0xDDFF) == 0x99
+
+
+def test_bios_overlay_unmaps(mmu):
+    """Page 0 serves the BIOS until biosf is cleared, then the cartridge."""
+    rom = [0xAA] * 0x8000
+    mmu.loadROM(rom)
+    assert mmu.rb(0x0000) == 0x31
+    assert mmu.rb(0x0100) == 0xAA
+    mmu.biosf = False
+    assert mmu.rb(0x0000) == 0xAA
+
+
+def test_bios_unmapped_by_ff50_write(mmu):
+    mmu.loadROM([0xAA] * 0x8000)
+    mmu.wb(0xFF50, 0x00)
+    assert mmu.biosf
+    mmu.wb(0xFF50, 0x01)
+    assert not mmu.biosf
+    assert mmu.rb(0x0000) == 0xAA
+
+
+def test_rom_is_read_only(mmu):
+    mmu.loadROM([0x11] * 0x8000)
+    mmu.wb(0x0150, 0x00)
+    mmu.wb(0x4150, 0x00)
+    assert mmu.rb(0x0150) == 0x11
+    assert mmu.rb(0x4150) == 0x11
+
+
+@pytest.mark.parametrize(
+    "addr", [0xA000, 0xC000, 0xC0FF, 0xCFFF, 0xE000, 0xFE00, 0xFF80, 0xFFFD]
+)
+def test_word_access_round_trip(mmu, addr):
+    mmu.ww(addr, 0xBEEF)
+    assert mmu.rw(addr) == 0xBEEF
+    assert mmu.rb(addr) == 0xEF
+    assert mmu.rb(addr + 1) == 0xBE
+
+
+def test_word_access_across_regions(mmu):
+    """Words straddling two regions still reach each byte's own handler."""
+    # HRAM into IE
+    mmu.ww(0xFFFE, 0x1F42)
+    assert mmu.rb(0xFFFE) == 0x42
+    assert mmu.interrupts.enable == 0x1F
+    assert mmu.rw(0xFFFE) == 0x1F42
+    # Cartridge RAM into WRAM
+    mmu.ww(0xBFFF, 0x1234)
+    assert mmu.rb(0xBFFF) == 0x34 and mmu.rb(0xC000) == 0x12
+    # Plain I/O storage into IF
+    mmu.ww(0xFF0E, 0x0500)
+    assert mmu.interrupts.flags == 0x05
+
+
+def test_word_write_reaches_watchers(mmu):
+    written = []
+    mmu.watchWrites(0xC1, written.append)
+    mmu.ww(0xC110, 0xABCD)
+    assert written == [0xC110, 0xC111]
+    assert mmu.rw(0xC110) == 0xABCD
+
+
+def test_interrupt_enable_register(mmu):
+    mmu.wb(0xFFFF, 0x1F)
+    assert mmu.rb(0xFFFF) == 0x1F
+
+
+def test_interrupt_flag_register(mmu):
+    assert mmu.rb(0xFF0F) == 0xE0
+    mmu.wb(0xFF0F, 0xFF)
+    assert mmu.rb(0xFF0F) == 0xFF
+    assert mmu.interrupts.flags == 0x1F
+    mmu.wb(0xFFFF, 0x05)
+    assert mmu.interrupts.pending == 0x05
+    mmu.wb(0xFF0F, 0x00)
+    mmu.interrupts.request(0x04)
+    assert mmu.rb(0xFF0F) == 0xE4
+    assert mmu.interrupts.pending == 0x04
+
+
+def test_oam_dma_copies_page(mmu):
+    for i in range(0xA0):
+        mmu.wb(0xC100 + i, i ^ 0x5A)
+    mmu.wb(0xFF46, 0xC1)
+    assert bytes(mmu._oam) == bytes(i ^ 0x5A for i in range(0xA0))
+    assert mmu.rb(0xFF46) == 0xC1
+
+
+def test_oam_dma_from_handler_page(mmu):
+    mmu.wb(0xFE00, 0x77)
+    # Disabled cartridge RAM reads 0xFF through a handler
+    mmu.mapRAMBank(None)
+    mmu.wb(0xFF46, 0xA0)
+    assert mmu._oam[0] == 0xFF
+
+
+def test_oam_locked_during_dma(mmu):
+    sched = Scheduler()
+    mmu.setScheduler(sched)
+    mmu.wb(0xC000, 0x42)
+    mmu.wb(0xFF46, 0xC0)
+    assert mmu.rb(0xFE00) == 0xFF
+    mmu.wb(0xFE00, 0x11)
+    sched.run(DMA_CYCLES - 1)
+    assert mmu.rb(0xFE00) == 0xFF
+    sched.run(DMA_CYCLES)
+    assert mmu.rb(0xFE00) == 0x42
+
+
+def test_unhandled_io_registers_keep_their_value(mmu):
+    gpu = GPU(headless=True)
+    mmu.setGPU(gpu)
+    # OBP0, OBP1, WY and WX have no handlers yet
+    for addr in range(0xFF48, 0xFF4C):
+        mmu.wb(addr, addr & 0xFF)
+        assert mmu.rb(addr) == addr & 0xFF
+    mmu.wb(0xFF47, 0xE4)
+    assert mmu.rb(0xFF47) == 0xE4
+
+
+def test_map_io_routes_register(mmu):
+    writes = []
+    mmu.mapIO({0xFF7E: (lambda addr: 0x3C, lambda addr, data: writes.append(data))})
+    mmu.wb(0xFF7E, 0x12)
+    assert mmu.rb(0xFF7E) == 0x3C
+    assert writes == [0x12]
@@ -0,0 +1,75 @@
+from gbemu import GBEmu
+from gbemu.SaveRAM import SaveRAM
+
+
+def battery_rom(tmp_path):
+    """An MBC5+RAM+BATTERY image with 32k of RAM, written to tmp_path."""
+    rom = bytearray(0x8000)
+    rom[0x147] = 0x1B
+    rom[0x149] = 0x03
+    path = tmp_path / "game.gb"
+    path.write_bytes(bytes(rom))
+    return path
+
+
+def test_save_file_created_and_kept(tmp_path):
+    path = tmp_path / "game.sav"
+    save = SaveRAM(str(path), 0x2000)
+    save.buffer[0x10] = 0x42
+    save.close()
+    assert path.stat().st_size == 0x2000
+    # A larger cartridge grows the file, keeping what's there
+    save = SaveRAM(str(path), 0x8000)
+    assert save.buffer[0x10] == 0x42
+    assert path.stat().st_size == 0x8000
+    save.close()
+
+
+def test_writes_mark_pages_dirty_once(tmp_path):
+    emulator = GBEmu(headless=True)
+    emulator.loadROM(str(battery_rom(tmp_path)))
+    mmu = emulator._mmu
+    mmu.wb(0x0000, 0x0A)
+    mmu.wb(0x4000, 0x01)
+    assert mmu._wpage[0xA3] is None
+    mmu.wb(0xA345, 0x99)
+    # Bank 1 page 3, now mapped directly
+    assert mmu._ramdirty == {0x23}
+    assert mmu._wpage[0xA3] is not None
+    mmu.flushRAM()
+    assert mmu._ramdirty == set()
+    assert mmu._wpage[0xA3] is None
+    assert mmu.rb(0xA345) == 0x99
+    emulator.close()
+
+
+def test_save_survives_reload(tmp_path):
+    rom = battery_rom(tmp_path)
+    emulator = GBEmu(headless=True)
+    emulator.loadROM(str(rom))
+    mmu = emulator._mmu
+    mmu.wb(0x0000, 0x0A)
+    mmu.wb(0x4000, 0x02)
+    mmu.wb(0xB000, 0x5A)
+    emulator.close()
+    assert (tmp_path / "game.sav").read_bytes()[0x5000] == 0x5A
+
+    emulator = GBEmu(headless=True)
+    emulator.loadROM(str(rom))
+    mmu = emulator._mmu
+    mmu.wb(0x0000, 0x0A)
+    mmu.wb(0x4000, 0x02)
+    assert mmu.rb(0xB000) == 0x5A
+    emulator.close()
+
+
+def test_no_save_without_battery(tmp_path):
+    rom = bytearray(0x8000)
+    rom[0x147] = 0x1A  # MBC5+RAM
+    rom[0x149] = 0x02
+    path = tmp_path / "game.gb"
+    path.write_bytes(bytes(rom))
+    emulator = GBEmu(headless=True)
+    emulator.loadROM(str(path))
+    assert emulator._save is None
+    assert not (tmp_path / "game.sav").exists()
@@ -0,0 +1,60 @@
+from gbemu.Scheduler import NEVER, Scheduler
+
+
+def test_events_run_in_cycle_order():
+    """Due events fire ordered by cycle, ties in scheduling order."""
+    sched = Scheduler()
+    fired = []
+    for cycle, name in [(30, "c"), (10, "a"), (20, "b1"), (20, "b2"), (40, "d")]:
+        sched.schedule(cycle, lambda c, name=name: fired.append((c, name)))
+    assert sched.next == 10
+
+    sched.run(29)
+    assert fired == [(10, "a"), (20, "b1"), (20, "b2")]
+    assert sched.next == 30
+    sched.run(100)
+    assert [name for _, name in fired] == ["a", "b1", "b2", "c", "d"]
+    assert sched.next == NEVER
+    assert sched.pending == 0
+
+
+def test_cancel():
+    sched = Scheduler()
+    fired = []
+    event = sched.schedule(10, fired.append)
+    sched.schedule(20, fired.append)
+    sched.cancel(event)
+    assert sched.pending == 1
+    sched.run(20)
+    assert fired == [20]
+    # Cancelling an event that already fired is harmless
+    sched.cancel(event)
+
+
+def test_callbacks_reschedule_without_drift():
+    """A periodic event re-armed from its callback keeps its own timebase."""
+    sched = Scheduler()
+    fired = []
+
+    def tick(cycle):
+        fired.append(cycle)
+        sched.schedule(cycle + 7, tick)
+
+    sched.schedule(7, tick)
+    sched.run(10)
+    sched.run(30)
+    assert fired == [7, 14, 21, 28]
+    assert sched.next == 35
+
+
+def test_sync_catches_up_to_clock():
+    clock = [0]
+    sched = Scheduler(lambda: clock[0])
+    fired = []
+    sched.schedule(5, fired.append)
+    sched.sync()
+    assert fired == []
+    clock[0] = 8
+    assert sched.now == 8
+    sched.sync()
+    assert fired == [5]
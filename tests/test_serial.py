@@ -0,0 +1,46 @@
+from gbemu import GBEmu
+from gbemu.Interrupts import SERIAL
+from gbemu.Scheduler import Scheduler
+from gbemu.Serial import TRANSFER_CYCLES, Serial
+
+
+def make_serial():
+    sched = Scheduler()
+    requests = []
+    serial = Serial(sched, requests.append)
+    handlers = serial.ioHandlers()
+    return sched, requests, serial, handlers
+
+
+def test_transfer_sends_byte_and_interrupts():
+    sched, requests, serial, io = make_serial()
+    io[0xFF01][1](0xFF01, ord("P"))
+    io[0xFF02][1](0xFF02, 0x81)
+    assert serial.output == b"P"
+    assert io[0xFF02][0](0xFF02) == 0xFF
+    sched.run(TRANSFER_CYCLES - 1)
+    assert requests == []
+    sched.run(TRANSFER_CYCLES)
+    assert requests == [SERIAL]
+    # Nothing on the other end
+    assert io[0xFF01][0](0xFF01) == 0xFF
+    assert io[0xFF02][0](0xFF02) == 0x7F
+
+
+def test_external_clock_never_completes():
+    sched, requests, serial, io = make_serial()
+    io[0xFF02][1](0xFF02, 0x80)
+    sched.run(TRANSFER_CYCLES * 10)
+    assert requests == []
+    assert serial.output == b""
+
+
+def test_serial_output_through_emulator():
+    emulator = GBEmu(headless=True)
+    mmu = emulator._mmu
+    for ch in b"ok":
+        mmu.wb(0xFF01, ch)
+        mmu.wb(0xFF02, 0x81)
+        emulator.run_cycles(TRANSFER_CYCLES)
+    assert emulator._serial.output == b"ok"
+    assert mmu.interrupts.flags & SERIAL
@@ -0,0 +1,122 @@
+import pytest
+
+from gbemu.registers import C
+from gbemu.Scheduler import Scheduler
+from gbemu.Timer import PERIODS, Timer
+
+
+class Clock(object):
+    """A hand-driven clock for a standalone timer."""
+
+    def __init__(self):
+        self.now = 0
+        self.sched = Scheduler(lambda: self.now)
+        self.requests = []
+        self.timer = Timer(self.sched, self.requests.append)
+
+    def advance(self, m):
+        self.now += m
+        self.sched.run(self.now)
+
+
+def test_div_counts_every_64_cycles_and_resets_on_write():
+    clock = Clock()
+    timer = clock.timer
+    clock.advance(63)
+    assert timer.rb(0xFF04) == 0
+    clock.advance(1)
+    assert timer.rb(0xFF04) == 1
+    clock.advance(64 * 300)
+    assert timer.rb(0xFF04) == 301 & 0xFF
+    timer.wb(0xFF04, 0x55)
+    assert timer.rb(0xFF04) == 0
+    clock.advance(64)
+    assert timer.rb(0xFF04) == 1
+
+
+@pytest.mark.parametrize("tac", [4, 5, 6, 7])
+def test_tima_counts_at_tac_rate(tac):
+    clock = Clock()
+    timer = clock.timer
+    timer.wb(0xFF07, tac)
+    assert timer.rb(0xFF07) == 0xF8 | tac
+    period = PERIODS[tac & 3]
+    clock.advance(period * 10 - 1)
+    assert timer.rb(0xFF05) == 9
+    clock.advance(1)
+    assert timer.rb(0xFF05) == 10
+    assert clock.requests == []
+
+
+def test_overflow_reloads_tma_and_requests_interrupt():
+    clock = Clock()
+    timer = clock.timer
+    timer.wb(0xFF06, 0xF0)
+    timer.wb(0xFF05, 0xFE)
+    timer.wb(0xFF07, 0x05)  # 4 M-cycles per tick
+    clock.advance(7)
+    assert timer.rb(0xFF05) == 0xFF
+    assert clock.requests == []
+    clock.advance(1)
+    assert clock.requests == [0x04]
+    assert timer.rb(0xFF05) == 0xF0
+    # 16 ticks to the next overflow
+    clock.advance(16 * 4 - 1)
+    assert len(clock.requests) == 1
+    clock.advance(1)
+    assert len(clock.requests) == 2
+
+
+def test_tima_read_catches_up_with_overflow():
+    clock = Clock()
+    timer = clock.timer
+    timer.wb(0xFF06, 0x80)
+    timer.wb(0xFF07, 0x05)
+    # Past the overflow without the scheduler having run
+    clock.now = 256 * 4 + 8
+    assert timer.rb(0xFF05) == 0x82
+    assert clock.requests == [0x04]
+
+
+def test_disabled_timer_holds_and_tac_changes_keep_count():
+    clock = Clock()
+    timer = clock.timer
+    timer.wb(0xFF07, 0x05)
+    clock.advance(40)
+    assert timer.rb(0xFF05) == 10
+    timer.wb(0xFF07, 0x01)
+    clock.advance(1000)
+    assert timer.rb(0xFF05) == 10
+    assert clock.sched.pending == 0
+    timer.wb(0xFF07, 0x07)  # every 64 M-cycles, counted from the DIV reset
+    clock.advance(64 - clock.now % 64)
+    assert timer.rb(0xFF05) == 11
+    timer.wb(0xFF04, 0)
+    clock.advance(63)
+    assert timer.rb(0xFF05) == 11
+    clock.advance(1)
+    assert timer.rb(0xFF05) == 12
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "jit"])
+def test_timer_interrupt_wakes_halt(backend, program_emulator):
+    # fmt: off
+    program = [
+        0x3E, 0xC0,  # LD A,0xC0
+        0xE0, 0x06,  # LDH (06),A    TMA = 0xC0, overflow every 64 ticks
+        0x3E, 0x04,  # LD A,0x04
+        0xE0, 0xFF,  # LDH (FF),A    IE = timer
+        0x3E, 0x05,  # LD A,0x05
+        0xE0, 0x07,  # LDH (07),A    TAC = on, 4 M-cycles per tick
+        0xFB,        # EI
+        0x76,        # HALT
+        0x18, 0xFD,  # JR -3
+    ]
+    # fmt: on
+    # INC C; RETI
+    emulator = program_emulator(backend, program, handler=[0x0C, 0xD9], vector=0x50)
+    # TAC is set 12 M-cycles in: the first overflow is 256 ticks after
+    # that, the next ones every 64
+    stats = emulator.run_cycles(256 * 4 + 64 * 4 * 9 + 64)
+    assert emulator._cpu._r[C] == 10
+    assert stats.instructions < 100